@@ -0,0 +1,130 @@
+"""캐시를 사용하는 토큰 인증
+
+토큰 -> 사용자 매핑을 워커별 메모리에 크기 제한이 있는 TTL 캐시로 보관해
+인증된 요청마다 실행되던 토큰/사용자 조회 쿼리를 없앤다. 항목에는 저장 시점의 사용자별
+버전 번호(Django 캐시, raids.caching과 같은 방식)를 함께 두고, 로그아웃, 비밀번호 변경,
+사용자 정보 수정 시 버전을 올려 모든 워커의 캐시 항목을 다음 요청에서 무효화한다.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+from raids.caching import bump_version, get_version
+
+
+def token_version_name(user_id):
+    """사용자의 토큰이 폐기되거나 사용자 정보가 바뀌면 올라가는 버전 이름"""
+    return f'auth_user:{user_id}'
+
+
+class TokenCache:
+    """크기 제한이 있는 TTL 캐시 (가장 오래 사용하지 않은 항목부터 제거)
+
+    값은 (user, token)이며, 사용자별 버전이 저장 시점과 다르면 없는 것으로 본다.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, version, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+        # 공유 캐시 조회는 잠금 밖에서
+        if get_version(token_version_name(value[0].pk)) != version:
+            self.evict(key)
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        # DB에서 읽은 뒤 버전을 조회해도 bump_version이 커밋 후 한 번 더 올리므로 폐기가 누락되지 않음
+        version = get_version(token_version_name(value[0].pk))
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def evict(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def evict_user(self, user_id):
+        """사용자의 캐시 항목을 모든 워커에서 무효화"""
+        bump_version(token_version_name(user_id))
+        with self._lock:
+            keys = [key for key, (_, _version, (user, _token)) in self._entries.items() if user.pk == user_id]
+            for key in keys:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(
+    maxsize=getattr(settings, 'AUTH_TOKEN_CACHE_SIZE', 10000),
+    ttl=getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 60),
+)
+
+
+def token_expired(token):
+    """AUTH_TOKEN_EXPIRE_DAYS가 지난 토큰인지 확인 (None이면 만료 없음)"""
+    expire_days = getattr(settings, 'AUTH_TOKEN_EXPIRE_DAYS', None)
+    if expire_days is None:
+        return False
+    return token.created < timezone.now() - timedelta(days=expire_days)
+
+
+def issue_token(user):
+    """로그인용 토큰 반환 (만료된 토큰은 새로 발급)"""
+    token = Token.objects.filter(user=user).first()
+    if token is not None and not token_expired(token):
+        return token
+    if token is not None:
+        revoke_token(token)
+    return Token.objects.create(user=user)
+
+
+def revoke_token(token):
+    """토큰 삭제 및 모든 워커의 캐시에서 제거"""
+    token_cache.evict_user(token.user_id)
+    token.delete()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """토큰 -> 사용자 매핑을 캐시하는 토큰 인증"""
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, (user, token))
+        else:
+            user, token = cached
+
+        if token_expired(token):
+            revoke_token(token)
+            raise AuthenticationFailed('토큰이 만료되었습니다. 다시 로그인해주세요.')
+
+        # 요청 처리 중 사용자 객체가 수정되어도 캐시된 객체에는 영향이 없도록 복사
+        return copy.copy(user), token
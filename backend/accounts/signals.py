@@ -0,0 +1,22 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=User)
+def evict_cached_user(sender, instance, update_fields=None, **kwargs):
+    """사용자 정보가 바뀌면 캐시된 인증 정보 제거 (로그인 시각만 바뀐 경우 제외)"""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    token_cache.evict_user(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def evict_deleted_token(sender, instance, **kwargs):
+    # 다른 워커에 캐시된 토큰도 무효화되도록 사용자 버전을 올림
+    token_cache.evict_user(instance.user_id)
@@ -1,3 +1,67 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .authentication import TokenCache, token_cache
+
+User = get_user_model()
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    """캐시 토큰 인증 테스트"""
+
+    url = '/api/accounts/current-user/'
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create(username='tester')
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_cached_request_skips_token_query(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['username'], 'tester')
+
+    def test_logout_evicts(self):
+        self.client.get(self.url)
+        self.assertEqual(self.client.post('/api/accounts/logout/').status_code, 200)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_profile_change_evicts(self):
+        self.client.get(self.url)
+        self.user.character_name = '새 캐릭터'
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).data['character_name'], '새 캐릭터')
+
+    @override_settings(AUTH_TOKEN_EXPIRE_DAYS=30)
+    def test_expired_token_rejected_and_reissued(self):
+        self.client.get(self.url)
+        Token.objects.filter(pk=self.token.pk).update(created=self.token.created - timedelta(days=31))
+        token_cache.clear()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.assertFalse(Token.objects.filter(pk=self.token.pk).exists())
+
+    @override_settings(AUTH_TOKEN_EXPIRE_DAYS=None)
+    def test_old_token_kept_without_expiry(self):
+        Token.objects.filter(pk=self.token.pk).update(created=self.token.created - timedelta(days=365))
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertTrue(Token.objects.filter(pk=self.token.pk).exists())
+
+    def test_revocation_reaches_other_workers(self):
+        # 다른 워커의 캐시는 메모리를 공유하지 않고 버전 번호만 공유
+        other_worker = TokenCache(maxsize=10, ttl=60)
+        other_worker.set(self.token.key, (self.user, self.token))
+        self.assertEqual(self.client.post('/api/accounts/logout/').status_code, 200)
+        self.assertIsNone(other_worker.get(self.token.key))
+
+    def test_cache_is_bounded(self):
+        cache = TokenCache(maxsize=2, ttl=60)
+        for key in 'abc':
+            cache.set(key, (self.user, self.token))
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
@@ -8,6 +8,7 @@ from django.contrib.auth import login, logout
 from django.contrib.auth import get_user_model
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
+from .authentication import issue_token, revoke_token, token_cache
 from .serializers import (
     UserSerializer, UserCreateSerializer, LoginSerializer, 
     PasswordChangeSerializer
@@ -27,8 +28,8 @@ class RegisterView(generics.CreateAPIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
         
-        # Token 생성
-        token, created = Token.objects.get_or_create(user=user)
+        # Token 생성 (새 사용자이므로 조회 없이 생성)
+        token = Token.objects.create(user=user)
         
         headers = self.get_success_headers(serializer.data)
         return Response(
@@ -53,8 +54,8 @@ class LoginView(APIView):
             user = serializer.validated_data['user']
             login(request, user)
             
-            # Token 생성 또는 가져오기
-            token, created = Token.objects.get_or_create(user=user)
+            # Token 가져오기 (없거나 만료되었으면 새로 발급)
+            token = issue_token(user)
             
             user_serializer = UserSerializer(user)
             
@@ -71,11 +72,10 @@ class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
-        # Token 삭제
-        try:
-            request.user.auth_token.delete()
-        except:
-            pass
+        # Token 삭제 (인증 캐시에서도 제거)
+        token = Token.objects.filter(user=request.user).first()
+        if token is not None:
+            revoke_token(token)
         
         logout(request)
         return Response({'message': '로그아웃 성공'})
@@ -100,7 +100,9 @@ class PasswordChangeView(APIView):
             user = request.user
             user.set_password(serializer.validated_data['new_password'])
             user.save()
-            # 비밀번호 변경 후 다시 로그인 필요
+            # 비밀번호 변경 후 다시 로그인 필요 (기존 토큰 폐기)
+            token_cache.evict_user(user.pk)
+            Token.objects.filter(user=user).delete()
             logout(request)
             return Response({'message': '비밀번호가 변경되었습니다. 다시 로그인해주세요.'})
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -5,16 +5,19 @@ Django settings for ff14_raid project.
 from pathlib import Path
 import os
 
+from decouple import config, Csv
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# 운영 환경 값은 환경 변수 또는 backend/.env로 지정 (.env.example 참고)
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-your-very-secret-key-change-this-in-production'
+SECRET_KEY = config('SECRET_KEY', default='django-insecure-your-very-secret-key-change-this-in-production')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = config('DEBUG', default=True, cast=bool)
 
-ALLOWED_HOSTS = ['localhost', '127.0.0.1']
+ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='localhost,127.0.0.1', cast=Csv())
 
 # Application definition
 INSTALLED_APPS = [
@@ -35,6 +38,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'raids.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -42,6 +46,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'raids.routers.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'ff14_raid.urls'
@@ -65,10 +70,93 @@ TEMPLATES = [
 WSGI_APPLICATION = 'ff14_raid.wsgi.application'
 
 # Database
-DATABASES = {
+# DB_ENGINE=postgres이면 PostgreSQL, 그 외에는 SQLite 사용
+DB_ENGINE = config('DB_ENGINE', default='sqlite')
+
+# SQLITE_PRODUCTION=True이면 동시 쓰기에 맞춘 PRAGMA와 지속 연결을 사용 (raids/db.py 참고)
+SQLITE_PRODUCTION = config('SQLITE_PRODUCTION', default=False, cast=bool)
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,  # ms
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # 음수는 KiB 단위 (64MiB)
+    'temp_store': 'MEMORY',
+}
+SQLITE_PRAGMAS = SQLITE_PRODUCTION_PRAGMAS if SQLITE_PRODUCTION else {}
+
+if DB_ENGINE == 'postgres':
+    # 워커별 지속 연결 + 재사용 전 상태 확인. PgBouncer(트랜잭션 풀링) 뒤에서는
+    # POSTGRES_PGBOUNCER=True로 서버 측 커서를 끄고 DB_CONN_MAX_AGE=0을 권장
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('POSTGRES_DB', default='ff14_raid'),
+            'USER': config('POSTGRES_USER', default='ff14_raid'),
+            'PASSWORD': config('POSTGRES_PASSWORD', default=''),
+            'HOST': config('POSTGRES_HOST', default='localhost'),
+            'PORT': config('POSTGRES_PORT', default='5432'),
+            'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+            'CONN_HEALTH_CHECKS': True,
+            'DISABLE_SERVER_SIDE_CURSORS': config('POSTGRES_PGBOUNCER', default=False, cast=bool),
+            'OPTIONS': {
+                # 오래 걸리는 쿼리가 연결을 붙잡지 않도록 문장 단위 제한 (ms, 0이면 제한 없음)
+                'options': f"-c statement_timeout={config('DB_STATEMENT_TIMEOUT_MS', default=5000, cast=int)}",
+                'connect_timeout': config('POSTGRES_CONNECT_TIMEOUT', default=5, cast=int),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('SQLITE_PATH', default=str(BASE_DIR / 'db.sqlite3')),
+            'CONN_MAX_AGE': 600 if SQLITE_PRODUCTION else 0,
+            'CONN_HEALTH_CHECKS': SQLITE_PRODUCTION,
+        }
+    }
+
+# 읽기 전용 복제본 (선택). 지정하면 안전한 메서드 요청의 읽기를 복제본으로 보낸다. (raids/routers.py 참고)
+# 로컬 확인용으로 SQLite 파일 두 개나 같은 서버의 PostgreSQL DB 두 개를 지정할 수 있다.
+# (복제가 없으므로 python manage.py migrate --database replica 후 데이터를 직접 맞춰야 함)
+if DB_ENGINE == 'postgres':
+    POSTGRES_REPLICA_HOST = config('POSTGRES_REPLICA_HOST', default='')
+    POSTGRES_REPLICA_DB = config('POSTGRES_REPLICA_DB', default='')
+    if POSTGRES_REPLICA_HOST or POSTGRES_REPLICA_DB:
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'NAME': POSTGRES_REPLICA_DB or DATABASES['default']['NAME'],
+            'HOST': POSTGRES_REPLICA_HOST or DATABASES['default']['HOST'],
+            'PORT': config('POSTGRES_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        }
+else:
+    SQLITE_REPLICA_PATH = config('SQLITE_REPLICA_PATH', default='')
+    if SQLITE_REPLICA_PATH:
+        DATABASES['replica'] = {**DATABASES['default'], 'NAME': SQLITE_REPLICA_PATH}
+
+if 'replica' in DATABASES:
+    # 테스트에서는 별도 DB를 만들지 않고 default를 복제본으로 사용
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_ROUTERS = ['raids.routers.ReplicaRouter']
+    REPLICA_DATABASE = 'replica'
+else:
+    REPLICA_DATABASE = None
+
+# 쓰기 후 같은 클라이언트의 읽기를 primary로 고정하는 시간(초). 복제 지연보다 길게 잡는다.
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
+
+# 잠금 충돌 시 쓰기 재시도 횟수와 백오프(초기 대기, 최대 대기, 초)
+DB_LOCK_RETRIES = 5
+DB_LOCK_BACKOFF = (0.05, 1.0)
+
+# Cache
+# 참조 데이터 캐시는 워커별 메모리에 있고 무효화용 버전 번호만 이 캐시에 저장한다.
+# 워커가 여러 개이면 memcached/redis 같은 공유 백엔드를 지정해야 변경이 모든 워커에 반영된다.
+# 예: CACHE_BACKEND=django.core.cache.backends.redis.RedisCache, CACHE_LOCATION=redis://127.0.0.1:6379
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='ff14-raid'),
     }
 }
 
@@ -105,10 +193,9 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # CORS settings
-CORS_ALLOWED_ORIGINS = [
-    "http://localhost:3000",
-    "http://127.0.0.1:3000",
-]
+CORS_ALLOWED_ORIGINS = config(
+    'CORS_ALLOWED_ORIGINS', default='http://localhost:3000,http://127.0.0.1:3000', cast=Csv()
+)
 
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_HEADERS = [
@@ -136,15 +223,32 @@ CSRF_TRUSTED_ORIGINS = [
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'accounts.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'raids.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'raids.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
 
+# JSON/NDJSON/CSV 응답 압축 최소 크기(바이트). brotli는 Brotli 패키지가 있을 때만 사용 (raids/compression.py)
+COMPRESS_MIN_SIZE = config('COMPRESS_MIN_SIZE', default=1024, cast=int)
+
+# 토큰 인증 캐시 (워커별 메모리) 크기/유지 시간(초), 토큰 만료 기간(일, 기본값은 만료 없음)
+AUTH_TOKEN_CACHE_SIZE = config('AUTH_TOKEN_CACHE_SIZE', default=10000, cast=int)
+AUTH_TOKEN_CACHE_TTL = config('AUTH_TOKEN_CACHE_TTL', default=60, cast=int)
+AUTH_TOKEN_EXPIRE_DAYS = config('AUTH_TOKEN_EXPIRE_DAYS', default='', cast=lambda value: int(value) if value else None)
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
\ No newline at end of file
@@ -1,8 +1,43 @@
 from django.contrib import admin
 from .models import (
     Raid, RaidGroup, Job, Player, ItemType, Item, Currency,
-    EquipmentSet, Equipment, ItemDistribution, RaidSchedule, CurrencyRequirement
+    EquipmentSet, Equipment, ItemDistribution, RaidSchedule, CurrencyRequirement,
+    NeedLedger
 )
+from .needs import refresh_need_ledgers
+
+
+class NeedLedgerAdminMixin:
+    """저장/삭제 시 관련 공대원의 필요 원장을 갱신하는 관리자 믹스인"""
+    ledger_player_lookup = 'player_id'
+    
+    def get_ledger_player_ids(self, pks):
+        return set(
+            self.model.objects.filter(pk__in=pks).exclude(
+                **{f'{self.ledger_player_lookup}__isnull': True}
+            ).values_list(self.ledger_player_lookup, flat=True)
+        )
+    
+    def save_model(self, request, obj, form, change):
+        # 대상 공대원이 바뀌는 경우를 위해 변경 전 공대원도 기록
+        request._ledger_player_ids = self.get_ledger_player_ids([obj.pk]) if change else set()
+        super().save_model(request, obj, form, change)
+    
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        player_ids = getattr(request, '_ledger_player_ids', set())
+        refresh_need_ledgers(player_ids | self.get_ledger_player_ids([form.instance.pk]))
+    
+    def delete_model(self, request, obj):
+        player_ids = self.get_ledger_player_ids([obj.pk])
+        super().delete_model(request, obj)
+        refresh_need_ledgers(player_ids)
+    
+    def delete_queryset(self, request, queryset):
+        player_ids = self.get_ledger_player_ids(queryset.values('pk'))
+        super().delete_queryset(request, queryset)
+        refresh_need_ledgers(player_ids)
+
 
 @admin.register(Raid)
 class RaidAdmin(admin.ModelAdmin):
@@ -56,25 +91,26 @@ class EquipmentInline(admin.TabularInline):
     raw_id_fields = ['item']
 
 @admin.register(EquipmentSet)
-class EquipmentSetAdmin(admin.ModelAdmin):
-    list_display = ['player', 'set_type', 'get_item_level', 'created_at', 'updated_at']
+class EquipmentSetAdmin(NeedLedgerAdminMixin, admin.ModelAdmin):
+    list_display = ['player', 'set_type', 'item_level', 'equipment_count', 'created_at', 'updated_at']
     list_filter = ['set_type', 'player__raid_group']
     search_fields = ['player__character_name']
+    readonly_fields = ['item_level', 'equipment_count']
     inlines = [EquipmentInline]
     
-    def get_item_level(self, obj):
-        return obj.calculate_item_level()
-    get_item_level.short_description = '아이템레벨'
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('player')
 
 @admin.register(Equipment)
-class EquipmentAdmin(admin.ModelAdmin):
+class EquipmentAdmin(NeedLedgerAdminMixin, admin.ModelAdmin):
     list_display = ['equipment_set', 'item', 'is_pentamelded']
     list_filter = ['equipment_set__set_type', 'is_pentamelded']
     search_fields = ['item__name', 'equipment_set__player__character_name']
     raw_id_fields = ['equipment_set', 'item']
+    ledger_player_lookup = 'equipment_set__player_id'
 
 @admin.register(ItemDistribution)
-class ItemDistributionAdmin(admin.ModelAdmin):
+class ItemDistributionAdmin(NeedLedgerAdminMixin, admin.ModelAdmin):
     list_display = ['player', 'item', 'distributed_at', 'week_number', 'raid_group']
     list_filter = ['raid_group', 'week_number', 'distributed_at']
     search_fields = ['player__character_name', 'item__name']
@@ -88,8 +124,20 @@ class RaidScheduleAdmin(admin.ModelAdmin):
     search_fields = ['title', 'description']
 
 @admin.register(CurrencyRequirement)
-class CurrencyRequirementAdmin(admin.ModelAdmin):
+class CurrencyRequirementAdmin(NeedLedgerAdminMixin, admin.ModelAdmin):
     list_display = ['item', 'currency', 'amount']
     list_filter = ['currency', 'item__item_type']
     search_fields = ['item__name', 'currency__name']
-    raw_id_fields = ['item', 'currency']
\ No newline at end of file
+    raw_id_fields = ['item', 'currency']
+    ledger_player_lookup = 'item__needledgeritem__ledger_id'  # 해당 아이템이 필요한 공대원
+
+@admin.register(NeedLedger)
+class NeedLedgerAdmin(admin.ModelAdmin):
+    list_display = ['player', 'has_target_set', 'needed_items_count', 'updated_at']
+    list_filter = ['has_target_set', 'player__raid_group']
+    search_fields = ['player__character_name']
+    readonly_fields = ['player', 'has_target_set', 'needed_items_count', 'updated_at']
+    
+    def has_add_permission(self, request):
+        # 원장은 rebuild_need_ledger 명령어나 쓰기 경로에서만 생성
+        return False
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class RaidsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "raids"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from . import signals  # noqa: F401
+        from .db import configure_sqlite
+        connection_created.connect(configure_sqlite, dispatch_uid='raids.configure_sqlite')
@@ -0,0 +1,127 @@
+"""참조 데이터(직업, 아이템 종류, 레이드, 재화) 캐시
+
+직렬화된 카탈로그는 워커별 메모리에 보관하고, Django 캐시에 저장된 버전 번호가
+바뀌면 다시 불러온다. 버전 번호는 post_save/post_delete 시그널(및 bulk 쓰기 경로)에서
+올리므로, 여러 워커가 같은 캐시 백엔드를 쓰면 한 워커의 변경이 모든 워커에 반영된다.
+"""
+import threading
+import time
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+
+from .routers import use_primary
+
+VERSION_KEY_PREFIX = 'raids:version:'
+
+# 버전 번호가 키에 들어가므로 만료 시간은 오래된 항목 정리용
+GROUP_CACHE_TIMEOUT = 60 * 10
+
+
+def get_version(name):
+    """버전 번호 조회 (캐시가 비어 있으면 재시작 전 값과 겹치지 않도록 시각 기반으로 초기화)"""
+    key = VERSION_KEY_PREFIX + name
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(names):
+    """여러 버전 번호를 한 번에 조회 ({이름: 버전})"""
+    keys = {VERSION_KEY_PREFIX + name: name for name in names}
+    found = cache.get_many(keys)
+    versions = {keys[key]: version for key, version in found.items()}
+    for name in set(keys.values()) - set(versions):
+        versions[name] = get_version(name)
+    return versions
+
+
+def group_version_name(group_id):
+    """공대 응답(공대 정보, 공대원, 사용자)이 바뀌면 올라가는 공대별 버전 이름"""
+    return f'group:{group_id}'
+
+
+def user_groups_version_name(user_id):
+    """사용자가 속하거나 이끄는 공대 목록이 바뀌면 올라가는 사용자별 버전 이름"""
+    return f'user_groups:{user_id}'
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_version(name):
+    """버전 번호를 올려 캐시를 무효화
+
+    커밋 전에 다른 워커가 이전 데이터로 캐시를 채울 수 있으므로 커밋 후에 한 번 더 올린다.
+    """
+    key = VERSION_KEY_PREFIX + name
+    _bump(key)
+    transaction.on_commit(lambda: _bump(key))
+
+
+class ReferenceCatalog:
+    """버전 번호로 무효화되는 워커별 참조 데이터 카탈로그"""
+
+    def __init__(self, name, model, serializer):
+        self.name = name
+        self.model_label = model
+        self.serializer_name = serializer
+        self._version = None
+        self._data = {}
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        return apps.get_model('raids', self.model_label)
+
+    @property
+    def serializer_class(self):
+        from . import serializers
+        return getattr(serializers, self.serializer_name)
+
+    def get(self):
+        """{id: 직렬화된 데이터} 반환 (버전이 바뀌었으면 다시 불러옴)"""
+        version = get_version(self.name)
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    # 새 버전으로 보관하므로 복제 지연이 없는 primary에서 읽음
+                    with use_primary():
+                        rows = self.serializer_class(self.model.objects.all(), many=True).data
+                    self._data = {row['id']: dict(row) for row in rows}
+                    self._version = version
+        return self._data
+
+    def list(self):
+        return list(self.get().values())
+
+    def lookup(self, pk, data=None):
+        """단일 항목 조회 (다른 워커에서 방금 추가되어 캐시에 없으면 DB에서 조회)
+
+        data: 같은 요청/직렬화 중에 이미 받아 둔 get() 결과 (행마다 버전을 다시 조회하지 않음)
+        """
+        data = (self.get() if data is None else data).get(pk)
+        if data is None:
+            obj = self.model.objects.filter(pk=pk).first()
+            if obj is None:
+                return None
+            return dict(self.serializer_class(obj).data)
+        return dict(data)
+
+
+REFERENCE_CATALOGS = {
+    'jobs': ReferenceCatalog('jobs', 'Job', 'JobSerializer'),
+    'item_types': ReferenceCatalog('item_types', 'ItemType', 'ItemTypeSerializer'),
+    'raids': ReferenceCatalog('raids', 'Raid', 'RaidSerializer'),
+    'currencies': ReferenceCatalog('currencies', 'Currency', 'CurrencySerializer'),
+}
+
+# 모델 이름 -> 카탈로그 이름 (시그널에서 사용)
+CATALOG_BY_MODEL = {catalog.model_label: name for name, catalog in REFERENCE_CATALOGS.items()}
@@ -0,0 +1,293 @@
+"""레이드/재화/아이템 카탈로그 가져오기/내보내기 (JSON Lines)
+
+한 줄에 레코드 하나이며 type 필드로 종류를 구분한다. 외래키는 이름으로 참조한다.
+
+    {"type": "raid", "name": "...", "tier": "영웅", "patch": "7.0", "min_ilvl": 690, "max_ilvl": 735}
+    {"type": "currency", "name": "...", "raid": ["레이드명", "단계"], "weekly_limit": 8}
+    {"type": "item", "name": "...", "raid": ["레이드명", "단계"], "item_type": "머리", "item_level": 730,
+     "floor": 2, "is_weapon": false, "job_restrictions": ["나이트"], "currency_requirements": {"재화명": 6}}
+"""
+import json
+
+from django.db import transaction
+
+from .caching import bump_version
+from .models import Raid, Currency, Item, ItemType, Job, CurrencyRequirement, EquipmentSet
+from .needs import refresh_need_ledgers_for_items
+from .serializers import sync_currency_requirements
+
+CATALOG_BATCH_SIZE = 500
+RAID_FIELDS = ['patch', 'min_ilvl', 'max_ilvl']
+ITEM_FIELDS = ['item_type_id', 'item_level', 'floor', 'is_weapon']
+
+
+class CatalogError(Exception):
+    """카탈로그 레코드 오류"""
+
+
+def read_records(lines):
+    """JSON Lines를 한 줄씩 읽어 레코드로 변환"""
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise CatalogError(f'{line_number}번째 줄: 올바른 JSON이 아닙니다. ({e})')
+        if record.get('type') not in ('raid', 'currency', 'item'):
+            raise CatalogError(f'{line_number}번째 줄: 알 수 없는 레코드 종류입니다. ({record.get("type")})')
+        yield record
+
+
+def _raid_key(value):
+    return tuple(value) if value else None
+
+
+# 종류별 필수 필드, 선택 필드 중 형식을 확인할 필드
+REQUIRED_FIELDS = {
+    'raid': ['name', 'tier', *RAID_FIELDS],
+    'currency': ['name', 'raid'],
+    'item': ['name', 'item_type', 'item_level'],
+}
+FIELD_TYPES = {'raid': (list, type(None)), 'job_restrictions': list, 'currency_requirements': dict}
+
+NATURAL_KEYS = {
+    'raid': lambda r: (r['name'], r['tier']),
+    'currency': lambda r: r['name'],
+    'item': lambda r: (r['name'], _raid_key(r.get('raid'))),
+}
+
+
+def validate_records(records):
+    """저장 전에 레코드 형식과 중복(종류별 자연 키)을 확인 (오류는 CatalogError)"""
+    seen = {record_type: set() for record_type in NATURAL_KEYS}
+    for index, record in enumerate(records, start=1):
+        if not isinstance(record, dict) or record.get('type') not in NATURAL_KEYS:
+            raise CatalogError(f'{index}번째 레코드: 알 수 없는 레코드 종류입니다.')
+        record_type = record['type']
+        missing_fields = [field for field in REQUIRED_FIELDS[record_type] if field not in record]
+        if missing_fields:
+            raise CatalogError(f'{index}번째 레코드: 필수 필드가 없습니다. ({", ".join(missing_fields)})')
+        for field, expected in FIELD_TYPES.items():
+            if field in record and not isinstance(record[field], expected):
+                raise CatalogError(f'{index}번째 레코드: {field} 형식이 올바르지 않습니다.')
+        if isinstance(record.get('raid'), list) and len(record['raid']) != 2:
+            raise CatalogError(f'{index}번째 레코드: raid는 [레이드명, 단계] 형식이어야 합니다.')
+        key = NATURAL_KEYS[record_type](record)
+        if key in seen[record_type]:
+            raise CatalogError(f'{index}번째 레코드: 중복된 {record_type} 레코드입니다. ({key})')
+        seen[record_type].add(key)
+
+
+def _upsert(model, records, existing, key_of, build, fields):
+    """이름 기준으로 기존 행은 bulk_update, 새 행은 bulk_create
+
+    existing({키: 객체})에 새로 만든 객체를 채워 넣고 (생성 건수, 수정 건수)를 반환한다.
+    """
+    to_create, to_update = [], []
+    for record in records:
+        values = build(record)
+        obj = existing.get(key_of(record))
+        if obj is None:
+            obj = model(**values)
+            to_create.append(obj)
+            existing[key_of(record)] = obj
+        elif any(getattr(obj, field) != values[field] for field in fields):
+            for field in fields:
+                setattr(obj, field, values[field])
+            to_update.append(obj)
+    model.objects.bulk_create(to_create, batch_size=CATALOG_BATCH_SIZE)
+    if to_update:
+        model.objects.bulk_update(to_update, fields, batch_size=CATALOG_BATCH_SIZE)
+    return len(to_create), len(to_update)
+
+
+@transaction.atomic
+def import_records(records, strict=True):
+    """카탈로그 레코드를 일괄 저장
+
+    strict가 False이면 참조를 찾을 수 없는 항목은 건너뛰고 경고로 돌려준다.
+    반환값: (종류별 생성/수정 건수, 경고 목록)
+    """
+    records = list(records)
+    validate_records(records)
+
+    grouped = {'raid': [], 'currency': [], 'item': []}
+    for record in records:
+        grouped[record['type']].append(record)
+
+    warnings = []
+    stats = {}
+
+    def missing(message):
+        if strict:
+            raise CatalogError(message)
+        warnings.append(message)
+
+    # 레이드
+    raid_keys = {(r['name'], r['tier']) for r in grouped['raid']}
+    raid_keys.update(_raid_key(r.get('raid')) for r in grouped['currency'] + grouped['item'])
+    raid_keys.discard(None)
+    raid_names = {name for name, tier in raid_keys}
+    raids = {(raid.name, raid.tier): raid for raid in Raid.objects.filter(name__in=raid_names)}
+    stats['raid'] = _upsert(
+        Raid, grouped['raid'], raids,
+        key_of=lambda r: (r['name'], r['tier']),
+        build=lambda r: {'name': r['name'], 'tier': r['tier'], **{f: r[f] for f in RAID_FIELDS}},
+        fields=RAID_FIELDS,
+    )
+    if any(stats['raid']):
+        bump_version('raids')
+
+    def resolve_raid(record):
+        key = _raid_key(record.get('raid'))
+        if key is None:
+            return None, True
+        raid = raids.get(key)
+        if raid is None:
+            missing(f'레이드를 찾을 수 없습니다: {key} ({record["name"]})')
+            return None, False
+        return raid.id, True
+
+    # 재화
+    currency_records = []
+    for record in grouped['currency']:
+        raid_id, found = resolve_raid(record)
+        if found and raid_id is not None:
+            currency_records.append({**record, 'raid_id': raid_id})
+        elif found:
+            missing(f'재화에는 레이드가 필요합니다: {record["name"]}')
+    currency_names = {r['name'] for r in currency_records}
+    currency_names.update(
+        name for r in grouped['item'] for name in r.get('currency_requirements', {})
+    )
+    currencies = {c.name: c for c in Currency.objects.filter(name__in=currency_names)}
+    stats['currency'] = _upsert(
+        Currency, currency_records, currencies,
+        key_of=lambda r: r['name'],
+        build=lambda r: {'name': r['name'], 'raid_id': r['raid_id'], 'weekly_limit': r.get('weekly_limit', 0)},
+        fields=['raid_id', 'weekly_limit'],
+    )
+    if any(stats['currency']):
+        bump_version('currencies')
+
+    # 아이템
+    item_types = {item_type.name: item_type.id for item_type in ItemType.objects.all()}
+    jobs = {job.name: job.id for job in Job.objects.all()}
+    item_records = []
+    for record in grouped['item']:
+        raid_id, found = resolve_raid(record)
+        item_type_id = item_types.get(record['item_type'])
+        if item_type_id is None:
+            missing(f'아이템 종류를 찾을 수 없습니다: {record["item_type"]} ({record["name"]})')
+        if not found or item_type_id is None:
+            continue
+        item_records.append({**record, 'raid_id': raid_id, 'item_type_id': item_type_id})
+
+    item_raid_ids = {r['raid_id'] for r in item_records}
+    existing_items = Item.objects.filter(raid_id__in=item_raid_ids - {None})
+    if None in item_raid_ids:
+        existing_items = existing_items | Item.objects.filter(raid__isnull=True)
+    items = {(item.name, item.raid_id): item for item in existing_items}
+    stats['item'] = _upsert(
+        Item, item_records, items,
+        key_of=lambda r: (r['name'], r['raid_id']),
+        build=lambda r: {
+            'name': r['name'], 'raid_id': r['raid_id'], 'item_type_id': r['item_type_id'],
+            'item_level': r['item_level'], 'floor': r.get('floor'), 'is_weapon': r.get('is_weapon', False),
+        },
+        fields=ITEM_FIELDS,
+    )
+
+    # 직업 제한과 재화 요구사항
+    through = Item.job_restrictions.through
+    job_rows, requirements = [], {}
+    for record in item_records:
+        item = items[(record['name'], record['raid_id'])]
+        if 'job_restrictions' in record:
+            for job_name in set(record['job_restrictions']):
+                if job_name in jobs:
+                    job_rows.append(through(item_id=item.id, job_id=jobs[job_name]))
+                else:
+                    missing(f'직업을 찾을 수 없습니다: {job_name} ({record["name"]})')
+        if 'currency_requirements' in record:
+            requirements[item.id] = []
+            for currency_name, amount in record['currency_requirements'].items():
+                if currency_name in currencies:
+                    requirements[item.id].append(
+                        {'currency_id': currencies[currency_name].id, 'amount': amount}
+                    )
+                else:
+                    missing(f'재화를 찾을 수 없습니다: {currency_name} ({record["name"]})')
+
+    restricted_item_ids = {
+        items[(r['name'], r['raid_id'])].id for r in item_records if 'job_restrictions' in r
+    }
+    through.objects.filter(item_id__in=restricted_item_ids).delete()
+    through.objects.bulk_create(job_rows, batch_size=CATALOG_BATCH_SIZE)
+    if item_records:
+        bump_version('items')
+    if stats['item'][1]:
+        EquipmentSet.objects.containing_items([item.id for item in items.values()]).refresh_item_levels()
+    refresh_need_ledgers_for_items(sync_currency_requirements(requirements))
+
+    return stats, warnings
+
+
+def export_records(raid_ids=None):
+    """카탈로그를 레코드 단위로 내보냄 (아이템은 묶음 단위로 조회해 메모리 사용량 일정)"""
+    raids = Raid.objects.order_by('id')
+    currencies = Currency.objects.order_by('id')
+    items = Item.objects.order_by('id')
+    if raid_ids:
+        raids = raids.filter(id__in=raid_ids)
+        currencies = currencies.filter(raid_id__in=raid_ids)
+        items = items.filter(raid_id__in=raid_ids)
+
+    for raid in raids.values('name', 'tier', *RAID_FIELDS).iterator():
+        yield {'type': 'raid', **raid}
+
+    for currency in currencies.values('name', 'raid__name', 'raid__tier', 'weekly_limit').iterator():
+        yield {
+            'type': 'currency',
+            'name': currency['name'],
+            'raid': [currency['raid__name'], currency['raid__tier']],
+            'weekly_limit': currency['weekly_limit'],
+        }
+
+    item_values = items.values(
+        'id', 'name', 'raid__name', 'raid__tier', 'item_type__name', 'item_level', 'floor', 'is_weapon'
+    )
+    last_id = 0
+    while True:
+        chunk = list(item_values.filter(id__gt=last_id)[:CATALOG_BATCH_SIZE])
+        if not chunk:
+            break
+        last_id = chunk[-1]['id']
+        chunk_ids = [item['id'] for item in chunk]
+
+        job_restrictions = {}
+        for item_id, job_name in Item.job_restrictions.through.objects.filter(
+            item_id__in=chunk_ids
+        ).order_by('job__name').values_list('item_id', 'job__name'):
+            job_restrictions.setdefault(item_id, []).append(job_name)
+
+        requirements = {}
+        for item_id, currency_name, amount in CurrencyRequirement.objects.filter(
+            item_id__in=chunk_ids
+        ).order_by('currency_id').values_list('item_id', 'currency__name', 'amount'):
+            requirements.setdefault(item_id, {})[currency_name] = amount
+
+        for item in chunk:
+            yield {
+                'type': 'item',
+                'name': item['name'],
+                'raid': [item['raid__name'], item['raid__tier']] if item['raid__name'] else None,
+                'item_type': item['item_type__name'],
+                'item_level': item['item_level'],
+                'floor': item['floor'],
+                'is_weapon': item['is_weapon'],
+                'job_restrictions': job_restrictions.get(item['id'], []),
+                'currency_requirements': requirements.get(item['id'], {}),
+            }
@@ -0,0 +1,48 @@
+"""JSON 응답 압축
+
+크기가 COMPRESS_MIN_SIZE 이상인 JSON/NDJSON/CSV 응답을 클라이언트가 받을 수 있으면
+brotli(Brotli 패키지가 설치된 경우)로, 아니면 gzip으로 압축한다. 스트리밍 응답은 gzip만 사용한다.
+"""
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 gzip만 사용
+    brotli = None
+
+COMPRESSIBLE_TYPES = {'application/json', 'application/x-ndjson', 'text/csv'}
+
+# 동적 응답용 품질 (11은 압축률이 조금 높지만 훨씬 느림)
+BROTLI_QUALITY = 5
+
+re_accepts_br = _lazy_re_compile(r'\bbr\b')
+
+
+class CompressionMiddleware(GZipMiddleware):
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '').split(';')[0].strip()
+        if content_type not in COMPRESSIBLE_TYPES:
+            return response
+        if not response.streaming and len(response.content) < getattr(settings, 'COMPRESS_MIN_SIZE', 1024):
+            return response
+
+        accepts_br = re_accepts_br.search(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if brotli is None or not accepts_br or response.streaming or response.has_header('Content-Encoding'):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed_content = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        if len(compressed_content) >= len(response.content):
+            return response
+        response.content = compressed_content
+        response.headers['Content-Length'] = str(len(response.content))
+
+        # 압축된 표현은 바이트가 다르므로 강한 ETag를 약한 ETag로 (If-None-Match는 약한 비교라 그대로 일치)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
@@ -0,0 +1,48 @@
+"""조건부 GET (ETag / Last-Modified)
+
+응답을 만들기 전에 버전 번호나 집계 쿼리로 검증자를 계산하고, 클라이언트가 가진 것과
+같으면 직렬화 없이 304를 돌려준다.
+"""
+import hashlib
+from calendar import timegm
+from functools import wraps
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    """검증자 구성 요소를 짧은 ETag 값으로 변환"""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:32]
+
+
+def conditional_get(validators):
+    """뷰셋 메서드용 조건부 GET 데코레이터
+
+    validators는 뷰 메서드와 같은 인자를 받아 (ETag 값, 마지막 수정 시각)을 반환한다.
+    둘 중 하나는 None이어도 된다.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return method(self, request, *args, **kwargs)
+
+            etag, last_modified = validators(self, request, *args, **kwargs)
+            etag = quote_etag(etag) if etag else None
+            last_modified = timegm(last_modified.utctimetuple()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = method(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            if etag:
+                response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+            # 브라우저가 임의로 캐시하지 않고 매번 검증 요청을 보내도록 함
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
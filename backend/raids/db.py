@@ -0,0 +1,60 @@
+"""SQLite 연결 설정과 잠금 충돌 재시도
+
+운영 프로필(SQLITE_PRODUCTION)에서는 연결마다 settings.SQLITE_PRAGMAS를 적용한다.
+WAL 모드에서도 쓰기는 한 번에 하나만 가능하므로, 쓰기 경로는 retry_on_lock으로 감싸
+잠금 충돌 시 제한된 횟수만큼 지수 백오프로 다시 시도한다.
+"""
+import functools
+import random
+import sqlite3
+import time
+
+from django.conf import settings
+from django.db import connection, OperationalError
+
+LOCK_ERROR_MESSAGES = ('database is locked', 'database table is locked', 'database is busy')
+
+
+def apply_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """connection_created 시그널 처리: 새 SQLite 연결에 PRAGMA 적용"""
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, pragmas)
+
+
+def is_lock_error(exc):
+    return isinstance(exc, (OperationalError, sqlite3.OperationalError)) and any(
+        message in str(exc) for message in LOCK_ERROR_MESSAGES
+    )
+
+
+def lock_backoff(attempt):
+    """attempt번째 재시도 전 대기 시간 (지수 증가, 상한 있음, 지터 적용)"""
+    base, cap = getattr(settings, 'DB_LOCK_BACKOFF', (0.05, 1.0))
+    return min(cap, base * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+def retry_on_lock(func):
+    """잠금 충돌로 실패한 쓰기를 DB_LOCK_RETRIES번까지 다시 실행
+
+    바깥 트랜잭션 안에서 호출되면 트랜잭션 전체를 다시 해야 하므로 재시도하지 않는다.
+    반드시 transaction.atomic 바깥에 적용한다.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        retries = getattr(settings, 'DB_LOCK_RETRIES', 5)
+        for attempt in range(retries + 1):
+            try:
+                return func(*args, **kwargs)
+            except (OperationalError, sqlite3.OperationalError) as exc:
+                if attempt == retries or not is_lock_error(exc) or connection.in_atomic_block:
+                    raise
+                time.sleep(lock_backoff(attempt))
+    return wrapper
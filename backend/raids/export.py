@@ -0,0 +1,82 @@
+"""공대 기록 스트리밍 내보내기 (NDJSON/CSV)
+
+시리얼라이저와 모델 인스턴스를 거치지 않고 values() 행을 iterator()로 나눠 읽어
+바로 한 줄씩 내보내므로, 기록이 50건이든 50만 건이든 메모리 사용량이 같다.
+(PostgreSQL에서 POSTGRES_PGBOUNCER=True로 서버 측 커서를 끄면 드라이버가 결과를 한 번에 받는다)
+"""
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import ItemDistribution, EquipmentSet, Equipment, RaidSchedule
+
+EXPORT_CHUNK_SIZE = 2000
+
+# 섹션 이름: (공대 ID로 거르는 쿼리셋 함수, 내보낼 필드)
+EXPORT_SECTIONS = {
+    'distributions': (
+        lambda group_id: ItemDistribution.objects.filter(raid_group_id=group_id).order_by('distributed_at', 'id'),
+        ['id', 'distributed_at', 'week_number', 'player_id', 'player__character_name',
+         'item_id', 'item__name', 'notes'],
+    ),
+    'equipment_sets': (
+        lambda group_id: EquipmentSet.objects.filter(player__raid_group_id=group_id).order_by('id'),
+        ['id', 'player_id', 'player__character_name', 'set_type', 'item_level', 'equipment_count',
+         'created_at', 'updated_at'],
+    ),
+    'equipments': (
+        lambda group_id: Equipment.objects.filter(equipment_set__player__raid_group_id=group_id).order_by('id'),
+        ['id', 'equipment_set_id', 'equipment_set__set_type', 'equipment_set__player_id',
+         'item_id', 'item__name', 'item__item_level', 'is_pentamelded'],
+    ),
+    'schedules': (
+        lambda group_id: RaidSchedule.objects.filter(raid_group_id=group_id).order_by('id'),
+        ['id', 'title', 'weekday', 'start_time', 'end_time', 'is_recurring', 'description',
+         'created_by_id', 'created_at', 'updated_at'],
+    ),
+}
+
+
+def export_rows(group_id, section):
+    """섹션의 행을 dict로 하나씩 반환"""
+    queryset, fields = EXPORT_SECTIONS[section]
+    return queryset(group_id).values(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def stream_ndjson(group_id, sections):
+    """한 줄에 JSON 객체 하나 (section 키로 구분)"""
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for section in sections:
+        for row in export_rows(group_id, section):
+            yield encoder.encode({'section': section, **row}) + '\n'
+
+
+class _Echo:
+    """csv.writer가 쓴 줄을 버퍼에 쌓지 않고 그대로 반환"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(group_id, section):
+    """한 섹션을 헤더가 있는 CSV로"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_SECTIONS[section][1])
+    for row in export_rows(group_id, section):
+        yield writer.writerow(row.values())
+
+
+def stream_export(group_id, export_format, sections):
+    """(줄 생성기, content type) 반환. CSV는 첫 번째 섹션만 내보낸다."""
+    if export_format == 'csv':
+        return stream_csv(group_id, sections[0]), 'text/csv; charset=utf-8'
+    return stream_ndjson(group_id, sections), 'application/x-ndjson; charset=utf-8'
+
+
+def parse_sections(value):
+    """쉼표로 구분된 섹션 목록 검증 (비어 있으면 전체, 알 수 없는 섹션은 ValueError)"""
+    sections = [section.strip() for section in (value or '').split(',') if section.strip()]
+    unknown = [section for section in sections if section not in EXPORT_SECTIONS]
+    if unknown:
+        raise ValueError(f'알 수 없는 섹션: {", ".join(unknown)} (가능: {", ".join(EXPORT_SECTIONS)})')
+    return sections or list(EXPORT_SECTIONS)
@@ -0,0 +1,116 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from raids import views
+from raids.models import RaidGroup, Player, Raid
+from raids.needs import compute_needs
+
+User = get_user_model()
+
+# 행 수가 적어 전체 스캔이 정상인 참조 데이터 테이블
+SMALL_TABLES = {'raids', 'jobs', 'item_types', 'currencies'}
+
+# (이름, 뷰셋, 쿼리 파라미터) - {group}, {player}, {raid}는 실제 ID로 치환
+VIEWSET_CASES = [
+    ('공대 목록', views.RaidGroupViewSet, {}),
+    ('공대원 목록 (공대별)', views.PlayerViewSet, {'raid_group': '{group}'}),
+    ('아이템 목록 (레이드별)', views.ItemViewSet, {'raid': '{raid}'}),
+    ('장비 세트 목록 (공대원별)', views.EquipmentSetViewSet, {'player': '{player}'}),
+    ('장비 세트 목록 (공대/종류별 아이템레벨순)', views.EquipmentSetViewSet, {
+        'raid_group': '{group}', 'set_type': 'target', 'ordering': '-item_level',
+    }),
+    ('분배 기록 (공대별)', views.ItemDistributionViewSet, {'raid_group': '{group}'}),
+    ('분배 기록 (공대/주차별)', views.ItemDistributionViewSet, {'raid_group': '{group}', 'week_number': '1'}),
+    ('분배 기록 (공대/기간별)', views.ItemDistributionViewSet, {
+        'raid_group': '{group}', 'distributed_after': '2024-01-01', 'distributed_before': '2024-02-01',
+    }),
+    ('레이드 일정 (공대별)', views.RaidScheduleViewSet, {'raid_group': '{group}'}),
+]
+
+
+class Command(BaseCommand):
+    help = '뷰셋 쿼리셋과 필요량 계산 쿼리의 실행 계획(EXPLAIN)을 확인하고 전체 테이블 스캔을 표시'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fail-on-scan', action='store_true',
+            help='전체 테이블 스캔이 있으면 오류로 종료합니다. (CI용)'
+        )
+        parser.add_argument(
+            '--show-plans', action='store_true',
+            help='문제가 없는 쿼리의 실행 계획도 출력합니다.'
+        )
+
+    def handle(self, *args, **options):
+        self.show_plans = options['show_plans']
+        ids = {
+            'group': RaidGroup.objects.values_list('id', flat=True).first() or 1,
+            'player': Player.objects.values_list('id', flat=True).first() or 1,
+            'raid': Raid.objects.values_list('id', flat=True).first() or 1,
+        }
+
+        flagged = 0
+        for label, viewset, params in VIEWSET_CASES:
+            queryset = self.viewset_queryset(viewset, {
+                key: value.format(**ids) for key, value in params.items()
+            })
+            sql, sql_params = queryset[:20].query.sql_with_params()
+            flagged += self.audit(label, sql, sql_params)
+
+        # 필요량 계산은 여러 쿼리로 나뉘므로 실행된 쿼리를 모아서 확인 (쓰기 없음, 만약을 위해 롤백)
+        with transaction.atomic():
+            player_ids = list(Player.objects.values_list('id', flat=True)[:8]) or [ids['player']]
+            with CaptureQueriesContext(connection) as ctx:
+                compute_needs(player_ids)
+                list(RaidGroup.objects.with_roster().filter(id=ids['group']))
+            transaction.set_rollback(True)
+        for index, query in enumerate(ctx.captured_queries, start=1):
+            flagged += self.audit(f'필요량/우선순위 계산 #{index}', query['sql'], None)
+
+        if flagged and options['fail_on_scan']:
+            raise CommandError(f'전체 테이블 스캔 {flagged}건')
+        style = self.style.WARNING if flagged else self.style.SUCCESS
+        self.stdout.write(style(f'전체 테이블 스캔 {flagged}건'))
+
+    def viewset_queryset(self, viewset, params):
+        request = Request(APIRequestFactory().get('/', params))
+        request.user = User.objects.first()
+        view = viewset(request=request, args=(), kwargs={}, action='list', format_kwarg=None)
+        return view.filter_queryset(view.get_queryset())
+
+    def explain(self, sql, params):
+        prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            rows = cursor.fetchall()
+        # SQLite는 (id, parent, notused, detail), 그 외는 한 줄짜리 계획
+        return [row[-1] for row in rows]
+
+    def full_scans(self, plan):
+        scans = []
+        for line in plan:
+            text = line.strip()
+            if text.startswith('SCAN ') and ' USING ' not in text:
+                table = text.split()[1]
+            elif 'Seq Scan on ' in text:
+                table = text.split('Seq Scan on ')[1].split()[0]
+            else:
+                continue
+            if table not in SMALL_TABLES:
+                scans.append(table)
+        return scans
+
+    def audit(self, label, sql, params):
+        plan = self.explain(sql, params)
+        scans = self.full_scans(plan)
+        if scans:
+            self.stdout.write(self.style.WARNING(f'[전체 스캔] {label}: {", ".join(scans)}'))
+        else:
+            self.stdout.write(f'[OK] {label}')
+        if scans or self.show_plans:
+            for line in plan:
+                self.stdout.write(f'    {line}')
+        return len(scans)
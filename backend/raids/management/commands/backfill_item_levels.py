@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from raids.models import EquipmentSet
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = '장비 세트에 저장된 평균 아이템레벨/장비 수를 묶음 단위로 재계산'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='값을 수정하지 않고 저장된 값이 장비 행과 일치하는지만 확인합니다.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help=f'한 번에 처리할 장비 세트 수 (기본값: {DEFAULT_BATCH_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total = changed = 0
+        last_id = 0
+        while True:
+            batch_ids = list(
+                EquipmentSet.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not batch_ids:
+                break
+            last_id = batch_ids[-1]
+            total += len(batch_ids)
+            batch = EquipmentSet.objects.filter(id__in=batch_ids)
+            if options['check']:
+                changed += self.count_mismatched(batch)
+            else:
+                changed += batch.refresh_item_levels()
+
+        if options['check']:
+            if changed:
+                raise CommandError(f'아이템레벨 불일치 {changed}건 (전체 {total}건)')
+            self.stdout.write(self.style.SUCCESS(f'장비 세트 {total}건이 모두 최신 상태입니다.'))
+            return
+        self.stdout.write(self.style.SUCCESS(f'장비 세트 {total}건 중 {changed}건을 갱신했습니다.'))
+
+    def count_mismatched(self, queryset):
+        return sum(
+            1 for equipment_set in queryset.with_item_level().annotate(counted_equipments=Count('equipments'))
+            if (equipment_set.calculate_item_level(), equipment_set.counted_equipments)
+            != (equipment_set.item_level, equipment_set.equipment_count)
+        )
@@ -0,0 +1,107 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+from raids.caching import bump_version, group_version_name, user_groups_version_name
+from raids.models import Raid, RaidGroup, Job, Player
+from raids.renderers import ORJSONRenderer
+from raids.serializers import RaidGroupSerializer
+from raids.views import RaidGroupViewSet
+
+User = get_user_model()
+
+# 이전 구현과 같은 응답 모양(공대장, 레이드, 공대원/사용자/직업 중첩)으로 비교
+URL = '/api/raids/groups/my_groups/?expand=raid,leader,players.user,players.job'
+
+
+class Command(BaseCommand):
+    help = '내 공대 목록 조회 시간 측정 (이전 구현/캐시 미스/캐시 적중 비교, 측정용 데이터는 롤백됨)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--groups', type=int, default=5, help='측정 사용자가 속한 공대 수 (기본값: 5)')
+        parser.add_argument('--players', type=int, default=8, help='공대별 공대원 수 (기본값: 8)')
+        parser.add_argument('--iterations', type=int, default=200, help='반복 횟수 (기본값: 200)')
+
+    def handle(self, *args, **options):
+        view = RaidGroupViewSet.as_view({'get': 'my_groups'})
+        factory = APIRequestFactory()
+
+        with transaction.atomic():
+            user, group_ids, user_ids = self.create_fixture(options['groups'], options['players'])
+
+            def request():
+                request = factory.get(URL, HTTP_HOST='localhost')
+                force_authenticate(request, user=user)
+                response = view(request)
+                response.render()
+                return response
+
+            def baseline():
+                # 이전 구현: 서브쿼리 + OR 조건 + distinct, prefetch/캐시 없이 전체 중첩 직렬화
+                request = Request(factory.get(URL, HTTP_HOST='localhost'))
+                player_groups = Player.objects.filter(user=user, is_active=True).values_list('raid_group', flat=True)
+                groups = RaidGroup.objects.filter(Q(id__in=player_groups) | Q(leader=user)).distinct()
+                data = RaidGroupSerializer(groups, many=True, context={'request': request}).data
+                return ORJSONRenderer().render(data)
+
+            def invalidate():
+                for group_id in group_ids:
+                    bump_version(group_version_name(group_id))
+                bump_version(user_groups_version_name(user.pk))
+
+            self.stdout.write(f'공대 {len(group_ids)}개 x 공대원 {options["players"]}명, {options["iterations"]}회 반복')
+            runs = (
+                ('이전 구현', baseline, None),
+                ('캐시 미스', request, invalidate),
+                ('캐시 적중', request, request),
+            )
+            medians = {}
+            for label, run, prepare in runs:
+                timings = []
+                for _ in range(options['iterations']):
+                    if prepare is not None:
+                        prepare()
+                    started = time.perf_counter()
+                    run()
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                medians[label] = statistics.median(timings)
+                self.stdout.write(
+                    f'{label}: 중앙값 {medians[label]:.2f}ms, '
+                    f'p95 {timings[int(len(timings) * 0.95) - 1]:.2f}ms'
+                )
+            for label in ('캐시 미스', '캐시 적중'):
+                self.stdout.write(f'{label}: 이전 구현 대비 {medians["이전 구현"] / medians[label]:.1f}배')
+
+            transaction.set_rollback(True)
+
+        # 롤백된 ID가 재사용되어도 측정 중 캐시된 응답을 쓰지 않도록 버전을 올려 둠
+        for group_id in group_ids:
+            bump_version(group_version_name(group_id))
+        for user_id in user_ids:
+            bump_version(user_groups_version_name(user_id))
+        bump_version('raids')
+        bump_version('jobs')
+
+    def create_fixture(self, group_count, player_count):
+        raid = Raid.objects.create(name='벤치마크', tier='영웅', patch='-', min_ilvl=0, max_ilvl=0)
+        job = Job.objects.create(name='벤치마크 직업', role='tank')
+        user = User.objects.create(username='benchmark-user')
+        user_ids = [user.pk]
+        group_ids = []
+        for g in range(group_count):
+            group = RaidGroup.objects.create(name=f'벤치마크 {g}', raid=raid, leader=user)
+            group_ids.append(group.id)
+            for p in range(player_count):
+                member = user if p == 0 else User.objects.create(username=f'benchmark-{g}-{p}')
+                user_ids.append(member.pk)
+                Player.objects.create(
+                    user=member, raid_group=group, job=job,
+                    character_name=f'벤치마크 {g}-{p}', item_level=700,
+                )
+        return user, group_ids, user_ids
@@ -0,0 +1,113 @@
+import gzip
+import json
+import statistics
+import time
+
+import orjson
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from raids.caching import REFERENCE_CATALOGS, bump_version, group_version_name, user_groups_version_name
+from raids.compression import BROTLI_QUALITY, brotli
+from raids.models import (
+    Raid, RaidGroup, Job, Player, ItemType, Item, Currency, CurrencyRequirement, EquipmentSet, Equipment
+)
+from raids.renderers import ORJSONRenderer
+
+User = get_user_model()
+
+# 프론트엔드가 요청하는 펼침과 같게 측정
+ITEM_EXPAND = 'item_type,raid,job_restrictions,currency_requirements.currency'
+
+
+class Command(BaseCommand):
+    help = 'JSON 직렬화(표준 json vs orjson)와 전송 크기(무압축/gzip/brotli) 비교 (측정용 데이터는 롤백됨)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--players', type=int, default=8, help='공대원 수 (기본값: 8)')
+        parser.add_argument('--iterations', type=int, default=200, help='반복 횟수 (기본값: 200)')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user, group = self.create_fixture(options['players'])
+            client = APIClient(HTTP_HOST='localhost')
+            client.force_authenticate(user)
+            urls = [
+                ('/items/', f'/api/raids/items/?expand={ITEM_EXPAND}'),
+                ('/groups/{id}/', f'/api/raids/groups/{group.id}/?expand=raid,leader,players.user,players.job'),
+                ('/equipment-sets/', f'/api/raids/equipment-sets/?raid_group={group.id}'
+                                     f'&expand=player,equipments.item.item_type'),
+            ]
+            payloads = []
+            for label, url in urls:
+                response = client.get(url)
+                assert response.status_code == 200, (url, response.status_code)
+                payloads.append((label, response.data))
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'{options["iterations"]}회 반복, 중앙값')
+        for label, data in payloads:
+            self.report(label, data, options['iterations'])
+
+        # 롤백된 ID가 재사용되어도 측정 중 캐시된 데이터를 쓰지 않도록 버전을 올려 둠
+        for name in ['items', *REFERENCE_CATALOGS]:
+            bump_version(name)
+        bump_version(group_version_name(group.id))
+        bump_version(user_groups_version_name(user.pk))
+
+    def report(self, label, data, iterations):
+        before = JSONRenderer().render(data)
+        after = ORJSONRenderer().render(data)
+        render_before = self.measure(lambda: JSONRenderer().render(data), iterations)
+        render_after = self.measure(lambda: ORJSONRenderer().render(data), iterations)
+        parse_before = self.measure(lambda: json.loads(before), iterations)
+        parse_after = self.measure(lambda: orjson.loads(after), iterations)
+
+        sizes = f'무압축 {len(before):,}B, gzip {len(gzip.compress(before, compresslevel=6)):,}B'
+        if brotli is not None:
+            sizes += f', brotli {len(brotli.compress(before, quality=BROTLI_QUALITY)):,}B'
+        self.stdout.write(
+            f'{label}: 렌더링 {render_before:.3f}ms -> {render_after:.3f}ms, '
+            f'파싱 {parse_before:.3f}ms -> {parse_after:.3f}ms, {sizes}'
+        )
+
+    def measure(self, func, iterations):
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def create_fixture(self, player_count):
+        raid = Raid.objects.create(name='벤치마크', tier='영웅', patch='-', min_ilvl=700, max_ilvl=735)
+        jobs = [Job.objects.create(name=f'벤치마크 직업 {i}', role='tank') for i in range(max(player_count, 4))]
+        currency = Currency.objects.create(name='벤치마크 석판', raid=raid, weekly_limit=450)
+        items = []
+        for slot in range(11):
+            item_type = ItemType.objects.create(name=f'벤치마크 부위 {slot}', slot=f'bench{slot}', order=slot)
+            for variant in range(4):
+                item = Item.objects.create(
+                    name=f'벤치마크 아이템 {slot}-{variant}', item_type=item_type,
+                    item_level=720 + variant, raid=raid,
+                )
+                item.job_restrictions.set(jobs[:4])
+                CurrencyRequirement.objects.create(item=item, currency=currency, amount=400 + variant)
+                items.append(item)
+
+        user = User.objects.create(username='benchmark-leader')
+        group = RaidGroup.objects.create(name='벤치마크', raid=raid, leader=user)
+        for p in range(player_count):
+            member = user if p == 0 else User.objects.create(username=f'benchmark-member-{p}')
+            player = Player.objects.create(
+                user=member, raid_group=group, job=jobs[p],
+                character_name=f'벤치마크 {p}', item_level=700,
+            )
+            for set_type in ('start', 'current', 'target'):
+                equipment_set = EquipmentSet.objects.create(player=player, set_type=set_type)
+                Equipment.objects.bulk_create([
+                    Equipment(equipment_set=equipment_set, item=items[slot * 4 + p % 4]) for slot in range(11)
+                ])
+        return user, group
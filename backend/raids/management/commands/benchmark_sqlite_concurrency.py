@@ -0,0 +1,121 @@
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from raids.db import apply_pragmas, is_lock_error, retry_on_lock
+
+SCHEMA = [
+    'CREATE TABLE item_distributions (id INTEGER PRIMARY KEY, raid_group_id INTEGER, player_id INTEGER, '
+    'item_id INTEGER, distributed_at REAL)',
+    'CREATE INDEX distribution_group_idx ON item_distributions (raid_group_id, distributed_at)',
+    'CREATE TABLE equipments (equipment_set_id INTEGER, item_id INTEGER, is_pentamelded INTEGER, '
+    'PRIMARY KEY (equipment_set_id, item_id))',
+]
+
+
+class Command(BaseCommand):
+    help = 'SQLite 기본 설정과 운영 프로필의 동시 읽기/쓰기 처리량 비교 (임시 DB 파일 사용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4, help='읽기 스레드 수 (기본값: 4)')
+        parser.add_argument('--writers', type=int, default=4, help='쓰기 스레드 수 (기본값: 4)')
+        parser.add_argument('--seconds', type=float, default=3.0, help='프로필별 측정 시간 (기본값: 3초)')
+
+    def handle(self, *args, **options):
+        profiles = [
+            # 현재 기본값: 요청마다 새 연결, 롤백 저널, 재시도 없음
+            ('기본 설정', {}, False, False),
+            # 운영 프로필: 지속 연결, WAL 등 PRAGMA, 잠금 충돌 재시도
+            ('운영 프로필', settings.SQLITE_PRODUCTION_PRAGMAS, True, True),
+        ]
+        self.stdout.write(
+            f'읽기 {options["readers"]}개 / 쓰기 {options["writers"]}개 스레드, 프로필별 {options["seconds"]}초'
+        )
+        for label, pragmas, persistent, retry in profiles:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'benchmark.sqlite3')
+                result = self.run_profile(path, pragmas, persistent, retry, options)
+            self.stdout.write(
+                f'{label}: 읽기 {result["reads"] / options["seconds"]:.0f}회/초, '
+                f'쓰기 {result["writes"] / options["seconds"]:.0f}회/초, 잠금 오류 {result["errors"]}건'
+            )
+
+    def run_profile(self, path, pragmas, persistent, retry, options):
+        setup = sqlite3.connect(path)
+        apply_pragmas(setup, pragmas)
+        for statement in SCHEMA:
+            setup.execute(statement)
+        setup.executemany(
+            'INSERT INTO equipments VALUES (?, ?, 0)',
+            [(set_id, item_id) for set_id in range(100) for item_id in range(10)],
+        )
+        setup.commit()
+        setup.close()
+
+        counts = {'reads': 0, 'writes': 0, 'errors': 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + options['seconds']
+
+        def connect():
+            # isolation_level=None: BEGIN/COMMIT을 직접 실행
+            conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            apply_pragmas(conn, pragmas)
+            return conn
+
+        def write(conn):
+            # 분배 기록 + 장비 변경을 한 트랜잭션으로 (레이드 당일 쓰기 패턴)
+            conn.execute('BEGIN')
+            try:
+                conn.execute(
+                    'INSERT INTO item_distributions (raid_group_id, player_id, item_id, distributed_at) '
+                    'VALUES (?, ?, ?, ?)',
+                    (random.randrange(10), random.randrange(80), random.randrange(10), time.time()),
+                )
+                conn.execute(
+                    'UPDATE equipments SET is_pentamelded = 1 - is_pentamelded '
+                    'WHERE equipment_set_id = ? AND item_id = ?',
+                    (random.randrange(100), random.randrange(10)),
+                )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+        def read(conn):
+            conn.execute(
+                'SELECT * FROM item_distributions WHERE raid_group_id = ? ORDER BY distributed_at DESC LIMIT 20',
+                (random.randrange(10),),
+            ).fetchall()
+
+        def worker(operation, key):
+            operation = retry_on_lock(operation) if retry and key == 'writes' else operation
+            conn = connect() if persistent else None
+            while time.monotonic() < deadline:
+                current = conn or connect()
+                try:
+                    operation(current)
+                    with lock:
+                        counts[key] += 1
+                except sqlite3.OperationalError as exc:
+                    if not is_lock_error(exc):
+                        raise
+                    with lock:
+                        counts['errors'] += 1
+                finally:
+                    if conn is None:
+                        current.close()
+            if conn is not None:
+                conn.close()
+
+        threads = [threading.Thread(target=worker, args=(read, 'reads')) for _ in range(options['readers'])]
+        threads += [threading.Thread(target=worker, args=(write, 'writes')) for _ in range(options['writers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return counts
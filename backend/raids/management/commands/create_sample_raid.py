@@ -1,5 +1,5 @@
 from django.core.management.base import BaseCommand
-from raids.models import Raid, Currency, Item, ItemType, CurrencyRequirement
+from raids.catalog import import_records
 
 
 class Command(BaseCommand):
@@ -8,38 +8,21 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.stdout.write('라이트헤비 영웅 레이드 데이터를 생성합니다...')
         
-        # 레이드 생성
-        raid, created = Raid.objects.update_or_create(
-            name='아르카디아: 라이트헤비급급',
-            tier='영웅',
-            defaults={
-                'patch': '7.0',
-                'min_ilvl': 690,
-                'max_ilvl': 735
-            }
-        )
-        if created:
-            self.stdout.write(self.style.SUCCESS(f'레이드 생성: {raid.name}'))
+        raid_key = ['아르카디아: 라이트헤비급급', '영웅']
+        records = [
+            {'type': 'raid', 'name': raid_key[0], 'tier': raid_key[1],
+             'patch': '7.0', 'min_ilvl': 690, 'max_ilvl': 735},
+        ]
         
-        # 재화 생성
+        # 재화
         currencies_data = [
             {'name': '라이트헤비 낱장', 'weekly_limit': 8},
             {'name': '천도 석판', 'weekly_limit': 0},  # 무기 교환용
         ]
-        
-        currencies = {}
-        for currency_data in currencies_data:
-            currency, created = Currency.objects.update_or_create(
-                name=currency_data['name'],
-                raid=raid,
-                defaults={'weekly_limit': currency_data['weekly_limit']}
-            )
-            currencies[currency.name] = currency
-            if created:
-                self.stdout.write(self.style.SUCCESS(f'재화 생성: {currency.name}'))
-        
-        # 아이템 타입 가져오기
-        item_types = {it.name: it for it in ItemType.objects.all()}
+        records.extend(
+            {'type': 'currency', 'raid': raid_key, **currency_data}
+            for currency_data in currencies_data
+        )
         
         # 샘플 아이템 생성 (일부만)
         items_data = [
@@ -74,36 +57,25 @@ class Command(BaseCommand):
             {'name': '라이트헤비 반지', 'type': '반지', 'ilvl': 730, 'floor': 1, 'currency': {'라이트헤비 낱장': 4}},
         ]
         
-        # 아이템 생성
-        for item_data in items_data:
-            item_type = item_types.get(item_data['type'])
-            if not item_type:
-                self.stdout.write(self.style.WARNING(f'아이템 타입을 찾을 수 없음: {item_data["type"]}'))
-                continue
-            
-            item, created = Item.objects.update_or_create(
-                name=item_data['name'],
-                raid=raid,
-                defaults={
-                    'item_type': item_type,
-                    'item_level': item_data['ilvl'],
-                    'floor': item_data['floor'],
-                    'is_weapon': item_data.get('is_weapon', False)
-                }
-            )
-            
-            if created:
-                self.stdout.write(self.style.SUCCESS(f'아이템 생성: {item.name}'))
-                
-                # 재화 요구사항 생성
-                for currency_name, amount in item_data.get('currency', {}).items():
-                    currency = currencies.get(currency_name)
-                    if currency:
-                        CurrencyRequirement.objects.create(
-                            item=item,
-                            currency=currency,
-                            amount=amount
-                        )
-                        self.stdout.write(f'  - 필요 재화: {currency_name} x{amount}')
+        records.extend(
+            {
+                'type': 'item',
+                'name': item_data['name'],
+                'raid': raid_key,
+                'item_type': item_data['type'],
+                'item_level': item_data['ilvl'],
+                'floor': item_data['floor'],
+                'is_weapon': item_data.get('is_weapon', False),
+                'currency_requirements': item_data.get('currency', {}),
+            }
+            for item_data in items_data
+        )
+        
+        # 카탈로그 가져오기와 같은 경로로 일괄 저장 (없는 참조는 경고 후 건너뜀)
+        stats, warnings = import_records(records, strict=False)
+        for warning in warnings:
+            self.stdout.write(self.style.WARNING(warning))
+        for record_type, (created, updated) in stats.items():
+            self.stdout.write(f'{record_type}: 생성 {created}건, 수정 {updated}건')
         
-        self.stdout.write(self.style.SUCCESS('천옥 영웅 레이드 데이터 생성 완료!'))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS('천옥 영웅 레이드 데이터 생성 완료!'))
@@ -0,0 +1,27 @@
+import json
+
+from django.core.management.base import BaseCommand
+from raids.catalog import export_records
+
+
+class Command(BaseCommand):
+    help = '카탈로그(JSON Lines) 내보내기'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', help='저장할 파일 경로 (기본값: 표준 출력)')
+        parser.add_argument('--raid', type=int, action='append', dest='raid_ids', help='내보낼 레이드 ID (여러 번 지정 가능)')
+
+    def handle(self, *args, **options):
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                count = self.write_records(f, options['raid_ids'])
+            self.stderr.write(self.style.SUCCESS(f'레코드 {count}건을 {options["output"]}에 저장했습니다.'))
+        else:
+            self.write_records(self.stdout, options['raid_ids'])
+
+    def write_records(self, out, raid_ids):
+        count = 0
+        for record in export_records(raid_ids):
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+        return count
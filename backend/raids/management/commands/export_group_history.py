@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from raids.export import parse_sections, stream_export
+from raids.models import RaidGroup
+
+
+class Command(BaseCommand):
+    help = '공대의 분배/장비/일정 기록을 NDJSON 또는 CSV로 스트리밍 내보내기'
+
+    def add_arguments(self, parser):
+        parser.add_argument('group_id', type=int, help='공대 ID')
+        parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson', dest='export_format',
+                            help='출력 형식 (기본값: ndjson, csv는 첫 번째 섹션만)')
+        parser.add_argument('--sections', help='쉼표로 구분된 섹션 (기본값: 전체)')
+        parser.add_argument('--output', '-o', help='저장할 파일 경로 (기본값: 표준 출력)')
+
+    def handle(self, *args, **options):
+        if not RaidGroup.objects.filter(pk=options['group_id']).exists():
+            raise CommandError(f'공대를 찾을 수 없습니다: {options["group_id"]}')
+        try:
+            sections = parse_sections(options['sections'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        lines, _ = stream_export(options['group_id'], options['export_format'], sections)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as f:
+                count = 0
+                for line in lines:
+                    f.write(line)
+                    count += 1
+            self.stderr.write(self.style.SUCCESS(f'{count}줄을 {options["output"]}에 저장했습니다.'))
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
@@ -0,0 +1,34 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from raids.catalog import CatalogError, import_records, read_records
+
+
+class Command(BaseCommand):
+    help = '카탈로그(JSON Lines) 가져오기 - 레이드, 재화, 아이템, 직업 제한, 재화 요구사항'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="카탈로그 파일 경로 ('-'이면 표준 입력)")
+        parser.add_argument(
+            '--skip-missing', action='store_true',
+            help='참조를 찾을 수 없는 항목은 오류 대신 경고 후 건너뜁니다.'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            if options['path'] == '-':
+                stats, warnings = import_records(read_records(sys.stdin), strict=not options['skip_missing'])
+            else:
+                with open(options['path'], encoding='utf-8') as f:
+                    stats, warnings = import_records(read_records(f), strict=not options['skip_missing'])
+        except (OSError, CatalogError) as e:
+            raise CommandError(str(e))
+
+        for warning in warnings:
+            self.stdout.write(self.style.WARNING(warning))
+        for record_type, (created, updated) in stats.items():
+            self.stdout.write(f'{record_type}: 생성 {created}건, 수정 {updated}건')
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'카탈로그 가져오기 완료 ({elapsed:.3f}초)'))
@@ -1,87 +1,148 @@
-from django.core.management.base import BaseCommand
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from raids.caching import bump_version
 from raids.models import Job, ItemType
 
+# 기본 데이터가 바뀌면 버전을 올려서 이전 스냅샷을 불러오지 않도록 함
+REFERENCE_DATA_VERSION = 1
+
+# 직업 데이터
+JOBS = [
+    # 탱커
+    {'name': '전사', 'role': 'tank', 'icon': '전사'},
+    {'name': '나이트', 'role': 'tank', 'icon': '나이트'},
+    {'name': '암흑기사', 'role': 'tank', 'icon': '암흑기사'},
+    {'name': '건브레이커', 'role': 'tank', 'icon': '건브레이커'},
+
+    # 힐러
+    {'name': '백마도사', 'role': 'healer', 'icon': '백마도사'},
+    {'name': '학자', 'role': 'healer', 'icon': '학자'},
+    {'name': '점성술사', 'role': 'healer', 'icon': '점성술사'},
+    {'name': '현자', 'role': 'healer', 'icon': '현자'},
+
+    # 근딜
+    {'name': '몽크', 'role': 'melee', 'icon': '몽크'},
+    {'name': '용기사', 'role': 'melee', 'icon': '용기사'},
+    {'name': '닌자', 'role': 'melee', 'icon': '닌자'},
+    {'name': '사무라이', 'role': 'melee', 'icon': '사무라이'},
+    {'name': '리퍼', 'role': 'melee', 'icon': '리퍼'},
+    {'name': '바이퍼', 'role': 'melee', 'icon': '바이퍼'},
+
+    # 원딜
+    {'name': '음유시인', 'role': 'ranged', 'icon': '음유시인'},
+    {'name': '기공사', 'role': 'ranged', 'icon': '기공사'},
+    {'name': '무도가', 'role': 'ranged', 'icon': '무도가'},
+
+    # 캐스터
+    {'name': '흑마도사', 'role': 'caster', 'icon': '흑마도사'},
+    {'name': '소환사', 'role': 'caster', 'icon': '소환사'},
+    {'name': '적마도사', 'role': 'caster', 'icon': '적마도사'},
+    {'name': '픽토맨서', 'role': 'caster', 'icon': '픽토맨서'},
+]
+
+# 아이템 타입 데이터
+ITEM_TYPES = [
+    {'name': '무기', 'slot': 'weapon', 'order': 1},
+    {'name': '머리', 'slot': 'head', 'order': 2},
+    {'name': '몸통', 'slot': 'body', 'order': 3},
+    {'name': '손', 'slot': 'hands', 'order': 4},
+    {'name': '다리', 'slot': 'legs', 'order': 5},
+    {'name': '발', 'slot': 'feet', 'order': 6},
+    {'name': '귀걸이', 'slot': 'earrings', 'order': 7},
+    {'name': '목걸이', 'slot': 'necklace', 'order': 8},
+    {'name': '팔찌', 'slot': 'bracelet', 'order': 9},
+    {'name': '반지', 'slot': 'ring', 'order': 10},
+]
+
+REFERENCE_MODELS = [
+    ('jobs', Job, ['role', 'icon']),
+    ('item_types', ItemType, ['slot', 'order']),
+]
+
 
 class Command(BaseCommand):
-    help = 'FF14 기본 데이터 초기화'
+    help = 'FF14 기본 데이터 초기화 (변경된 행만 반영)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='데이터를 수정하지 않고 최신 상태인지만 확인합니다. 최신이 아니면 오류로 종료합니다.'
+        )
+        parser.add_argument('--dump', metavar='PATH', help='현재 기본 데이터를 버전이 기록된 스냅샷으로 저장합니다.')
+        parser.add_argument('--load', metavar='PATH', help='내장 데이터 대신 스냅샷 파일의 데이터를 반영합니다.')
 
     def handle(self, *args, **options):
-        self.stdout.write('FF14 기본 데이터를 초기화합니다...')
-        
-        # 직업 데이터
-        jobs_data = [
-            # 탱커
-            {'name': '전사', 'role': 'tank', 'icon': '전사'},
-            {'name': '나이트', 'role': 'tank', 'icon': '나이트'},
-            {'name': '암흑기사', 'role': 'tank', 'icon': '암흑기사'},
-            {'name': '건브레이커', 'role': 'tank', 'icon': '건브레이커'},
-            
-            # 힐러
-            {'name': '백마도사', 'role': 'healer', 'icon': '백마도사'},
-            {'name': '학자', 'role': 'healer', 'icon': '학자'},
-            {'name': '점성술사', 'role': 'healer', 'icon': '점성술사'},
-            {'name': '현자', 'role': 'healer', 'icon': '현자'},
-            
-            # 근딜
-            {'name': '몽크', 'role': 'melee', 'icon': '몽크'},
-            {'name': '용기사', 'role': 'melee', 'icon': '용기사'},
-            {'name': '닌자', 'role': 'melee', 'icon': '닌자'},
-            {'name': '사무라이', 'role': 'melee', 'icon': '사무라이'},
-            {'name': '리퍼', 'role': 'melee', 'icon': '리퍼'},
-            {'name': '바이퍼', 'role': 'melee', 'icon': '바이퍼'},
-            
-            # 원딜
-            {'name': '음유시인', 'role': 'ranged', 'icon': '음유시인'},
-            {'name': '기공사', 'role': 'ranged', 'icon': '기공사'},
-            {'name': '무도가', 'role': 'ranged', 'icon': '무도가'},
-            
-            # 캐스터
-            {'name': '흑마도사', 'role': 'caster', 'icon': '흑마도사'},
-            {'name': '소환사', 'role': 'caster', 'icon': '소환사'},
-            {'name': '적마도사', 'role': 'caster', 'icon': '적마도사'},
-            {'name': '픽토맨서', 'role': 'caster', 'icon': '픽토맨서'},
-        ]
-        
-        # 직업 생성
-        for job_data in jobs_data:
-            job, created = Job.objects.update_or_create(
-                name=job_data['name'],
-                defaults={
-                    'role': job_data['role'],
-                    'icon': job_data['icon']
-                }
-            )
-            if created:
-                self.stdout.write(self.style.SUCCESS(f'직업 생성: {job.name}'))
-            else:
-                self.stdout.write(f'직업 업데이트: {job.name}')
-        
-        # 아이템 타입 데이터
-        item_types_data = [
-            {'name': '무기', 'slot': 'weapon', 'order': 1},
-            {'name': '머리', 'slot': 'head', 'order': 2},
-            {'name': '몸통', 'slot': 'body', 'order': 3},
-            {'name': '손', 'slot': 'hands', 'order': 4},
-            {'name': '다리', 'slot': 'legs', 'order': 5},
-            {'name': '발', 'slot': 'feet', 'order': 6},
-            {'name': '귀걸이', 'slot': 'earrings', 'order': 7},
-            {'name': '목걸이', 'slot': 'necklace', 'order': 8},
-            {'name': '팔찌', 'slot': 'bracelet', 'order': 9},
-            {'name': '반지', 'slot': 'ring', 'order': 10},
-        ]
-        
-        # 아이템 타입 생성
-        for item_type_data in item_types_data:
-            item_type, created = ItemType.objects.update_or_create(
-                name=item_type_data['name'],
-                defaults={
-                    'slot': item_type_data['slot'],
-                    'order': item_type_data['order']
-                }
+        if options['dump']:
+            self.dump(options['dump'])
+            return
+
+        data = self.load(options['load']) if options['load'] else {'jobs': JOBS, 'item_types': ITEM_TYPES}
+        changes = {
+            key: self.diff(model, data[key], fields)
+            for key, model, fields in REFERENCE_MODELS
+        }
+        pending = sum(len(to_create) + len(to_update) for to_create, to_update in changes.values())
+
+        if options['check']:
+            if pending:
+                raise CommandError(f'FF14 기본 데이터가 최신이 아닙니다. (변경 필요 {pending}건)')
+            self.stdout.write(self.style.SUCCESS('FF14 기본 데이터가 최신 상태입니다.'))
+            return
+
+        if not pending:
+            self.stdout.write('FF14 기본 데이터가 이미 최신 상태입니다.')
+            return
+
+        with transaction.atomic():
+            for key, model, fields in REFERENCE_MODELS:
+                to_create, to_update = changes[key]
+                model.objects.bulk_create(to_create)
+                if to_update:
+                    model.objects.bulk_update(to_update, fields)
+                if to_create or to_update:
+                    # bulk 쓰기는 시그널을 보내지 않으므로 직접 캐시 무효화
+                    bump_version(key)
+                if options['verbosity'] > 1:
+                    for obj in to_create + to_update:
+                        self.stdout.write(f'{model._meta.verbose_name} 반영: {obj.name}')
+                self.stdout.write(
+                    f'{model._meta.verbose_name}: 생성 {len(to_create)}건, 수정 {len(to_update)}건'
+                )
+
+        self.stdout.write(self.style.SUCCESS('FF14 기본 데이터 초기화 완료!'))
+
+    def diff(self, model, rows, fields):
+        """이름 기준으로 기존 행과 비교해 (생성할 객체, 수정할 객체) 반환"""
+        existing = model.objects.in_bulk([row['name'] for row in rows], field_name='name')
+        to_create, to_update = [], []
+        for row in rows:
+            obj = existing.get(row['name'])
+            if obj is None:
+                to_create.append(model(**row))
+            elif any(getattr(obj, field) != row[field] for field in fields):
+                for field in fields:
+                    setattr(obj, field, row[field])
+                to_update.append(obj)
+        return to_create, to_update
+
+    def dump(self, path):
+        snapshot = {'version': REFERENCE_DATA_VERSION}
+        for key, model, fields in REFERENCE_MODELS:
+            snapshot[key] = list(model.objects.order_by('id').values('name', *fields))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'기본 데이터 스냅샷(버전 {REFERENCE_DATA_VERSION})을 {path}에 저장했습니다.'))
+
+    def load(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'스냅샷을 읽을 수 없습니다: {e}')
+        if snapshot.get('version') != REFERENCE_DATA_VERSION:
+            raise CommandError(
+                f'스냅샷 버전({snapshot.get("version")})이 현재 버전({REFERENCE_DATA_VERSION})과 다릅니다.'
             )
-            if created:
-                self.stdout.write(self.style.SUCCESS(f'아이템 타입 생성: {item_type.name}'))
-            else:
-                self.stdout.write(f'아이템 타입 업데이트: {item_type.name}')
-        
-        self.stdout.write(self.style.SUCCESS('FF14 기본 데이터 초기화 완료!'))
\ No newline at end of file
+        return snapshot
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+from raids.models import Player, NeedLedger
+from raids.needs import LEDGER_BATCH_SIZE, compute_needs, refresh_need_ledgers
+
+
+class Command(BaseCommand):
+    help = '공대원 필요 원장 재계산 및 정합성 검사'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='원장을 수정하지 않고 저장된 값과 실제 계산값을 비교합니다.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=LEDGER_BATCH_SIZE,
+            help=f'한 번에 처리할 공대원 수 (기본값: {LEDGER_BATCH_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        player_ids = list(Player.objects.order_by('id').values_list('id', flat=True))
+        batch_size = options['batch_size']
+        batches = [player_ids[i:i + batch_size] for i in range(0, len(player_ids), batch_size)]
+
+        if options['check']:
+            mismatched = []
+            for batch in batches:
+                mismatched.extend(self.check_batch(batch))
+            if mismatched:
+                for player_id in mismatched:
+                    self.stdout.write(self.style.WARNING(f'불일치: 공대원 #{player_id}'))
+                raise CommandError(f'필요 원장 불일치 {len(mismatched)}건')
+            self.stdout.write(self.style.SUCCESS(f'필요 원장 {len(player_ids)}건이 모두 최신 상태입니다.'))
+            return
+
+        for batch in batches:
+            refresh_need_ledgers(batch)
+        self.stdout.write(self.style.SUCCESS(f'필요 원장 {len(player_ids)}건을 재계산했습니다.'))
+
+    def check_batch(self, player_ids):
+        """저장된 원장과 테이블에서 직접 계산한 값을 비교해 불일치 공대원 ID 반환"""
+        expected = compute_needs(player_ids)
+        ledgers = NeedLedger.objects.prefetch_related('items', 'currencies').in_bulk(player_ids)
+
+        mismatched = []
+        for player_id, need in expected.items():
+            ledger = ledgers.get(player_id)
+            if ledger is None:
+                mismatched.append(player_id)
+                continue
+            stored = {
+                'has_target_set': ledger.has_target_set,
+                'item_ids': {ledger_item.item_id for ledger_item in ledger.items.all()},
+                'currency_amounts': {
+                    ledger_currency.currency_id: ledger_currency.amount
+                    for ledger_currency in ledger.currencies.all()
+                },
+            }
+            if stored != need or ledger.needed_items_count != len(need['item_ids']):
+                mismatched.append(player_id)
+        return mismatched
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.11 on 2026-10-17 14:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('raids', '0003_alter_item_floor_alter_item_raid'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NeedLedger',
+            fields=[
+                ('player', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='need_ledger', serialize=False, to='raids.player', verbose_name='플레이어')),
+                ('has_target_set', models.BooleanField(default=False, verbose_name='목표 세트 여부')),
+                ('needed_items_count', models.IntegerField(default=0, verbose_name='필요 아이템 수')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '필요 원장',
+                'verbose_name_plural': '필요 원장 목록',
+                'db_table': 'need_ledgers',
+            },
+        ),
+        migrations.CreateModel(
+            name='NeedLedgerItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='raids.item', verbose_name='아이템')),
+                ('ledger', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='raids.needledger', verbose_name='필요 원장')),
+            ],
+            options={
+                'verbose_name': '필요 아이템',
+                'verbose_name_plural': '필요 아이템 목록',
+                'db_table': 'need_ledger_items',
+                'unique_together': {('ledger', 'item')},
+            },
+        ),
+        migrations.CreateModel(
+            name='NeedLedgerCurrency',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.IntegerField(verbose_name='필요량')),
+                ('currency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='raids.currency', verbose_name='재화')),
+                ('ledger', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='currencies', to='raids.needledger', verbose_name='필요 원장')),
+            ],
+            options={
+                'verbose_name': '필요 재화',
+                'verbose_name_plural': '필요 재화 목록',
+                'db_table': 'need_ledger_currencies',
+                'unique_together': {('ledger', 'currency')},
+            },
+        ),
+    ]
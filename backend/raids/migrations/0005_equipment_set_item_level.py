@@ -0,0 +1,27 @@
+# Generated by Django 4.2.11 on 2026-10-17 14:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('raids', '0004_need_ledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipmentset',
+            name='equipment_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='장비 수'),
+        ),
+        migrations.AddField(
+            model_name='equipmentset',
+            name='item_level',
+            field=models.PositiveIntegerField(default=0, verbose_name='평균 아이템레벨'),
+        ),
+        migrations.AddIndex(
+            model_name='equipmentset',
+            index=models.Index(fields=['set_type', 'item_level'], name='equipment_set_type_ilvl_idx'),
+        ),
+    ]
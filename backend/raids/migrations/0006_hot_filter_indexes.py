@@ -0,0 +1,37 @@
+# Generated by Django 4.2.11 on 2026-10-17 14:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('raids', '0005_equipment_set_item_level'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['raid', 'floor'], name='item_raid_floor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='itemdistribution',
+            index=models.Index(fields=['raid_group', 'week_number'], name='distribution_group_week_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='itemdistribution',
+            index=models.Index(fields=['raid_group', '-distributed_at'], name='distribution_group_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='itemdistribution',
+            index=models.Index(fields=['player', 'item'], name='distribution_player_item_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['raid_group'], name='player_active_group_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user'], name='player_active_user_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.11 on 2026-10-17 15:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('raids', '0006_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='itemdistribution',
+            name='distribution_group_week_idx',
+        ),
+        migrations.AddIndex(
+            model_name='itemdistribution',
+            index=models.Index(fields=['raid_group', 'week_number', '-distributed_at'], name='distribution_group_week_idx'),
+        ),
+    ]
@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 User = get_user_model()
@@ -25,6 +26,25 @@ class Raid(models.Model):
         return f"{self.name} ({self.tier})"
 
 
+class RaidGroupQuerySet(models.QuerySet):
+    """공대 쿼리셋"""
+
+    def with_player_count(self):
+        """활성 인원 수를 annotate"""
+        return self.annotate(
+            active_player_count=models.Count('players', filter=models.Q(players__is_active=True))
+        )
+
+    def with_roster(self):
+        """공대장, 공대원(사용자)을 미리 불러오고 활성 인원 수를 annotate (레이드/직업은 참조 데이터 캐시 사용)"""
+        return self.select_related('leader').prefetch_related(
+            models.Prefetch(
+                'players',
+                queryset=Player.objects.select_related('user'),
+            )
+        ).with_player_count()
+
+
 class RaidGroup(models.Model):
     """공대 정보"""
     DISTRIBUTION_CHOICES = [
@@ -40,6 +60,8 @@ class RaidGroup(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = RaidGroupQuerySet.as_manager()
+    
     class Meta:
         verbose_name = '공대'
         verbose_name_plural = '공대 목록'
@@ -88,6 +110,11 @@ class Player(models.Model):
         verbose_name_plural = '공대원 목록'
         db_table = 'players'
         unique_together = ['user', 'raid_group']
+        indexes = [
+            # 공대별/사용자별 활성 공대원 조회 (비활성 공대원은 인덱스에서 제외)
+            models.Index(fields=['raid_group'], condition=models.Q(is_active=True), name='player_active_group_idx'),
+            models.Index(fields=['user'], condition=models.Q(is_active=True), name='player_active_user_idx'),
+        ]
     
     def __str__(self):
         return f"{self.character_name} ({self.job.name if self.job else 'N/A'})"
@@ -123,9 +150,20 @@ class Item(models.Model):
         verbose_name = '아이템'
         verbose_name_plural = '아이템 목록'
         db_table = 'items'
+        indexes = [
+            models.Index(fields=['raid', 'floor'], name='item_raid_floor_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} (IL{self.item_level})"
+    
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            # 아이템레벨/무기 여부가 바뀌면 이 아이템을 장비한 세트의 아이템레벨도 바뀜
+            if not adding:
+                EquipmentSet.objects.containing_items([self.pk]).refresh_item_levels()
 
 
 class Currency(models.Model):
@@ -143,6 +181,56 @@ class Currency(models.Model):
         return self.name
 
 
+class EquipmentSetQuerySet(models.QuerySet):
+    """장비 세트 쿼리셋"""
+
+    def with_item_level(self):
+        """무기 2배 가중치를 적용한 아이템레벨 합계/가중치를 SQL로 annotate"""
+        is_weapon = models.Q(equipments__item__is_weapon=True)
+        item_level = models.F('equipments__item__item_level')
+        return self.annotate(
+            item_level_sum=models.Sum(
+                models.Case(
+                    models.When(is_weapon, then=item_level * 2),
+                    default=item_level,
+                )
+            ),
+            item_level_weight=models.Sum(
+                models.Case(
+                    models.When(is_weapon, then=models.Value(2)),
+                    default=models.Value(1),
+                ),
+                filter=models.Q(equipments__isnull=False),
+            ),
+        )
+
+    def containing_items(self, item_ids):
+        """지정한 아이템을 장비한 세트 (아이템레벨 집계와 조인이 섞이지 않도록 서브쿼리 사용)"""
+        return self.filter(
+            id__in=Equipment.objects.filter(item_id__in=item_ids).values('equipment_set_id')
+        )
+
+    def refresh_item_levels(self):
+        """저장된 아이템레벨/장비 수를 장비 행 기준으로 다시 계산하고 바뀐 세트만 저장
+
+        반환값: 갱신된 세트 수
+        """
+        equipment_sets = self.with_item_level().annotate(
+            counted_equipments=models.Count('equipments')
+        ).only('id', 'item_level', 'equipment_count')
+
+        changed = []
+        for equipment_set in equipment_sets:
+            item_level = equipment_set.calculate_item_level()
+            if (item_level, equipment_set.counted_equipments) != (equipment_set.item_level, equipment_set.equipment_count):
+                equipment_set.item_level = item_level
+                equipment_set.equipment_count = equipment_set.counted_equipments
+                changed.append(equipment_set)
+        if changed:
+            EquipmentSet.objects.bulk_update(changed, ['item_level', 'equipment_count'], batch_size=500)
+        return len(changed)
+
+
 class EquipmentSet(models.Model):
     """장비 세트"""
     SET_TYPE_CHOICES = [
@@ -153,20 +241,34 @@ class EquipmentSet(models.Model):
     
     player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='equipment_sets', verbose_name='플레이어')
     set_type = models.CharField(max_length=10, choices=SET_TYPE_CHOICES, verbose_name='세트 종류')
+    # 장비 행에서 계산한 값을 저장 (장비/아이템 쓰기 경로에서 refresh_item_levels()로 갱신)
+    item_level = models.PositiveIntegerField(default=0, verbose_name='평균 아이템레벨')
+    equipment_count = models.PositiveIntegerField(default=0, verbose_name='장비 수')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = EquipmentSetQuerySet.as_manager()
+    
     class Meta:
         verbose_name = '장비 세트'
         verbose_name_plural = '장비 세트 목록'
         db_table = 'equipment_sets'
         unique_together = ['player', 'set_type']
+        indexes = [
+            models.Index(fields=['set_type', 'item_level'], name='equipment_set_type_ilvl_idx'),
+        ]
     
     def __str__(self):
         return f"{self.player.character_name} - {self.get_set_type_display()}"
     
     def calculate_item_level(self):
-        """평균 아이템레벨 계산"""
+        """장비 행에서 평균 아이템레벨 계산 (저장된 값은 item_level 필드)"""
+        # with_item_level()로 annotate된 경우 추가 쿼리 없이 계산
+        if hasattr(self, 'item_level_weight'):
+            if not self.item_level_weight:
+                return 0
+            return round(self.item_level_sum / self.item_level_weight)
+        
         equipments = self.equipments.all()
         if not equipments:
             return 0
@@ -199,6 +301,24 @@ class Equipment(models.Model):
     
     def __str__(self):
         return f"{self.equipment_set} - {self.item.name}"
+    
+    # 단건 저장/삭제(관리자 화면 등)는 세트의 아이템레벨과 수정 시각(ETag/Last-Modified)을 바로 갱신하고,
+    # bulk 쓰기 경로는 refresh_item_levels()와 updated_at 갱신을 직접 호출한다.
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.touch_equipment_set()
+    
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            self.touch_equipment_set()
+        return result
+    
+    def touch_equipment_set(self):
+        equipment_sets = EquipmentSet.objects.filter(pk=self.equipment_set_id)
+        equipment_sets.update(updated_at=timezone.now())
+        equipment_sets.refresh_item_levels()
 
 
 class ItemDistribution(models.Model):
@@ -214,6 +334,13 @@ class ItemDistribution(models.Model):
         verbose_name = '아이템 분배'
         verbose_name_plural = '아이템 분배 기록'
         db_table = 'item_distributions'
+        indexes = [
+            # 주차 필터 + 최근순 커서 페이지네이션을 정렬 없이 처리
+            models.Index(fields=['raid_group', 'week_number', '-distributed_at'], name='distribution_group_week_idx'),
+            models.Index(fields=['raid_group', '-distributed_at'], name='distribution_group_recent_idx'),
+            # 필요 원장 계산의 분배 여부 확인
+            models.Index(fields=['player', 'item'], name='distribution_player_item_idx'),
+        ]
     
     def __str__(self):
         return f"{self.player.character_name} - {self.item.name} ({self.week_number}주차)"
@@ -265,4 +392,44 @@ class CurrencyRequirement(models.Model):
         unique_together = ['item', 'currency']
     
     def __str__(self):
-        return f"{self.item.name} - {self.currency.name}: {self.amount}개"
\ No newline at end of file
+        return f"{self.item.name} - {self.currency.name}: {self.amount}개"
+
+class NeedLedger(models.Model):
+    """공대원별 필요 아이템/재화 원장 (목표 세트 - 현재 세트 - 분배받은 아이템)"""
+    player = models.OneToOneField(Player, on_delete=models.CASCADE, primary_key=True, related_name='need_ledger', verbose_name='플레이어')
+    has_target_set = models.BooleanField(default=False, verbose_name='목표 세트 여부')
+    needed_items_count = models.IntegerField(default=0, verbose_name='필요 아이템 수')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = '필요 원장'
+        verbose_name_plural = '필요 원장 목록'
+        db_table = 'need_ledgers'
+    
+    def __str__(self):
+        return f"{self.player.character_name} - 필요 아이템 {self.needed_items_count}개"
+
+
+class NeedLedgerItem(models.Model):
+    """필요 원장의 개별 아이템"""
+    ledger = models.ForeignKey(NeedLedger, on_delete=models.CASCADE, related_name='items', verbose_name='필요 원장')
+    item = models.ForeignKey(Item, on_delete=models.CASCADE, verbose_name='아이템')
+    
+    class Meta:
+        verbose_name = '필요 아이템'
+        verbose_name_plural = '필요 아이템 목록'
+        db_table = 'need_ledger_items'
+        unique_together = ['ledger', 'item']
+
+
+class NeedLedgerCurrency(models.Model):
+    """필요 원장의 재화별 합계"""
+    ledger = models.ForeignKey(NeedLedger, on_delete=models.CASCADE, related_name='currencies', verbose_name='필요 원장')
+    currency = models.ForeignKey(Currency, on_delete=models.CASCADE, verbose_name='재화')
+    amount = models.IntegerField(verbose_name='필요량')
+    
+    class Meta:
+        verbose_name = '필요 재화'
+        verbose_name_plural = '필요 재화 목록'
+        db_table = 'need_ledger_currencies'
+        unique_together = ['ledger', 'currency']
@@ -0,0 +1,166 @@
+"""장비 목표 대비 필요 아이템/재화 계산
+
+필요량은 공대원별 필요 원장(NeedLedger)에 저장해 두고, 장비나 분배 기록이
+바뀌는 쓰기 경로에서 해당 공대원의 원장만 다시 계산한다.
+"""
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Sum
+
+from .caching import REFERENCE_CATALOGS
+from .models import (
+    Player, EquipmentSet, Equipment, ItemDistribution,
+    NeedLedger, NeedLedgerItem, NeedLedgerCurrency
+)
+
+LEDGER_BATCH_SIZE = 500
+
+
+def needed_equipments(player_ids):
+    """목표 세트에 있지만 현재 세트에도 없고 분배받지도 않은 장비 쿼리셋"""
+    owned = Equipment.objects.filter(
+        equipment_set__player_id=OuterRef('equipment_set__player_id'),
+        equipment_set__set_type='current',
+        item_id=OuterRef('item_id'),
+    )
+    received = ItemDistribution.objects.filter(
+        player_id=OuterRef('equipment_set__player_id'),
+        item_id=OuterRef('item_id'),
+    )
+    return Equipment.objects.filter(
+        equipment_set__player_id__in=player_ids,
+        equipment_set__set_type='target',
+    ).exclude(Exists(owned)).exclude(Exists(received))
+
+
+def compute_needs(player_ids):
+    """원장을 거치지 않고 테이블에서 직접 필요량 계산
+
+    반환값: {player_id: {'has_target_set': bool, 'item_ids': set, 'currency_amounts': {currency_id: 수량}}}
+    """
+    player_ids = list(player_ids)
+    target_player_ids = set(
+        EquipmentSet.objects.filter(
+            player_id__in=player_ids, set_type='target'
+        ).values_list('player_id', flat=True)
+    )
+    needs = {
+        player_id: {
+            'has_target_set': player_id in target_player_ids,
+            'item_ids': set(),
+            'currency_amounts': {},
+        }
+        for player_id in player_ids
+    }
+    if not target_player_ids:
+        return needs
+
+    needed = needed_equipments(target_player_ids)
+    for player_id, item_id in needed.values_list('equipment_set__player_id', 'item_id'):
+        needs[player_id]['item_ids'].add(item_id)
+
+    # 공대원/재화별 필요량 합계
+    currency_totals = needed.filter(
+        item__currency_requirements__isnull=False
+    ).values(
+        player_id=F('equipment_set__player_id'),
+        currency_id=F('item__currency_requirements__currency_id'),
+    ).annotate(amount=Sum('item__currency_requirements__amount')).order_by()
+    for row in currency_totals:
+        needs[row['player_id']]['currency_amounts'][row['currency_id']] = row['amount']
+
+    return needs
+
+
+@transaction.atomic
+def refresh_need_ledgers(player_ids):
+    """지정한 공대원들의 필요 원장을 다시 계산해 저장
+
+    같은 공대원의 원장을 동시에 다시 만들면 삭제/생성이 엇갈리므로 공대원 행을 먼저 잠근다.
+    (이미 삭제된 공대원은 잠금 결과에서 빠지므로 원장을 만들지 않음)
+    """
+    player_ids = list(
+        Player.objects.select_for_update().filter(id__in=set(player_ids)).order_by('id').values_list('id', flat=True)
+    )
+    if not player_ids:
+        return
+
+    needs = compute_needs(player_ids)
+
+    NeedLedger.objects.filter(player_id__in=player_ids).delete()
+    NeedLedger.objects.bulk_create([
+        NeedLedger(
+            player_id=player_id,
+            has_target_set=need['has_target_set'],
+            needed_items_count=len(need['item_ids']),
+        )
+        for player_id, need in needs.items()
+    ])
+    NeedLedgerItem.objects.bulk_create([
+        NeedLedgerItem(ledger_id=player_id, item_id=item_id)
+        for player_id, need in needs.items()
+        for item_id in need['item_ids']
+    ], batch_size=LEDGER_BATCH_SIZE)
+    NeedLedgerCurrency.objects.bulk_create([
+        NeedLedgerCurrency(ledger_id=player_id, currency_id=currency_id, amount=amount)
+        for player_id, need in needs.items()
+        for currency_id, amount in need['currency_amounts'].items()
+    ], batch_size=LEDGER_BATCH_SIZE)
+
+
+def refresh_need_ledgers_for_items(item_ids):
+    """아이템(재화 요구사항 등)이 바뀌었을 때 해당 아이템이 필요한 공대원의 원장 갱신"""
+    player_ids = NeedLedgerItem.objects.filter(
+        item_id__in=list(item_ids)
+    ).values_list('ledger_id', flat=True).distinct()
+    refresh_need_ledgers(player_ids)
+
+
+def get_need_ledgers(player_ids):
+    """필요 원장 조회 (원장이 아직 없는 공대원은 저장하지 않고 직접 계산)
+
+    조회 경로에서는 원장을 쓰지 않는다. 빠진 원장은 쓰기 경로나 rebuild_need_ledger가 채운다.
+    반환값: {player_id: {'has_target_set': bool, 'needed_items_count': 개수, 'currency_amounts': {currency_id: 수량}}}
+    """
+    player_ids = set(player_ids)
+    ledgers = {
+        player_id: {
+            'has_target_set': ledger.has_target_set,
+            'needed_items_count': ledger.needed_items_count,
+            'currency_amounts': {
+                ledger_currency.currency_id: ledger_currency.amount
+                for ledger_currency in ledger.currencies.all()
+            },
+        }
+        for player_id, ledger in NeedLedger.objects.prefetch_related('currencies').in_bulk(player_ids).items()
+    }
+
+    missing = player_ids - set(ledgers)
+    if missing:
+        for player_id, need in compute_needs(missing).items():
+            ledgers[player_id] = {
+                'has_target_set': need['has_target_set'],
+                'needed_items_count': len(need['item_ids']),
+                'currency_amounts': need['currency_amounts'],
+            }
+    return ledgers
+
+
+def calculate_needs(player_ids):
+    """공대원별 필요 아이템 수와 재화량 조회
+
+    목표 세트가 없는 공대원은 결과에서 제외된다.
+    반환값: {player_id: {'currency_needs': {재화명: 수량}, 'needed_items_count': 개수}}
+    """
+    currencies = REFERENCE_CATALOGS['currencies']
+    currency_data = currencies.get()
+    return {
+        player_id: {
+            'currency_needs': {
+                currencies.lookup(currency_id, currency_data)['name']: amount
+                for currency_id, amount in ledger['currency_amounts'].items()
+            },
+            'needed_items_count': ledger['needed_items_count'],
+        }
+        for player_id, ledger in get_need_ledgers(player_ids).items()
+        if ledger['has_target_set']
+    }
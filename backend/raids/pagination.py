@@ -0,0 +1,38 @@
+"""커서 기반 페이지네이션
+
+PageNumberPagination은 깊은 페이지일수록 OFFSET 스캔과 매번 COUNT(*)가 필요하다.
+기록이 계속 쌓이는 목록은 정렬 키 위치로 이어서 읽는 커서 방식을 사용한다.
+(응답: {'next': ..., 'previous': ..., 'results': [...]}, 전체 개수 없음)
+"""
+from django.urls import reverse
+from rest_framework.pagination import CursorPagination
+
+
+class DistributionCursorPagination(CursorPagination):
+    """최근 분배부터 (공대별 distributed_at 인덱스 순서와 같음)"""
+    ordering = ('-distributed_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class PlayerCursorPagination(CursorPagination):
+    """등록 순 (기본 키 순서), ?cursor=를 준 요청만 사용 (기본 목록은 페이지 번호 방식)"""
+    ordering = ('id',)
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class SnapshotDistributionPagination(DistributionCursorPagination):
+    """공대 스냅샷에 담는 최근 분배 기록
+
+    다음 페이지 링크는 분배 기록 목록(/distributions/?raid_group=...)을 가리키므로
+    이전 기록은 스냅샷 전체를 다시 받지 않고 목록 API로 이어서 읽는다.
+    """
+    page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        rows = super().paginate_queryset(queryset, request, view)
+        params = request.query_params.copy()
+        params['raid_group'] = view.kwargs['pk']
+        self.base_url = request.build_absolute_uri(reverse('raids:itemdistribution-list')) + '?' + params.urlencode()
+        return rows
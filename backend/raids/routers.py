@@ -0,0 +1,118 @@
+"""읽기 전용 복제본 라우팅
+
+settings.REPLICA_DATABASE가 지정되면 ReplicaRoutingMiddleware가 요청마다 복제본 사용 여부를 정하고
+ReplicaRouter가 그에 따라 읽기 쿼리를 복제본으로 보낸다.
+
+- 안전한 메서드(GET/HEAD/OPTIONS) 요청과 replica_reads로 표시한 뷰만 복제본에서 읽는다.
+- 요청 중 쓰기가 한 번이라도 일어나면 남은 읽기는 primary에서 하고, 응답에 고정 쿠키를 붙여
+  REPLICA_PIN_SECONDS 동안 같은 클라이언트의 읽기도 primary로 보낸다. (자신이 쓴 내용 읽기 보장)
+- 트랜잭션 안의 읽기와 버전 번호로 캐시/ETag를 만드는 읽기는 항상 primary에서 한다.
+  복제 지연 중에 읽은 이전 데이터가 새 버전으로 캐시되면 다음 변경 전까지 남기 때문이다.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = 'primary_pin'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RoutingState:
+    """요청별 라우팅 상태 (asgiref가 컨텍스트를 복사해도 공유되도록 변경 가능한 객체로 보관)"""
+
+    def __init__(self):
+        self.replica = False
+        self.wrote = False
+
+
+_state = ContextVar('raids_routing_state', default=None)
+
+
+def replica_alias():
+    return getattr(settings, 'REPLICA_DATABASE', None)
+
+
+def replica_reads_enabled():
+    state = _state.get()
+    return bool(state and state.replica and replica_alias())
+
+
+def pin_primary():
+    """현재 요청의 남은 읽기를 primary로 고정"""
+    state = _state.get()
+    if state is not None:
+        state.replica = False
+
+
+@contextmanager
+def use_primary():
+    """블록 안의 읽기만 primary에서 실행"""
+    state = _state.get()
+    previous = state.replica if state is not None else False
+    pin_primary()
+    try:
+        yield
+    finally:
+        if state is not None and not state.wrote:
+            state.replica = previous
+
+
+def replica_reads(view):
+    """안전하지 않은 메서드지만 읽기만 하는 뷰(계산 API 등)를 복제본 대상으로 표시"""
+    view.replica_reads = True
+    return view
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if replica_reads_enabled() and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.replica = False
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 복제본은 primary와 같은 데이터이므로 서로 다른 쪽에서 읽은 객체끼리도 연결 가능
+        databases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """요청별 복제본 사용 여부 결정, 쓰기가 있었던 응답에 primary 고정 쿠키 설정"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote and replica_alias():
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 5),
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _state.get()
+        if state is None or state.wrote:
+            return None
+        state.replica = bool(
+            replica_alias()
+            and (request.method in SAFE_METHODS or getattr(view_func, 'replica_reads', False))
+            and PIN_COOKIE not in request.COOKIES
+        )
+        return None
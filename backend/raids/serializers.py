@@ -1,10 +1,120 @@
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 from .models import (
     Raid, RaidGroup, Job, Player, ItemType, Item, Currency,
     EquipmentSet, Equipment, ItemDistribution, RaidSchedule, CurrencyRequirement
 )
+from .caching import REFERENCE_CATALOGS, bump_version
+from .needs import refresh_need_ledgers, refresh_need_ledgers_for_items
 from accounts.serializers import UserSerializer
 
+EQUIPMENT_BATCH_SIZE = 500
+
+
+class CachedReferenceField(serializers.Field):
+    """참조 데이터 캐시에서 직렬화된 값을 가져오는 읽기 전용 필드
+
+    외래키 ID만 읽으므로 관련 객체를 select_related로 불러올 필요가 없다.
+    """
+    def __init__(self, catalog, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+        self.catalog = catalog
+
+    def bind(self, field_name, parent):
+        if self.source is None:
+            self.source = f'{field_name}_id'
+        super().bind(field_name, parent)
+
+    def to_representation(self, value):
+        # 버전 조회는 직렬화(루트 시리얼라이저) 한 번에 카탈로그별로 한 번만
+        snapshots = self.root.__dict__.setdefault('_reference_catalogs', {})
+        catalog = REFERENCE_CATALOGS[self.catalog]
+        if self.catalog not in snapshots:
+            snapshots[self.catalog] = catalog.get()
+        return catalog.lookup(value, snapshots[self.catalog])
+
+
+def parse_field_list(value):
+    return {part.strip() for part in (value or '').split(',') if part.strip()}
+
+
+class FieldOptions:
+    """?fields=, ?expand= 요청 옵션 (점으로 중첩 경로 지정: players.user)"""
+
+    def __init__(self, fields=(), expand=()):
+        self.fields = set(fields)
+        # players.user를 펼치면 players도 펼침
+        self.expand = {
+            '.'.join(parts[:depth])
+            for parts in (path.split('.') for path in expand)
+            for depth in range(1, len(parts) + 1)
+        }
+
+    @classmethod
+    def from_request(cls, request):
+        if request is None:
+            return cls()
+        params = getattr(request, 'query_params', request.GET)
+        return cls(parse_field_list(params.get('fields')), parse_field_list(params.get('expand')))
+
+    def is_expanded(self, path):
+        return path in self.expand
+
+    def is_requested(self, path):
+        """fields에 포함되는지 (같은 단계의 필드를 하나도 지정하지 않았으면 전체 포함)"""
+        parent, _, name = path.rpartition('.')
+        prefix = f'{parent}.' if parent else ''
+        selected = {field[len(prefix):].split('.')[0] for field in self.fields if field.startswith(prefix)}
+        return not selected or name in selected
+
+    def cache_key(self):
+        return f"{','.join(sorted(self.fields))}|{','.join(sorted(self.expand))}"
+
+
+class ExpandableFieldsMixin:
+    """?fields=로 응답 필드를 고르고 ?expand=로 중첩 관계를 펼치는 시리얼라이저
+
+    Meta.expandable_fields에 나열한 관계는 펼치지 않으면 ID(목록)로 직렬화한다.
+    옵션은 context['field_options'] 또는 context['request']의 쿼리 파라미터에서 읽는다.
+    """
+
+    @property
+    def field_options(self):
+        root = self.root
+        if not hasattr(root, '_field_options'):
+            root._field_options = self.context.get('field_options') or FieldOptions.from_request(
+                self.context.get('request')
+            )
+        return root._field_options
+
+    @property
+    def field_path(self):
+        names, node = [], self
+        while node is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return '.'.join(reversed(names))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        options = self.field_options
+        prefix = f'{self.field_path}.' if self.field_path else ''
+        for name in list(fields):
+            if not fields[name].write_only and not options.is_requested(prefix + name):
+                del fields[name]
+        for name in getattr(self.Meta, 'expandable_fields', ()):
+            if name in fields and not options.is_expanded(prefix + name):
+                fields[name] = self.build_id_field(name, fields[name])
+        return fields
+
+    def build_id_field(self, name, field):
+        if isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField)):
+            return serializers.PrimaryKeyRelatedField(many=True, read_only=True, source=field.source)
+        return serializers.ReadOnlyField(source=f'{field.source or name}_id')
+
 
 class JobSerializer(serializers.ModelSerializer):
     """직업 시리얼라이저"""
@@ -22,10 +132,10 @@ class RaidSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class PlayerSerializer(serializers.ModelSerializer):
+class PlayerSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     """공대원 시리얼라이저"""
     user = UserSerializer(read_only=True)
-    job = JobSerializer(read_only=True)
+    job = CachedReferenceField('jobs')
     job_id = serializers.PrimaryKeyRelatedField(
         queryset=Job.objects.all(), source='job', write_only=True
     )
@@ -35,12 +145,13 @@ class PlayerSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'raid_group', 'job', 'job_id', 
                  'character_name', 'item_level', 'is_active', 'joined_at']
         read_only_fields = ['joined_at']
+        expandable_fields = ['user', 'job']
 
 
-class RaidGroupSerializer(serializers.ModelSerializer):
+class RaidGroupSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     """공대 시리얼라이저"""
     leader = UserSerializer(read_only=True)
-    raid = RaidSerializer(read_only=True)
+    raid = CachedReferenceField('raids')
     raid_id = serializers.PrimaryKeyRelatedField(
         queryset=Raid.objects.all(), source='raid', write_only=True
     )
@@ -53,8 +164,12 @@ class RaidGroupSerializer(serializers.ModelSerializer):
                  'distribution_method', 'is_active', 'players', 
                  'player_count', 'created_at', 'updated_at']
         read_only_fields = ['leader', 'created_at', 'updated_at']
+        expandable_fields = ['raid', 'leader', 'players']
     
     def get_player_count(self, obj):
+        # with_roster()로 annotate된 경우 추가 쿼리 없이 사용
+        if hasattr(obj, 'active_player_count'):
+            return obj.active_player_count
         return obj.players.filter(is_active=True).count()
 
 
@@ -72,22 +187,23 @@ class CurrencySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'raid', 'weekly_limit']
 
 
-class CurrencyRequirementSerializer(serializers.ModelSerializer):
+class CurrencyRequirementSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     """재화 요구사항 시리얼라이저"""
-    currency = CurrencySerializer(read_only=True)
+    currency = CachedReferenceField('currencies')
     
     class Meta:
         model = CurrencyRequirement
         fields = ['id', 'currency', 'amount']
+        expandable_fields = ['currency']
 
 
-class ItemSerializer(serializers.ModelSerializer):
+class ItemSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     """아이템 시리얼라이저"""
-    item_type = ItemTypeSerializer(read_only=True)
+    item_type = CachedReferenceField('item_types')
     item_type_id = serializers.PrimaryKeyRelatedField(
         queryset=ItemType.objects.all(), source='item_type', write_only=True
     )
-    raid = RaidSerializer(read_only=True)
+    raid = CachedReferenceField('raids')
     raid_id = serializers.PrimaryKeyRelatedField(
         queryset=Raid.objects.all(), source='raid', write_only=True
     )
@@ -103,9 +219,152 @@ class ItemSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'item_type', 'item_type_id', 'item_level', 
                  'raid', 'raid_id', 'floor', 'is_weapon', 'job_restrictions', 
                  'job_restrictions_ids', 'currency_requirements']
+        expandable_fields = ['item_type', 'raid', 'job_restrictions', 'currency_requirements']
+
+
+def sync_currency_requirements(requirements_by_item):
+    """아이템별 재화 요구사항을 한 번에 동기화 (변경된 행만 추가/수정/삭제)
+
+    requirements_by_item: {item_id: [{'currency_id': ..., 'amount': ...}, ...]}
+    반환값: 요구사항이 실제로 바뀐 아이템 ID 집합
+    """
+    desired = {
+        item_id: {int(req['currency_id']): int(req['amount']) for req in requirements}
+        for item_id, requirements in requirements_by_item.items()
+    }
+    existing = {}
+    for requirement in CurrencyRequirement.objects.filter(item_id__in=desired):
+        existing.setdefault(requirement.item_id, {})[requirement.currency_id] = requirement
+    
+    to_create, to_update, to_delete = [], [], []
+    for item_id, amounts in desired.items():
+        current = existing.get(item_id, {})
+        for currency_id, amount in amounts.items():
+            requirement = current.get(currency_id)
+            if requirement is None:
+                to_create.append(CurrencyRequirement(item_id=item_id, currency_id=currency_id, amount=amount))
+            elif requirement.amount != amount:
+                requirement.amount = amount
+                to_update.append(requirement)
+        to_delete.extend(
+            requirement for currency_id, requirement in current.items() if currency_id not in amounts
+        )
+    
+    if to_delete:
+        CurrencyRequirement.objects.filter(id__in=[requirement.id for requirement in to_delete]).delete()
+    if to_create:
+        CurrencyRequirement.objects.bulk_create(to_create)
+    if to_update:
+        CurrencyRequirement.objects.bulk_update(to_update, ['amount'])
+    if to_create or to_update:
+        # bulk 쓰기는 시그널을 보내지 않으므로 직접 캐시 무효화
+        bump_version('items')
+    
+    return {requirement.item_id for requirement in to_create + to_update + to_delete}
+
 
+class CurrencyRequirementWriteSerializer(serializers.Serializer):
+    """재화 요구사항 입력 시리얼라이저"""
+    currency_id = serializers.IntegerField()
+    amount = serializers.IntegerField(min_value=0)
+
+
+class ItemBulkListSerializer(serializers.ListSerializer):
+    """아이템 일괄 등록/수정 시리얼라이저"""
+    
+    def validate(self, attrs):
+        is_update = self.instance is not None
+        if is_update and any('id' not in entry for entry in attrs):
+            raise serializers.ValidationError("수정할 아이템의 id가 필요합니다.")
+        
+        references = [
+            (ItemType.objects, {entry['item_type_id'] for entry in attrs if 'item_type_id' in entry}),
+            (Raid.objects, {entry['raid_id'] for entry in attrs if entry.get('raid_id') is not None}),
+            (Job.objects, {job_id for entry in attrs for job_id in entry.get('job_restrictions_ids', [])}),
+            (Currency.objects, {
+                req['currency_id'] for entry in attrs for req in entry.get('currency_requirements', [])
+            }),
+        ]
+        if is_update:
+            references.append((self.instance, {entry['id'] for entry in attrs}))
+        for queryset, ids in references:
+            if ids and queryset.filter(id__in=ids).count() != len(ids):
+                raise serializers.ValidationError(
+                    f"존재하지 않는 {queryset.model._meta.verbose_name}이(가) 포함되어 있습니다."
+                )
+        return attrs
+    
+    @transaction.atomic
+    def create(self, validated_data):
+        items = Item.objects.bulk_create([
+            Item(**self.child.item_fields(entry)) for entry in validated_data
+        ])
+        self.save_relations(items, validated_data)
+        return items
+    
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        items = instance.in_bulk([entry['id'] for entry in validated_data])
+        updated_fields = set()
+        for entry in validated_data:
+            fields = self.child.item_fields(entry)
+            for field, value in fields.items():
+                setattr(items[entry['id']], field, value)
+            updated_fields.update(fields)
+        
+        items = [items[entry['id']] for entry in validated_data]
+        if updated_fields:
+            Item.objects.bulk_update(items, sorted(updated_fields))
+        if updated_fields & {'item_level', 'is_weapon'}:
+            EquipmentSet.objects.containing_items([item.id for item in items]).refresh_item_levels()
+        self.save_relations(items, validated_data)
+        return items
+    
+    def save_relations(self, items, validated_data):
+        """직업 제한과 재화 요구사항을 일괄 저장"""
+        # 아이템/직업 제한 bulk 쓰기는 시그널을 보내지 않으므로 직접 캐시 무효화
+        bump_version('items')
+        through = Item.job_restrictions.through
+        job_restrictions = {
+            item.id: entry['job_restrictions_ids']
+            for item, entry in zip(items, validated_data) if 'job_restrictions_ids' in entry
+        }
+        if job_restrictions:
+            through.objects.filter(item_id__in=job_restrictions).delete()
+            through.objects.bulk_create([
+                through(item_id=item_id, job_id=job_id)
+                for item_id, job_ids in job_restrictions.items() for job_id in set(job_ids)
+            ])
+        
+        changed = sync_currency_requirements({
+            item.id: entry['currency_requirements']
+            for item, entry in zip(items, validated_data) if 'currency_requirements' in entry
+        })
+        refresh_need_ledgers_for_items(changed)
 
-class EquipmentSerializer(serializers.ModelSerializer):
+
+class ItemBulkSerializer(serializers.Serializer):
+    """아이템 일괄 등록/수정 시리얼라이저 (many=True 전용)"""
+    ITEM_FIELDS = ['name', 'item_type_id', 'item_level', 'raid_id', 'floor', 'is_weapon']
+    
+    id = serializers.IntegerField(required=False)
+    name = serializers.CharField(max_length=100)
+    item_type_id = serializers.IntegerField()
+    item_level = serializers.IntegerField()
+    raid_id = serializers.IntegerField(allow_null=True, required=False)
+    floor = serializers.IntegerField(min_value=1, max_value=4, allow_null=True, required=False)
+    is_weapon = serializers.BooleanField(required=False)
+    job_restrictions_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    currency_requirements = CurrencyRequirementWriteSerializer(many=True, required=False)
+    
+    class Meta:
+        list_serializer_class = ItemBulkListSerializer
+    
+    def item_fields(self, entry):
+        return {field: entry[field] for field in self.ITEM_FIELDS if field in entry}
+
+
+class EquipmentSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     """장비 시리얼라이저"""
     item = ItemSerializer(read_only=True)
     item_id = serializers.PrimaryKeyRelatedField(
@@ -115,25 +374,23 @@ class EquipmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Equipment
         fields = ['id', 'equipment_set', 'item', 'item_id', 'is_pentamelded']
+        expandable_fields = ['item']
 
 
-class EquipmentSetSerializer(serializers.ModelSerializer):
+class EquipmentSetSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     """장비 세트 시리얼라이저"""
     player = PlayerSerializer(read_only=True)
     equipments = EquipmentSerializer(many=True, read_only=True)
-    item_level = serializers.SerializerMethodField()
     
     class Meta:
         model = EquipmentSet
         fields = ['id', 'player', 'set_type', 'equipments', 
-                 'item_level', 'created_at', 'updated_at']
-        read_only_fields = ['created_at', 'updated_at']
-    
-    def get_item_level(self, obj):
-        return obj.calculate_item_level()
+                 'item_level', 'equipment_count', 'created_at', 'updated_at']
+        read_only_fields = ['item_level', 'equipment_count', 'created_at', 'updated_at']
+        expandable_fields = ['player', 'equipments']
 
 
-class ItemDistributionSerializer(serializers.ModelSerializer):
+class ItemDistributionSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     """아이템 분배 시리얼라이저"""
     player = PlayerSerializer(read_only=True)
     player_id = serializers.PrimaryKeyRelatedField(
@@ -148,9 +405,63 @@ class ItemDistributionSerializer(serializers.ModelSerializer):
         model = ItemDistribution
         fields = ['id', 'raid_group', 'player', 'player_id', 
                  'item', 'item_id', 'distributed_at', 'week_number', 'notes']
+        expandable_fields = ['player', 'item']
+
+
+class ItemDistributionEntrySerializer(serializers.Serializer):
+    """일괄 분배 기록의 개별 항목 시리얼라이저"""
+    player_id = serializers.IntegerField()
+    item_id = serializers.IntegerField()
+    distributed_at = serializers.DateTimeField(required=False)
+    notes = serializers.CharField(allow_blank=True, required=False, default='')
+
+
+class ItemDistributionBulkSerializer(serializers.Serializer):
+    """아이템 일괄 분배 기록 시리얼라이저 (한 번의 레이드에서 나온 전리품)"""
+    raid_group_id = serializers.IntegerField()
+    week_number = serializers.IntegerField()
+    distributed_at = serializers.DateTimeField(required=False)
+    distributions = ItemDistributionEntrySerializer(many=True, allow_empty=False)
+    
+    def validate(self, attrs):
+        if not RaidGroup.objects.filter(id=attrs['raid_group_id']).exists():
+            raise serializers.ValidationError("공대를 찾을 수 없습니다.")
+        
+        player_ids = {entry['player_id'] for entry in attrs['distributions']}
+        active_player_ids = set(
+            Player.objects.filter(
+                raid_group_id=attrs['raid_group_id'], is_active=True, id__in=player_ids
+            ).values_list('id', flat=True)
+        )
+        if active_player_ids != player_ids:
+            raise serializers.ValidationError("공대의 활성 공대원이 아닌 플레이어가 포함되어 있습니다.")
+        
+        item_ids = {entry['item_id'] for entry in attrs['distributions']}
+        if Item.objects.filter(id__in=item_ids).count() != len(item_ids):
+            raise serializers.ValidationError("존재하지 않는 아이템이 포함되어 있습니다.")
+        return attrs
+    
+    @transaction.atomic
+    def create(self, validated_data):
+        distributed_at = validated_data.get('distributed_at') or timezone.now()
+        distributions = ItemDistribution.objects.bulk_create([
+            ItemDistribution(
+                raid_group_id=validated_data['raid_group_id'],
+                player_id=entry['player_id'],
+                item_id=entry['item_id'],
+                distributed_at=entry.get('distributed_at') or distributed_at,
+                week_number=validated_data['week_number'],
+                notes=entry['notes'],
+            )
+            for entry in validated_data['distributions']
+        ])
+        
+        # 분배받은 공대원들의 필요 원장은 한 번만 갱신
+        refresh_need_ledgers({distribution.player_id for distribution in distributions})
+        return distributions
 
 
-class RaidScheduleSerializer(serializers.ModelSerializer):
+class RaidScheduleSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     """레이드 일정 시리얼라이저"""
     created_by = UserSerializer(read_only=True)
     
@@ -160,6 +471,7 @@ class RaidScheduleSerializer(serializers.ModelSerializer):
                  'end_time', 'is_recurring', 'description', 'created_by', 
                  'created_at', 'updated_at']
         read_only_fields = ['created_by', 'created_at', 'updated_at']
+        expandable_fields = ['created_by']
 
 
 class PlayerCreateSerializer(serializers.ModelSerializer):
@@ -171,35 +483,77 @@ class PlayerCreateSerializer(serializers.ModelSerializer):
         fields = ['user', 'raid_group', 'job', 'character_name', 'item_level']
 
 
+class EquipmentItemSerializer(serializers.Serializer):
+    """장비 일괄 생성용 개별 장비 시리얼라이저"""
+    item_id = serializers.IntegerField()
+    is_pentamelded = serializers.BooleanField(default=False)
+
+
+class EquipmentBulkCreateListSerializer(serializers.ListSerializer):
+    """여러 장비 세트 일괄 생성 시리얼라이저"""
+    
+    def validate(self, attrs):
+        EquipmentBulkCreateSerializer.resolve_references(attrs)
+        return attrs
+    
+    def create(self, validated_data):
+        return EquipmentBulkCreateSerializer.upsert(validated_data)
+
+
 class EquipmentBulkCreateSerializer(serializers.Serializer):
-    """장비 일괄 생성 시리얼라이저"""
+    """장비 일괄 생성 시리얼라이저 (many=True로 여러 세트 동시 처리)"""
     equipment_set_id = serializers.IntegerField()
-    items = serializers.ListField(
-        child=serializers.DictField(
-            child=serializers.CharField()
-        )
-    )
+    items = EquipmentItemSerializer(many=True)
     
-    def validate_equipment_set_id(self, value):
-        try:
-            EquipmentSet.objects.get(id=value)
-        except EquipmentSet.DoesNotExist:
-            raise serializers.ValidationError("장비 세트를 찾을 수 없습니다.")
-        return value
+    class Meta:
+        list_serializer_class = EquipmentBulkCreateListSerializer
+    
+    def validate(self, attrs):
+        # 목록 시리얼라이저에서는 모든 세트를 한 번에 검증
+        if not isinstance(self.parent, EquipmentBulkCreateListSerializer):
+            self.resolve_references([attrs])
+        return attrs
     
     def create(self, validated_data):
-        equipment_set = EquipmentSet.objects.get(id=validated_data['equipment_set_id'])
-        created_equipments = []
+        return self.upsert([validated_data])
+    
+    @staticmethod
+    def resolve_references(entries):
+        """장비 세트와 아이템 존재 여부를 한 번에 확인하고 세트 객체를 채워 넣음"""
+        set_ids = {entry['equipment_set_id'] for entry in entries}
+        equipment_sets = EquipmentSet.objects.select_related('player__raid_group').in_bulk(set_ids)
+        if len(equipment_sets) != len(set_ids):
+            raise serializers.ValidationError("장비 세트를 찾을 수 없습니다.")
         
-        for item_data in validated_data['items']:
-            item_id = item_data.get('item_id')
-            is_pentamelded = item_data.get('is_pentamelded', False)
-            
-            equipment, created = Equipment.objects.update_or_create(
-                equipment_set=equipment_set,
-                item_id=item_id,
-                defaults={'is_pentamelded': is_pentamelded}
-            )
-            created_equipments.append(equipment)
+        item_ids = {item['item_id'] for entry in entries for item in entry['items']}
+        if Item.objects.filter(id__in=item_ids).count() != len(item_ids):
+            raise serializers.ValidationError("존재하지 않는 아이템이 포함되어 있습니다.")
+        
+        for entry in entries:
+            entry['equipment_set'] = equipment_sets[entry['equipment_set_id']]
+    
+    @staticmethod
+    @transaction.atomic
+    def upsert(entries):
+        """(장비 세트, 아이템) 기준으로 장비를 한 번에 추가/수정"""
+        rows = {}
+        for entry in entries:
+            for item in entry['items']:
+                rows[(entry['equipment_set_id'], item['item_id'])] = item['is_pentamelded']
+        
+        equipments = Equipment.objects.bulk_create(
+            [
+                Equipment(equipment_set_id=set_id, item_id=item_id, is_pentamelded=is_pentamelded)
+                for (set_id, item_id), is_pentamelded in rows.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['equipment_set', 'item'],
+            update_fields=['is_pentamelded'],
+            batch_size=EQUIPMENT_BATCH_SIZE,
+        )
         
-        return created_equipments
\ No newline at end of file
+        equipment_sets = {entry['equipment_set_id']: entry['equipment_set'] for entry in entries}
+        EquipmentSet.objects.filter(id__in=equipment_sets).update(updated_at=timezone.now())
+        EquipmentSet.objects.filter(id__in=equipment_sets).refresh_item_levels()
+        refresh_need_ledgers({equipment_set.player_id for equipment_set in equipment_sets.values()})
+        return equipments
@@ -0,0 +1,110 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.db.models.signals import pre_save, post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .caching import CATALOG_BY_MODEL, bump_version, group_version_name, user_groups_version_name
+from .models import (
+    Raid, RaidGroup, Job, Player, ItemType, Item, Currency, CurrencyRequirement, EquipmentSet,
+    NeedLedger, NeedLedgerItem
+)
+from .needs import refresh_need_ledgers
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=Raid)
+@receiver([post_save, post_delete], sender=Job)
+@receiver([post_save, post_delete], sender=ItemType)
+@receiver([post_save, post_delete], sender=Currency)
+def invalidate_reference_catalog(sender, **kwargs):
+    """참조 데이터가 바뀌면 해당 카탈로그 버전을 올림"""
+    bump_version(CATALOG_BY_MODEL[sender.__name__])
+
+
+@receiver(pre_save, sender=RaidGroup)
+def invalidate_previous_leader(sender, instance, **kwargs):
+    # 공대장이 바뀌면 이전 공대장의 내 공대 목록도 갱신
+    if instance.pk is None:
+        return
+    previous = RaidGroup.objects.filter(pk=instance.pk).values_list('leader_id', flat=True).first()
+    if previous is not None and previous != instance.leader_id:
+        bump_version(user_groups_version_name(previous))
+
+
+@receiver([post_save, post_delete], sender=RaidGroup)
+def invalidate_group(sender, instance, **kwargs):
+    bump_version(group_version_name(instance.pk))
+    bump_version(user_groups_version_name(instance.leader_id))
+
+
+@receiver(pre_save, sender=Player)
+def invalidate_previous_group(sender, instance, **kwargs):
+    # 다른 공대로 옮기면 이전 공대 응답에서도 빠져야 함
+    if instance.pk is None:
+        return
+    previous = Player.objects.filter(pk=instance.pk).values_list('raid_group_id', flat=True).first()
+    if previous is not None and previous != instance.raid_group_id:
+        bump_version(group_version_name(previous))
+
+
+@receiver([post_save, post_delete], sender=Player)
+def invalidate_player(sender, instance, created=False, **kwargs):
+    """공대원 정보는 공대 응답, 내 공대 목록, 장비 세트 응답에 함께 들어감"""
+    bump_version(group_version_name(instance.raid_group_id))
+    bump_version(user_groups_version_name(instance.user_id))
+    if kwargs.get('signal') is post_save and not created:
+        EquipmentSet.objects.filter(player_id=instance.pk).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=User)
+def invalidate_user(sender, instance, created, update_fields=None, **kwargs):
+    # 새 사용자이거나 로그인 시각만 바뀐 경우는 응답에 영향이 없음
+    if created or update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    group_ids = RaidGroup.objects.filter(
+        Q(leader_id=instance.pk) | Q(players__user_id=instance.pk)
+    ).values_list('id', flat=True).distinct()
+    for group_id in group_ids:
+        bump_version(group_version_name(group_id))
+    EquipmentSet.objects.filter(player__user_id=instance.pk).update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=Item)
+@receiver([post_save, post_delete], sender=CurrencyRequirement)
+def invalidate_items(sender, **kwargs):
+    """아이템 정보는 장비 세트와 아이템 목록 응답에 들어감 (bulk 쓰기 경로는 직접 올림)"""
+    bump_version('items')
+
+
+@receiver(m2m_changed, sender=Item.job_restrictions.through)
+def invalidate_item_job_restrictions(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_version('items')
+
+
+@receiver(pre_delete, sender=Item)
+def touch_sets_with_item(sender, instance, **kwargs):
+    # 아이템이 삭제되면 장비 행이 연쇄 삭제되므로 해당 장비 세트의 수정 시각 갱신
+    equipment_sets = EquipmentSet.objects.containing_items([instance.pk])
+    instance._equipment_set_ids = list(equipment_sets.values_list('id', flat=True))
+    equipment_sets.update(updated_at=timezone.now())
+    # 필요 원장 항목도 연쇄 삭제되므로 해당 아이템이 필요했던 공대원 기록
+    instance._ledger_player_ids = list(
+        NeedLedgerItem.objects.filter(item_id=instance.pk).values_list('ledger_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Item)
+def refresh_sets_without_item(sender, instance, **kwargs):
+    # 연쇄 삭제가 끝난 뒤 저장된 아이템레벨/장비 수 갱신
+    equipment_set_ids = getattr(instance, '_equipment_set_ids', None)
+    if equipment_set_ids:
+        EquipmentSet.objects.filter(id__in=equipment_set_ids).refresh_item_levels()
+    # 레이드 삭제 등으로 공대원까지 함께 지워지는 중이면 원장이 먼저 삭제되므로 남은 원장만 갱신
+    ledger_player_ids = getattr(instance, '_ledger_player_ids', None)
+    if ledger_player_ids:
+        refresh_need_ledgers(
+            NeedLedger.objects.filter(player_id__in=ledger_player_ids).values_list('player_id', flat=True)
+        )
@@ -0,0 +1,101 @@
+"""공대 스냅샷 (평평한 행 + 참조 데이터 사이드로드)
+
+공대 상세/장비/분배 화면의 중첩 응답은 같은 아이템, 직업, 레이드를 수십 번 반복한다.
+스냅샷은 공대원/세트/장비/분배를 ID만 가진 평평한 행으로 내보내고, 행에서 참조하는
+아이템/직업/재화 등은 ID를 키로 한 사전에 한 번씩만 넣는다. 모든 행은 values()로 읽어
+모델 인스턴스와 시리얼라이저를 거치지 않는다.
+"""
+from django.contrib.auth import get_user_model
+
+from .caching import REFERENCE_CATALOGS
+from .models import Player, EquipmentSet, Equipment, ItemDistribution, Item, CurrencyRequirement
+
+User = get_user_model()
+
+PLAYER_FIELDS = ['id', 'user_id', 'job_id', 'character_name', 'item_level', 'is_active', 'joined_at']
+EQUIPMENT_SET_FIELDS = ['id', 'player_id', 'set_type', 'item_level', 'equipment_count', 'updated_at']
+EQUIPMENT_FIELDS = ['id', 'equipment_set_id', 'item_id', 'is_pentamelded']
+DISTRIBUTION_FIELDS = ['id', 'player_id', 'item_id', 'distributed_at', 'week_number', 'notes']
+ITEM_FIELDS = ['id', 'name', 'item_type_id', 'item_level', 'raid_id', 'floor', 'is_weapon']
+USER_FIELDS = ['id', 'username', 'character_name', 'server']
+
+# 분배 기록은 계속 쌓이므로 스냅샷에는 최근 기록만 담는다 (뷰는 SnapshotDistributionPagination 사용)
+SNAPSHOT_DISTRIBUTION_LIMIT = 100
+
+
+def side_load(catalog, ids):
+    """참조 데이터 캐시에서 ids에 해당하는 항목만 {id: 데이터}로"""
+    catalog = REFERENCE_CATALOGS[catalog]
+    data = catalog.get()
+    loaded = {pk: catalog.lookup(pk, data) for pk in sorted(ids)}
+    return {pk: data for pk, data in loaded.items() if data is not None}
+
+
+def load_items(item_ids):
+    """아이템 {id: 행} (직업 제한 ID 목록, 재화 요구사항 포함)"""
+    items = {row['id']: {**row, 'job_restrictions': [], 'currency_requirements': []}
+             for row in Item.objects.filter(id__in=item_ids).order_by('id').values(*ITEM_FIELDS)}
+    through = Item.job_restrictions.through
+    for item_id, job_id in through.objects.filter(item_id__in=items).values_list('item_id', 'job_id'):
+        items[item_id]['job_restrictions'].append(job_id)
+    requirements = CurrencyRequirement.objects.filter(item_id__in=items).values_list('item_id', 'currency_id', 'amount')
+    for item_id, currency_id, amount in requirements:
+        items[item_id]['currency_requirements'].append({'currency_id': currency_id, 'amount': amount})
+    return items
+
+
+def distribution_rows(queryset):
+    """스냅샷에 담을 분배 기록 행 (values() 쿼리셋)"""
+    return queryset.values(*DISTRIBUTION_FIELDS)
+
+
+def build_group_snapshot(group, distributions=None):
+    """공대 스냅샷 생성
+
+    distributions: distribution_rows()로 읽은 분배 기록 행 목록 (기본값은 최근 SNAPSHOT_DISTRIBUTION_LIMIT건)
+    """
+    players = list(Player.objects.filter(raid_group=group).order_by('id').values(*PLAYER_FIELDS))
+    player_ids = [player['id'] for player in players]
+    equipment_sets = list(
+        EquipmentSet.objects.filter(player_id__in=player_ids).order_by('id').values(*EQUIPMENT_SET_FIELDS)
+    )
+    equipments = list(Equipment.objects.filter(
+        equipment_set_id__in=[equipment_set['id'] for equipment_set in equipment_sets]
+    ).order_by('id').values(*EQUIPMENT_FIELDS))
+    if distributions is None:
+        distributions = distribution_rows(
+            ItemDistribution.objects.filter(raid_group=group).order_by('-distributed_at', '-id')
+        )[:SNAPSHOT_DISTRIBUTION_LIMIT]
+    distributions = list(distributions)
+
+    items = load_items({row['item_id'] for row in equipments} | {row['item_id'] for row in distributions})
+    user_ids = {player['user_id'] for player in players} | {group.leader_id}
+    users = {row['id']: row for row in User.objects.filter(id__in=user_ids).order_by('id').values(*USER_FIELDS)}
+
+    return {
+        'group': {
+            'id': group.id,
+            'name': group.name,
+            'raid_id': group.raid_id,
+            'leader_id': group.leader_id,
+            'distribution_method': group.distribution_method,
+            'is_active': group.is_active,
+            'player_count': sum(1 for player in players if player['is_active']),
+        },
+        'players': players,
+        'equipment_sets': equipment_sets,
+        'equipments': equipments,
+        'distributions': distributions,
+        'users': users,
+        'items': items,
+        'jobs': side_load('jobs', {player['job_id'] for player in players} | {
+            job_id for item in items.values() for job_id in item['job_restrictions']
+        }),
+        'item_types': side_load('item_types', {item['item_type_id'] for item in items.values()}),
+        'raids': side_load('raids', {group.raid_id} | {
+            item['raid_id'] for item in items.values() if item['raid_id'] is not None
+        }),
+        'currencies': side_load('currencies', {
+            requirement['currency_id'] for item in items.values() for requirement in item['currency_requirements']
+        }),
+    }
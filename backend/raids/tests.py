@@ -1,3 +1,1244 @@
-from django.test import TestCase
+import csv
+import gzip
+import json
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction, OperationalError
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from .caching import REFERENCE_CATALOGS, get_version
+from .catalog import CatalogError, export_records, import_records
+from .compression import brotli
+from .db import retry_on_lock
+from .routers import PIN_COOKIE, ReplicaRouter, ReplicaRoutingMiddleware, replica_reads, use_primary
+from .renderers import ORJSONRenderer
+from .models import (
+    Raid, RaidGroup, Job, Player, ItemType, Item, Currency,
+    EquipmentSet, Equipment, ItemDistribution, CurrencyRequirement, NeedLedger
+)
+
+User = get_user_model()
+
+# 쿼리 수 테스트는 중첩 관계를 모두 펼친 응답 기준
+GROUP_EXPAND = 'raid,leader,players.user,players.job'
+EQUIPMENT_SET_EXPAND = 'player.user,equipments.item.item_type,equipments.item.raid,' \
+    'equipments.item.job_restrictions,equipments.item.currency_requirements.currency'
+
+
+class RaidTestMixin:
+    """테스트용 공대 데이터 생성 헬퍼"""
+
+    def create_group(self, name, player_count=8):
+        leader = User.objects.create(username=f'{name}-leader')
+        group = RaidGroup.objects.create(name=name, raid=self.raid, leader=leader)
+        for i in range(player_count):
+            user = leader if i == 0 else User.objects.create(username=f'{name}-{i}')
+            Player.objects.create(
+                user=user, raid_group=group, job=self.job,
+                character_name=f'{name} {i}', item_level=700,
+                is_active=(i != player_count - 1),
+            )
+        return group
+
+    def setUp(self):
+        cache.clear()
+        self.raid = Raid.objects.create(
+            name='아르카디아', tier='영웅', patch='7.0', min_ilvl=690, max_ilvl=735
+        )
+        self.job = Job.objects.create(name='전사', role='tank')
+        self.user = User.objects.create(username='tester')
+        self.client.force_authenticate(self.user)
+
+    def create_items(self):
+        weapon_type = ItemType.objects.create(name='무기', slot='weapon', order=1)
+        head_type = ItemType.objects.create(name='머리', slot='head', order=2)
+        self.weapon = Item.objects.create(
+            name='대검', item_type=weapon_type, item_level=735, raid=self.raid, is_weapon=True
+        )
+        self.head = Item.objects.create(name='투구', item_type=head_type, item_level=720, raid=self.raid)
+        self.tome = Currency.objects.create(name='석판', raid=self.raid, weekly_limit=450)
+        self.page = Currency.objects.create(name='2층 낱장', raid=self.raid, weekly_limit=1)
+        CurrencyRequirement.objects.create(item=self.weapon, currency=self.tome, amount=500)
+        CurrencyRequirement.objects.create(item=self.weapon, currency=self.page, amount=8)
+        CurrencyRequirement.objects.create(item=self.head, currency=self.tome, amount=495)
+
+    def create_sets(self, player):
+        for set_type in ('start', 'current', 'target'):
+            equipment_set = EquipmentSet.objects.create(player=player, set_type=set_type)
+            Equipment.objects.create(equipment_set=equipment_set, item=self.weapon)
+            Equipment.objects.create(equipment_set=equipment_set, item=self.head)
+
+    def warm_reference_catalogs(self):
+        # 쿼리 수는 참조 데이터 캐시를 채운 상태에서 측정
+        for catalog in REFERENCE_CATALOGS.values():
+            catalog.get()
+
+    def count_queries(self, url):
+        self.warm_reference_catalogs()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+
+class RaidGroupQueryCountTests(RaidTestMixin, APITestCase):
+    """공대 목록/상세 조회 쿼리 수 테스트"""
+
+    def test_list_query_count_is_constant(self):
+        self.create_group('first')
+        small, _ = self.count_queries(f'/api/raids/groups/?expand={GROUP_EXPAND}')
+
+        for i in range(5):
+            self.create_group(f'group{i}')
+        large, response = self.count_queries(f'/api/raids/groups/?expand={GROUP_EXPAND}')
+
+        self.assertEqual(small, large)
+        self.assertEqual(response.data['count'], 6)
+        self.assertEqual(response.data['results'][0]['player_count'], 7)
+
+    def test_detail_query_count_is_constant(self):
+        small_group = self.create_group('small', player_count=2)
+        large_group = self.create_group('large', player_count=8)
+
+        small, _ = self.count_queries(f'/api/raids/groups/{small_group.id}/?expand={GROUP_EXPAND}')
+        large, response = self.count_queries(f'/api/raids/groups/{large_group.id}/?expand={GROUP_EXPAND}')
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.data['players']), 8)
+        self.assertEqual(response.data['player_count'], 7)
+
+    def test_my_groups_query_count_is_constant(self):
+        Player.objects.create(
+            user=self.user, raid_group=self.create_group('mine'),
+            job=self.job, character_name='tester', item_level=700,
+        )
+        small, _ = self.count_queries(f'/api/raids/groups/my_groups/?expand={GROUP_EXPAND}')
+
+        for i in range(3):
+            Player.objects.create(
+                user=self.user, raid_group=self.create_group(f'mine{i}'),
+                job=self.job, character_name='tester', item_level=700,
+            )
+        large, response = self.count_queries(f'/api/raids/groups/my_groups/?expand={GROUP_EXPAND}')
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.data), 4)
+
+
+class SparseFieldsetTests(RaidTestMixin, APITestCase):
+    """?fields=, ?expand= 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_items()
+        self.group = self.create_group('sparse', player_count=3)
+
+    def test_relations_are_ids_by_default(self):
+        response = self.client.get(f'/api/raids/groups/{self.group.id}/')
+        self.assertEqual(response.data['raid'], self.raid.id)
+        self.assertEqual(response.data['leader'], self.group.leader_id)
+        self.assertEqual(
+            response.data['players'], list(self.group.players.order_by('id').values_list('id', flat=True))
+        )
+
+    def test_expand_nested_relation(self):
+        response = self.client.get(f'/api/raids/groups/{self.group.id}/?expand=players.user')
+        player = response.data['players'][0]
+        self.assertEqual(player['user']['username'], 'sparse-leader')
+        self.assertEqual(player['job'], self.job.id)
+
+    def test_fields_skip_unrequested_relations(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/raids/groups/?fields=id,name,player_count')
+        self.assertEqual(set(response.data['results'][0]), {'id', 'name', 'player_count'})
+        self.assertEqual(response.data['results'][0]['player_count'], 2)
+        self.assertFalse(any('FROM "players"' in query['sql'] for query in ctx.captured_queries))
+
+    def test_nested_fields(self):
+        response = self.client.get(
+            '/api/raids/items/?fields=name,currency_requirements.amount,currency_requirements.currency'
+            '&expand=currency_requirements.currency'
+        )
+        weapon = next(item for item in response.data['results'] if item['name'] == '대검')
+        self.assertEqual(set(weapon), {'name', 'currency_requirements'})
+        self.assertEqual(
+            sorted((req['currency']['name'], req['amount']) for req in weapon['currency_requirements']),
+            [('2층 낱장', 8), ('석판', 500)],
+        )
+
+    def test_my_groups_cache_follows_options(self):
+        url = '/api/raids/groups/my_groups/'
+        self.client.force_authenticate(self.group.leader)
+        self.assertEqual(set(self.client.get(f'{url}?fields=id,name').data[0]), {'id', 'name'})
+        self.assertIn('players', self.client.get(url).data[0])
+
+
+class EquipmentSetItemLevelTests(RaidTestMixin, APITestCase):
+    """장비 세트 아이템레벨 계산 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_items()
+
+    def test_annotated_item_level_matches_python_calculation(self):
+        group = self.create_group('gear', player_count=2)
+        first, second = group.players.all()
+        self.create_sets(first)
+        EquipmentSet.objects.create(player=second, set_type='target')
+
+        for equipment_set in EquipmentSet.objects.with_item_level():
+            fresh = EquipmentSet.objects.get(pk=equipment_set.pk)
+            self.assertEqual(equipment_set.calculate_item_level(), fresh.calculate_item_level())
+        # (735 * 2 + 720) / 3 = 730, 빈 세트는 0
+        annotated = EquipmentSet.objects.with_item_level()
+        self.assertEqual(annotated.get(player=first, set_type='target').calculate_item_level(), 730)
+        self.assertEqual(annotated.get(player=second).calculate_item_level(), 0)
+
+    def test_equipment_set_list_query_count_is_constant(self):
+        small_group = self.create_group('small', player_count=1)
+        self.create_sets(small_group.players.get())
+        small, _ = self.count_queries(f'/api/raids/equipment-sets/?expand={EQUIPMENT_SET_EXPAND}')
+
+        large_group = self.create_group('large', player_count=8)
+        for player in large_group.players.all():
+            self.create_sets(player)
+        large, response = self.count_queries(f'/api/raids/equipment-sets/?expand={EQUIPMENT_SET_EXPAND}')
+
+        self.assertEqual(small, large)
+        self.assertEqual(response.data['results'][0]['item_level'], 730)
+
+    def test_stored_item_level_follows_writes(self):
+        player = self.create_group('stored', player_count=1).players.get()
+        self.create_sets(player)
+        target = EquipmentSet.objects.get(player=player, set_type='target')
+        self.assertEqual((target.item_level, target.equipment_count), (730, 2))
+
+        # 아이템레벨 수정 (730 -> (740 * 2 + 720) / 3 = 733)
+        self.weapon.item_level = 740
+        self.weapon.save()
+        target.refresh_from_db()
+        self.assertEqual(target.item_level, 733)
+
+        # 아이템 삭제 시 연쇄 삭제된 장비 반영
+        self.weapon.delete()
+        target.refresh_from_db()
+        self.assertEqual((target.item_level, target.equipment_count), (720, 1))
+
+    def test_backfill_command(self):
+        player = self.create_group('backfill', player_count=1).players.get()
+        self.create_sets(player)
+        EquipmentSet.objects.update(item_level=0, equipment_count=0)
+
+        with self.assertRaises(CommandError):
+            call_command('backfill_item_levels', '--check', stdout=StringIO())
+        call_command('backfill_item_levels', '--batch-size', '2', stdout=StringIO())
+        call_command('backfill_item_levels', '--check', stdout=StringIO())
+        self.assertEqual(set(EquipmentSet.objects.values_list('item_level', flat=True)), {730})
+
+    def test_filter_and_order_by_item_level(self):
+        group = self.create_group('order', player_count=2)
+        first, second = group.players.order_by('id')
+        self.create_sets(first)
+        target = EquipmentSet.objects.create(player=second, set_type='target')
+        Equipment.objects.create(equipment_set=target, item=self.head)
+
+        response = self.client.get(
+            f'/api/raids/equipment-sets/?raid_group={group.id}&set_type=target&ordering=item_level'
+        )
+        self.assertEqual([row['item_level'] for row in response.data['results']], [720, 730])
+        response = self.client.get(f'/api/raids/equipment-sets/?set_type=target&min_item_level=725')
+        self.assertEqual([row['player'] for row in response.data['results']], [first.id])
+
+
+class CurrencyNeedsTests(RaidTestMixin, APITestCase):
+    """재화 필요량 계산 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_items()
+        self.group = self.create_group('needs', player_count=3)
+        self.first, self.second, self.third = self.group.players.order_by('id')
+        # 첫 번째: 무기/투구 모두 필요, 두 번째: 투구만 보유, 세 번째: 목표 세트 없음
+        for player, current_items in ((self.first, []), (self.second, [self.head])):
+            target = EquipmentSet.objects.create(player=player, set_type='target')
+            Equipment.objects.create(equipment_set=target, item=self.weapon)
+            Equipment.objects.create(equipment_set=target, item=self.head)
+            current = EquipmentSet.objects.create(player=player, set_type='current')
+            for item in current_items:
+                Equipment.objects.create(equipment_set=current, item=item)
+
+    def test_single_player(self):
+        response = self.client.get('/api/raids/calculate-currency-needs/', {'player_id': self.first.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['player']['id'], self.first.id)
+        self.assertEqual(response.data['currency_needs'], {'석판': 995, '2층 낱장': 8})
+        self.assertEqual(response.data['needed_items_count'], 2)
+
+    def test_single_player_without_target_set(self):
+        response = self.client.get('/api/raids/calculate-currency-needs/', {'player_id': self.third.id})
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch(self):
+        ids = f'{self.second.id},{self.first.id},{self.third.id}'
+        response = self.client.get('/api/raids/calculate-currency-needs/', {'player_ids': ids})
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual([r['player']['id'] for r in results], [self.second.id, self.first.id, self.third.id])
+        self.assertEqual(results[0]['currency_needs'], {'석판': 500, '2층 낱장': 8})
+        self.assertEqual(results[0]['needed_items_count'], 1)
+        self.assertEqual(results[1]['needed_items_count'], 2)
+        self.assertIn('error', results[2])
+
+
+class DistributionPriorityTests(RaidTestMixin, APITestCase):
+    """분배 우선순위 계산 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_items()
+
+    def calculate(self, group):
+        self.warm_reference_catalogs()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                '/api/raids/calculate-distribution-priority/', {'raid_group_id': group.id}
+            )
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_query_count_is_constant(self):
+        small_group = self.create_group('small', player_count=2)
+        for player in small_group.players.all():
+            self.create_sets(player)
+        small, _ = self.calculate(small_group)
+
+        large_group = self.create_group('large', player_count=8)
+        for player in large_group.players.all():
+            self.create_sets(player)
+        large, _ = self.calculate(large_group)
+
+        self.assertEqual(small, large)
+
+    def test_priority_order(self):
+        group = self.create_group('order', player_count=3)
+        first, second, inactive = group.players.order_by('id')
+        self.create_sets(first)
+        target = EquipmentSet.objects.create(player=second, set_type='target')
+        Equipment.objects.create(equipment_set=target, item=self.weapon)
+        self.create_sets(inactive)
+
+        _, response = self.calculate(group)
+        priority = response.data['priority_list']
+        self.assertEqual([entry['player']['id'] for entry in priority], [second.id, first.id])
+        self.assertEqual(priority[0]['total_currency_needed'], 508)
+        self.assertEqual(priority[0]['items_needed'], 1)
+        self.assertEqual(priority[1]['total_currency_needed'], 0)
+        self.assertEqual(response.data['raid_group']['player_count'], 2)
+
+
+class NeedLedgerTests(RaidTestMixin, APITestCase):
+    """필요 원장 갱신 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_items()
+        self.group = self.create_group('ledger', player_count=2)
+        self.player = self.group.players.order_by('id').first()
+        self.target = EquipmentSet.objects.create(player=self.player, set_type='target')
+        self.current = EquipmentSet.objects.create(player=self.player, set_type='current')
+        Equipment.objects.create(equipment_set=self.target, item=self.weapon)
+        Equipment.objects.create(equipment_set=self.target, item=self.head)
+
+    def needs(self):
+        response = self.client.get('/api/raids/calculate-currency-needs/', {'player_id': self.player.id})
+        return response.data['currency_needs'], response.data['needed_items_count']
+
+    def test_ledger_follows_equipment_updates(self):
+        self.assertEqual(self.needs(), ({'석판': 995, '2층 낱장': 8}, 2))
+
+        self.client.force_authenticate(self.player.user)
+        self.client.post(
+            f'/api/raids/equipment-sets/{self.current.id}/bulk_update_equipments/',
+            {'items': [{'item_id': self.head.id}]}, format='json'
+        )
+        self.assertEqual(self.needs(), ({'석판': 500, '2층 낱장': 8}, 1))
+
+    def test_distributed_items_are_not_needed(self):
+        self.assertEqual(self.needs()[1], 2)
+        response = self.client.post('/api/raids/distributions/', {
+            'raid_group': self.group.id, 'player_id': self.player.id, 'item_id': self.weapon.id,
+            'distributed_at': '2026-01-06T21:00:00+09:00', 'week_number': 1,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.needs(), ({'석판': 495}, 1))
+
+    def test_rebuild_command_detects_drift(self):
+        call_command('rebuild_need_ledger', stdout=StringIO())
+        call_command('rebuild_need_ledger', '--check', stdout=StringIO())
+
+        # 쓰기 경로를 거치지 않은 변경은 --check에서 검출
+        Equipment.objects.create(equipment_set=self.current, item=self.weapon)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_need_ledger', '--check', stdout=StringIO())
+
+        call_command('rebuild_need_ledger', stdout=StringIO())
+        call_command('rebuild_need_ledger', '--check', stdout=StringIO())
+        self.assertEqual(self.needs(), ({'석판': 495}, 1))
+
+    def test_reads_do_not_write_ledgers(self):
+        self.assertEqual(self.needs(), ({'석판': 995, '2층 낱장': 8}, 2))
+        self.assertFalse(NeedLedger.objects.exists())
+
+    def test_item_delete_refreshes_ledgers(self):
+        call_command('rebuild_need_ledger', stdout=StringIO())
+        self.client.force_authenticate(self.group.leader)
+        response = self.client.delete(f'/api/raids/items/{self.weapon.id}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(NeedLedger.objects.get(player=self.player).needed_items_count, 1)
+        call_command('rebuild_need_ledger', '--check', stdout=StringIO())
+
+        # 레이드 삭제로 공대원과 아이템이 함께 지워져도 원장이 다시 생기지 않음
+        self.raid.delete()
+        self.assertFalse(NeedLedger.objects.exists())
+
+
+class BulkUpdateEquipmentsTests(RaidTestMixin, APITestCase):
+    """장비 일괄 업데이트 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_items()
+        group = self.create_group('bulk', player_count=1)
+        self.player = group.players.get()
+        self.client.force_authenticate(self.player.user)
+        self.equipment_set = EquipmentSet.objects.create(player=self.player, set_type='current')
+        self.kept = Equipment.objects.create(equipment_set=self.equipment_set, item=self.head)
+        Equipment.objects.create(equipment_set=self.equipment_set, item=self.weapon)
+
+    def bulk_update(self, items):
+        return self.client.post(
+            f'/api/raids/equipment-sets/{self.equipment_set.id}/bulk_update_equipments/',
+            {'items': items}, format='json'
+        )
+
+    def test_applies_only_differences(self):
+        response = self.bulk_update([{'item_id': self.head.id, 'is_pentamelded': True}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['item_level'], 720)
+
+        equipments = list(self.equipment_set.equipments.all())
+        self.assertEqual(len(equipments), 1)
+        # 유지된 장비는 다시 생성되지 않고 금단 여부만 변경
+        self.assertEqual(equipments[0].id, self.kept.id)
+        self.assertTrue(equipments[0].is_pentamelded)
+
+    def test_rejects_other_players_set(self):
+        self.client.force_authenticate(self.user)
+        response = self.bulk_update([])
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.equipment_set.equipments.count(), 2)
+
+    def test_rejects_unknown_items(self):
+        response = self.bulk_update([{'item_id': 0}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.equipment_set.equipments.count(), 2)
+
+    def test_rejects_malformed_body(self):
+        url = f'/api/raids/equipment-sets/{self.equipment_set.id}/bulk_update_equipments/'
+        for body in ([{'item_id': self.head.id}], {'items': {'item_id': self.head.id}}, {'items': [self.head.id]}):
+            response = self.client.post(url, body, format='json')
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.equipment_set.equipments.count(), 2)
+
+
+class EquipmentBulkImportTests(RaidTestMixin, APITestCase):
+    """장비 일괄 등록 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_items()
+        self.group = self.create_group('import', player_count=2)
+        self.first, self.second = self.group.players.order_by('id')
+        self.first_set = EquipmentSet.objects.create(player=self.first, set_type='target')
+        self.second_set = EquipmentSet.objects.create(player=self.second, set_type='target')
+        Equipment.objects.create(equipment_set=self.first_set, item=self.head)
+
+    def bulk_import(self):
+        return self.client.post('/api/raids/equipment-sets/bulk_import/', {'sets': [
+            {'equipment_set_id': self.first_set.id, 'items': [
+                {'item_id': self.head.id, 'is_pentamelded': True},
+                {'item_id': self.weapon.id},
+            ]},
+            {'equipment_set_id': self.second_set.id, 'items': [{'item_id': self.weapon.id}]},
+        ]}, format='json')
+
+    def test_leader_imports_roster(self):
+        self.client.force_authenticate(self.group.leader)
+        response = self.bulk_import()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['equipment_count'], 3)
+
+        self.assertTrue(self.first_set.equipments.get(item=self.head).is_pentamelded)
+        self.assertEqual(self.first_set.equipments.count(), 2)
+        self.assertEqual(self.second_set.equipments.count(), 1)
+
+    def test_member_cannot_import_other_sets(self):
+        self.client.force_authenticate(self.second.user)
+        response = self.bulk_import()
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Equipment.objects.count(), 1)
+
+    def test_unknown_equipment_set(self):
+        self.client.force_authenticate(self.group.leader)
+        response = self.client.post('/api/raids/equipment-sets/bulk_import/', {
+            'equipment_set_id': 0, 'items': [{'item_id': self.head.id}],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class ItemBulkWriteTests(RaidTestMixin, APITestCase):
+    """아이템 일괄 등록/수정 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_items()
+
+    def test_bulk_create_and_patch(self):
+        payload = [
+            {
+                'name': f'반지 {i}', 'item_type_id': self.head.item_type_id, 'item_level': 730,
+                'raid_id': self.raid.id, 'floor': 1, 'job_restrictions_ids': [self.job.id],
+                'currency_requirements': [{'currency_id': self.page.id, 'amount': 3}],
+            }
+            for i in range(3)
+        ]
+        response = self.client.post('/api/raids/items/bulk/?expand=currency_requirements', payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual(response.data[0]['job_restrictions'], [self.job.id])
+        self.assertEqual(response.data[0]['currency_requirements'][0]['amount'], 3)
+
+        item_id = response.data[0]['id']
+        response = self.client.patch('/api/raids/items/bulk/', [{
+            'id': item_id, 'item_level': 740,
+            'currency_requirements': [{'currency_id': self.tome.id, 'amount': 375}],
+        }], format='json')
+        self.assertEqual(response.status_code, 200)
+        item = Item.objects.get(id=item_id)
+        self.assertEqual(item.item_level, 740)
+        self.assertEqual(
+            list(item.currency_requirements.values_list('currency_id', 'amount')), [(self.tome.id, 375)]
+        )
+
+    def test_bulk_rejects_unknown_references(self):
+        response = self.client.post('/api/raids/items/bulk/', [{
+            'name': '반지', 'item_type_id': 0, 'item_level': 730,
+        }], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Item.objects.count(), 2)
+
+    def test_update_keeps_unchanged_requirements(self):
+        kept = self.weapon.currency_requirements.get(currency=self.tome)
+        response = self.client.patch(f'/api/raids/items/{self.weapon.id}/', {
+            'currency_requirements': [
+                {'currency_id': self.tome.id, 'amount': 500},
+                {'currency_id': self.page.id, 'amount': 6},
+            ],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.weapon.currency_requirements.get(currency=self.tome).id, kept.id)
+        self.assertEqual(self.weapon.currency_requirements.get(currency=self.page).amount, 6)
+
+
+class ItemDistributionBulkTests(RaidTestMixin, APITestCase):
+    """아이템 일괄 분배 기록 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_items()
+        self.group = self.create_group('loot', player_count=3)
+        self.first, self.second, self.inactive = self.group.players.order_by('id')
+
+    def distribute(self, player):
+        return self.client.post('/api/raids/distributions/bulk/', {
+            'raid_group_id': self.group.id,
+            'week_number': 2,
+            'distributions': [
+                {'player_id': self.first.id, 'item_id': self.weapon.id},
+                {'player_id': player.id, 'item_id': self.head.id, 'notes': '주사위'},
+            ],
+        }, format='json')
+
+    def test_records_whole_night(self):
+        response = self.distribute(self.second)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['distributions']), 2)
+        self.assertEqual(
+            set(ItemDistribution.objects.values_list('player_id', 'item_id', 'week_number')),
+            {(self.first.id, self.weapon.id, 2), (self.second.id, self.head.id, 2)},
+        )
+
+    def test_rejects_inactive_players(self):
+        response = self.distribute(self.inactive)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ItemDistribution.objects.exists())
+
+
+class DistributionHistoryPaginationTests(RaidTestMixin, APITestCase):
+    """분배 기록 커서 페이지네이션 및 기간 필터 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_items()
+        self.group = self.create_group('history', player_count=2)
+        player = self.group.players.first()
+        start = timezone.make_aware(datetime(2024, 1, 1, 21))
+        # 같은 시각의 기록도 id로 순서가 정해지도록 두 개씩 생성
+        ItemDistribution.objects.bulk_create([
+            ItemDistribution(
+                raid_group=self.group, player=player, item=self.weapon,
+                distributed_at=start + timedelta(weeks=week), week_number=week + 1,
+            )
+            for week in range(10) for _ in range(2)
+        ])
+
+    def fetch_all(self, url):
+        ids, pages = [], 0
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(any('COUNT(' in query['sql'] for query in ctx.captured_queries))
+            ids += [row['id'] for row in response.data['results']]
+            url, pages = response.data['next'], pages + 1
+        return ids, pages
+
+    def test_cursor_walks_history_newest_first(self):
+        ids, pages = self.fetch_all(f'/api/raids/distributions/?raid_group={self.group.id}&page_size=3')
+        expected = list(ItemDistribution.objects.order_by('-distributed_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 7)
+
+    def test_date_range_filter(self):
+        ids, _ = self.fetch_all(
+            f'/api/raids/distributions/?raid_group={self.group.id}'
+            '&distributed_after=2024-01-08&distributed_before=2024-01-22'
+        )
+        weeks = set(ItemDistribution.objects.filter(id__in=ids).values_list('week_number', flat=True))
+        self.assertEqual(weeks, {2, 3})
+
+    def test_rejects_invalid_date(self):
+        response = self.client.get('/api/raids/distributions/?distributed_after=2024-13-01')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('distributed_after', response.data)
+
+        response = self.client.get('/api/raids/distributions/?week_number=abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('week_number', response.data)
+
+    def test_players_cursor_is_opt_in(self):
+        response = self.client.get(f'/api/raids/players/?raid_group={self.group.id}&active_only=false')
+        self.assertEqual(response.data['count'], self.group.players.count())
+
+        response = self.client.get(
+            f'/api/raids/players/?raid_group={self.group.id}&active_only=false&page_size=1&cursor='
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('count', response.data)
+        second = self.client.get(response.data['next'])
+        self.assertEqual(
+            [response.data['results'][0]['id'], second.data['results'][0]['id']],
+            list(self.group.players.order_by('id').values_list('id', flat=True)),
+        )
+
+
+class GroupHistoryExportTests(RaidTestMixin, APITestCase):
+    """공대 기록 스트리밍 내보내기 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_items()
+        self.group = self.create_group('export', player_count=2)
+        self.player = self.group.players.order_by('id').first()
+        self.create_sets(self.player)
+        ItemDistribution.objects.create(
+            raid_group=self.group, player=self.player, item=self.head,
+            distributed_at=timezone.now(), week_number=1, notes='주사위, 1등',
+        )
+
+    def read_stream(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson_streams_all_sections(self):
+        response = self.client.get(f'/api/raids/groups/{self.group.id}/export/')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        rows = [json.loads(line) for line in self.read_stream(response).splitlines()]
+        counts = {}
+        for row in rows:
+            counts[row['section']] = counts.get(row['section'], 0) + 1
+        self.assertEqual(counts, {'distributions': 1, 'equipment_sets': 3, 'equipments': 6})
+        self.assertEqual(rows[0]['item__name'], '투구')
+
+    def test_csv_single_section(self):
+        response = self.client.get(
+            f'/api/raids/groups/{self.group.id}/export/?type=csv&sections=distributions'
+        )
+        rows = list(csv.reader(StringIO(self.read_stream(response))))
+        self.assertEqual(rows[0][:3], ['id', 'distributed_at', 'week_number'])
+        self.assertEqual(rows[1][-1], '주사위, 1등')
+        self.assertEqual(len(rows), 2)
+
+    def test_rejects_unknown_section(self):
+        response = self.client.get(f'/api/raids/groups/{self.group.id}/export/?sections=loot')
+        self.assertEqual(response.status_code, 400)
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command('export_group_history', self.group.id, '--sections', 'equipments', stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(rows), 6)
+        self.assertEqual({row['equipment_set__player_id'] for row in rows}, {self.player.id})
+
+
+class GroupSnapshotTests(RaidTestMixin, APITestCase):
+    """공대 스냅샷 (사이드로드) 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_items()
+        self.group = self.create_group('snapshot', player_count=4)
+        for player in self.group.players.all():
+            self.create_sets(player)
+            ItemDistribution.objects.create(
+                raid_group=self.group, player=player, item=self.head,
+                distributed_at=timezone.now(), week_number=1,
+            )
+        self.url = f'/api/raids/groups/{self.group.id}/snapshot/'
+
+    def test_rows_are_flat_and_references_side_loaded_once(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        self.assertEqual(data['group']['player_count'], 3)
+        self.assertEqual(len(data['players']), 4)
+        self.assertEqual(len(data['equipment_sets']), 12)
+        self.assertEqual(len(data['equipments']), 24)
+        self.assertEqual(len(data['distributions']), 4)
+        self.assertEqual(set(data['equipments'][0]), {'id', 'equipment_set_id', 'item_id', 'is_pentamelded'})
+
+        self.assertEqual(sorted(data['items']), [self.weapon.id, self.head.id])
+        self.assertEqual(
+            sorted(req['amount'] for req in data['items'][self.weapon.id]['currency_requirements']), [8, 500]
+        )
+        self.assertEqual(list(data['jobs']), [self.job.id])
+        self.assertEqual(list(data['raids']), [self.raid.id])
+        self.assertEqual(sorted(data['currencies']), [self.tome.id, self.page.id])
+        self.assertEqual(len(data['item_types']), 2)
+
+    def test_query_count_is_constant(self):
+        self.warm_reference_catalogs()
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url)
+        for player in self.create_group('more', player_count=8).players.all():
+            player.raid_group = self.group
+            player.save()
+            self.create_sets(player)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data['players']), 12)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_distributions_bounded_and_continue_in_history(self):
+        player = self.group.players.order_by('id').first()
+        ItemDistribution.objects.bulk_create([
+            ItemDistribution(
+                raid_group=self.group, player=player, item=self.weapon,
+                distributed_at=timezone.now() - timedelta(weeks=week), week_number=week,
+            )
+            for week in range(2, 8)
+        ])
+        response = self.client.get(f'{self.url}?page_size=3')
+        self.assertEqual(len(response.data['distributions']), 3)
+
+        # 이전 기록은 분배 기록 목록 API에서 이어서 읽음
+        ids = [row['id'] for row in response.data['distributions']]
+        next_url = response.data['distributions_next']
+        self.assertIn('/api/raids/distributions/', next_url)
+        while next_url:
+            page = self.client.get(next_url).data
+            ids.extend(row['id'] for row in page['results'])
+            next_url = page['next']
+        self.assertEqual(
+            ids, list(self.group.distributions.order_by('-distributed_at', '-id').values_list('id', flat=True))
+        )
+
+    def test_distribution_filters(self):
+        response = self.client.get(f'{self.url}?week_number=2')
+        self.assertEqual(response.data['distributions'], [])
+        self.assertEqual(sorted(response.data['items']), [self.weapon.id, self.head.id])
+
+
+class CatalogTests(RaidTestMixin, APITestCase):
+    """카탈로그 가져오기/내보내기 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_items()
+
+    def test_round_trip(self):
+        self.weapon.job_restrictions.add(self.job)
+        records = list(export_records())
+        Item.objects.all().delete()
+
+        stats, warnings = import_records(records)
+        self.assertEqual(stats['item'], (2, 0))
+        self.assertEqual(warnings, [])
+        self.assertEqual(list(export_records()), records)
+
+        # 다시 가져오면 변경 사항 없음
+        stats, _ = import_records(records)
+        self.assertEqual(stats, {'raid': (0, 0), 'currency': (0, 0), 'item': (0, 0)})
+
+    def test_missing_reference(self):
+        record = {
+            'type': 'item', 'name': '반지', 'raid': [self.raid.name, self.raid.tier],
+            'item_type': '없는 종류', 'item_level': 730,
+        }
+        with self.assertRaises(CatalogError):
+            import_records([record])
+        _, warnings = import_records([record], strict=False)
+        self.assertEqual(len(warnings), 1)
+        self.assertFalse(Item.objects.filter(name='반지').exists())
+
+    def test_invalid_records_rejected_before_writes(self):
+        raid = {'type': 'raid', 'name': '새 레이드', 'tier': '일반', 'patch': '7.1', 'min_ilvl': 700, 'max_ilvl': 740}
+        item = {'type': 'item', 'name': '반지', 'raid': ['새 레이드', '일반'], 'item_type': '무기', 'item_level': 730}
+        invalid = [
+            [raid, {'type': 'item', 'name': '반지', 'item_type': '무기'}],
+            [raid, {**item, 'currency_requirements': ['석판']}],
+            [raid, item, {**item, 'item_level': 735}],
+            [raid, {**raid, 'patch': '7.2'}],
+        ]
+        for records in invalid:
+            with self.assertRaises(CatalogError):
+                import_records(records, strict=False)
+        self.assertFalse(Raid.objects.filter(name='새 레이드').exists())
+
+
+class InitReferenceDataTests(APITestCase):
+    """기본 데이터 초기화 명령 테스트"""
+
+    def setUp(self):
+        cache.clear()
+
+    def init(self, *args):
+        call_command('init_ff14_data', *args, stdout=StringIO())
+
+    def test_second_run_writes_nothing(self):
+        self.init()
+        with CaptureQueriesContext(connection) as queries:
+            self.init()
+        self.assertTrue(all(query['sql'].startswith('SELECT') for query in queries.captured_queries))
+
+    def test_check_detects_stale_data(self):
+        with self.assertRaises(CommandError):
+            self.init('--check')
+        self.init()
+        self.init('--check')
+
+        Job.objects.filter(name='나이트').update(role='melee')
+        with self.assertRaises(CommandError):
+            self.init('--check')
+
+    def test_dump_and_load_round_trip(self):
+        self.init()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'reference.json')
+            self.init('--dump', path)
+            Job.objects.filter(name='나이트').update(role='melee', icon='')
+            ItemType.objects.filter(name='반지').delete()
+
+            self.init('--load', path)
+        self.assertEqual(Job.objects.get(name='나이트').role, 'tank')
+        self.assertTrue(ItemType.objects.filter(name='반지', slot='ring').exists())
+        self.init('--check')
+
+    def test_load_rejects_other_version(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'reference.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 0, 'jobs': [], 'item_types': []}, f)
+            with self.assertRaises(CommandError):
+                self.init('--load', path)
+        self.assertFalse(Job.objects.exists())
+
+
+class ReferenceCatalogTests(RaidTestMixin, APITestCase):
+    """참조 데이터 캐시 테스트"""
+
+    def test_warm_list_uses_no_queries(self):
+        self.client.get('/api/raids/jobs/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/raids/jobs/')
+        self.assertEqual([job['name'] for job in response.data], ['전사'])
+
+    def test_save_and_delete_invalidate(self):
+        self.client.get('/api/raids/jobs/')
+        paladin = Job.objects.create(name='나이트', role='tank')
+        self.assertIn(paladin.id, REFERENCE_CATALOGS['jobs'].get())
+
+        self.job.role = 'melee'
+        self.job.save()
+        self.assertEqual(REFERENCE_CATALOGS['jobs'].lookup(self.job.id)['role'], 'melee')
+
+        paladin.delete()
+        self.assertNotIn(paladin.id, REFERENCE_CATALOGS['jobs'].get())
+
+    def test_nested_serializers_resolve_from_cache(self):
+        group = self.create_group('cached', player_count=2)
+        response = self.client.get(f'/api/raids/groups/{group.id}/?expand=raid,players.job')
+        self.assertEqual(response.data['raid']['name'], self.raid.name)
+        self.assertEqual(response.data['players'][0]['job']['name'], self.job.name)
+
+    def test_version_read_once_per_response(self):
+        group = self.create_group('versions', player_count=8)
+        self.warm_reference_catalogs()
+        with mock.patch('raids.caching.get_version', wraps=get_version) as versions:
+            response = self.client.get(f'/api/raids/groups/{group.id}/?expand=raid,players.job')
+        self.assertEqual(len(response.data['players']), 8)
+        looked_up = [call.args[0] for call in versions.call_args_list]
+        self.assertEqual(looked_up.count('jobs'), 1)
+        self.assertEqual(looked_up.count('raids'), 1)
+
+    def test_bulk_import_invalidates(self):
+        REFERENCE_CATALOGS['raids'].get()
+        import_records([{
+            'type': 'raid', 'name': '새 레이드', 'tier': '일반', 'patch': '7.1', 'min_ilvl': 700, 'max_ilvl': 740,
+        }])
+        names = [raid['name'] for raid in REFERENCE_CATALOGS['raids'].list()]
+        self.assertIn('새 레이드', names)
+
+
+class ConditionalGetTests(RaidTestMixin, APITestCase):
+    """ETag/Last-Modified 조건부 GET 테스트"""
+
+    def setUp(self):
+        super().setUp()
+        self.create_items()
+        self.group = self.create_group('poll', player_count=2)
+        self.player = self.group.players.order_by('id').first()
+        self.create_sets(self.player)
+        self.warm_reference_catalogs()
+
+    def revalidate(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_group_detail_not_modified_without_queries(self):
+        url = f'/api/raids/groups/{self.group.id}/'
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.player.character_name = '새 이름'
+        self.player.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_player_move_invalidates_both_groups(self):
+        other = self.create_group('other', player_count=1)
+        url = f'/api/raids/groups/{self.group.id}/'
+        etag = self.client.get(url)['ETag']
+
+        self.player.raid_group = other
+        self.player.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_group_list(self):
+        self.assertEqual(self.revalidate('/api/raids/groups/').status_code, 304)
+
+    def test_equipment_sets_by_player(self):
+        url = f'/api/raids/equipment-sets/?player={self.player.id}'
+        response = self.client.get(url)
+        self.assertIn('Last-Modified', response)
+        etag = response['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        current = self.player.equipment_sets.get(set_type='current')
+        self.client.force_authenticate(self.player.user)
+        self.client.post(
+            f'/api/raids/equipment-sets/{current.id}/bulk_update_equipments/',
+            {'items': [{'item_id': self.head.id}]}, format='json'
+        )
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_direct_equipment_edit_invalidates_set(self):
+        current = self.player.equipment_sets.get(set_type='current')
+        url = f'/api/raids/equipment-sets/{current.id}/'
+        etag = self.client.get(url)['ETag']
+
+        # 아이템레벨/장비 수가 그대로인 변경(금단 여부)도 검증자에 반영
+        equipment = current.equipments.get(item=self.head)
+        equipment.is_pentamelded = True
+        equipment.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        equipment.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_catalog_endpoints(self):
+        self.assertEqual(self.revalidate('/api/raids/jobs/').status_code, 304)
+        self.assertEqual(self.revalidate('/api/raids/items/').status_code, 304)
+
+        etag = self.client.get('/api/raids/items/')['ETag']
+        self.head.item_level = 725
+        self.head.save()
+        self.assertEqual(self.client.get('/api/raids/items/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class MyGroupsCacheTests(RaidTestMixin, APITestCase):
+    """내 공대 목록 캐시 테스트"""
+
+    url = '/api/raids/groups/my_groups/'
+
+    def setUp(self):
+        super().setUp()
+        self.group = self.create_group('mine', player_count=3)
+        self.member = self.group.players.order_by('id')[1]
+        self.client.force_authenticate(self.member.user)
+
+    def test_warm_path_uses_no_queries(self):
+        self.warm_reference_catalogs()
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual([group['id'] for group in response.data], [self.group.id])
+
+    def test_membership_change_invalidates(self):
+        self.client.get(self.url)
+        other = self.create_group('other', player_count=1)
+        Player.objects.create(
+            user=self.member.user, raid_group=other, job=self.job,
+            character_name='부캐', item_level=700,
+        )
+        response = self.client.get(self.url)
+        self.assertEqual([group['id'] for group in response.data], [self.group.id, other.id])
+
+        self.member.is_active = False
+        self.member.save()
+        response = self.client.get(self.url)
+        self.assertEqual([group['id'] for group in response.data], [other.id])
+
+    def test_group_change_refreshes_payload(self):
+        url = f'{self.url}?expand=players'
+        self.client.get(url)
+        self.group.name = '새 이름'
+        self.group.save()
+        self.assertEqual(self.client.get(url).data[0]['name'], '새 이름')
+
+        # 다른 공대원 정보가 바뀌어도 갱신
+        leader_player = self.group.players.order_by('id').first()
+        leader_player.character_name = '새 캐릭터'
+        leader_player.save()
+        players = self.client.get(url).data[0]['players']
+        self.assertIn('새 캐릭터', [player['character_name'] for player in players])
+
+
+class QueryPlanAuditTests(RaidTestMixin, APITestCase):
+    """실행 계획 점검 명령 테스트"""
+
+    # PostgreSQL은 행이 적은 테이블에서 인덱스가 있어도 순차 스캔을 선택함
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite 실행 계획 기준')
+    def test_hot_queries_use_indexes(self):
+        self.create_items()
+        group = self.create_group('audit', player_count=2)
+        for player in group.players.all():
+            self.create_sets(player)
+
+        out = StringIO()
+        call_command('audit_query_plans', '--fail-on-scan', stdout=out)
+        self.assertIn('전체 테이블 스캔 0건', out.getvalue())
+
+
+@override_settings(DB_LOCK_RETRIES=3, DB_LOCK_BACKOFF=(0, 0))
+class RetryOnLockTests(TransactionTestCase):
+    """잠금 충돌 재시도 테스트 (바깥 트랜잭션 여부를 확인하므로 TestCase 트랜잭션 밖에서 실행)"""
+
+    def flaky(self, failures, message='database is locked'):
+        calls = []
+
+        @retry_on_lock
+        def write():
+            calls.append(1)
+            if len(calls) <= failures:
+                raise OperationalError(message)
+            return len(calls)
+        return write, calls
+
+    def test_retries_lock_errors(self):
+        write, _ = self.flaky(2)
+        self.assertEqual(write(), 3)
+
+    def test_gives_up_after_limit(self):
+        write, calls = self.flaky(10)
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 4)
+
+    def test_other_errors_and_outer_transactions_are_not_retried(self):
+        write, calls = self.flaky(1, message='no such table')
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 1)
+
+        write, calls = self.flaky(1)
+        with transaction.atomic(), self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 1)
+
+
+@override_settings(REPLICA_DATABASE='replica', REPLICA_PIN_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    """요청별 복제본 라우팅 (라우터 결정만 확인하므로 DB 접근 없음)"""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def run_request(self, request, view=None, body=None):
+        """미들웨어를 거쳐 요청을 처리하고 (응답, 뷰 안에서의 읽기 DB 목록) 반환
+
+        view는 process_view에 전달되는 뷰 (replica_reads 표시 확인용)
+        """
+        reads = []
+
+        def view_func(request):
+            reads.append(self.router.db_for_read(Player))
+            if body:
+                body()
+                reads.append(self.router.db_for_read(Player))
+            return HttpResponse()
+
+        view = view or view_func
+        middleware = ReplicaRoutingMiddleware(lambda request: middleware.process_view(
+            request, view, (), {}
+        ) or view_func(request))
+        return middleware(request), reads
+
+    def test_safe_request_reads_from_replica(self):
+        response, reads = self.run_request(self.factory.get('/api/players/'))
+        self.assertEqual(reads, ['replica'])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_unsafe_request_reads_from_primary(self):
+        _, reads = self.run_request(self.factory.post('/api/players/'))
+        self.assertEqual(reads, [None])
+
+    def test_read_only_view_marked_for_replica(self):
+        view = replica_reads(lambda request: HttpResponse())
+        _, reads = self.run_request(self.factory.post('/api/calculate-priority/'), view=view)
+        self.assertEqual(reads, ['replica'])
+
+    def test_write_pins_request_and_sets_cookie(self):
+        write = lambda: self.assertEqual(self.router.db_for_write(Player), 'default')
+        response, reads = self.run_request(self.factory.get('/api/calculate-needs/'), body=write)
+        self.assertEqual(reads, ['replica', None])
+        self.assertEqual(response.cookies[PIN_COOKIE]['max-age'], 5)
+
+    def test_pin_cookie_reads_from_primary(self):
+        request = self.factory.get('/api/players/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        _, reads = self.run_request(request)
+        self.assertEqual(reads, [None])
+
+    def test_use_primary_block(self):
+        def body():
+            with use_primary():
+                self.assertIsNone(self.router.db_for_read(Player))
+        _, reads = self.run_request(self.factory.get('/api/players/'), body=body)
+        self.assertEqual(reads, ['replica', 'replica'])
+
+    def test_disabled_without_replica(self):
+        with override_settings(REPLICA_DATABASE=None):
+            write = lambda: self.router.db_for_write(Player)
+            response, reads = self.run_request(self.factory.get('/api/players/'), body=write)
+        self.assertEqual(reads, [None, None])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_outside_request_reads_from_primary(self):
+        self.assertIsNone(self.router.db_for_read(Player))
+
+
+class JSONRenderingTests(RaidTestMixin, APITestCase):
+    """orjson 렌더러/파서와 응답 압축 테스트"""
+
+    def test_renderer_matches_drf_output(self):
+        data = {
+            'name': '대검 \u2028', 'amount': Decimal('1.5'), 'label': gettext_lazy('이름'),
+            'at': datetime(2024, 1, 1, 12, 30, tzinfo=dt_timezone.utc), 'ids': {1: [1, 2]},
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_parser_rejects_invalid_json(self):
+        response = self.client.post(
+            '/api/raids/distributions/bulk/', data=b'{"raid_group_id":', content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def create_many_items(self):
+        item_type = ItemType.objects.create(name='반지', slot='ring', order=1)
+        Item.objects.bulk_create([
+            Item(name=f'반지 {i}', item_type=item_type, item_level=700 + i, raid=self.raid) for i in range(20)
+        ])
+
+    def test_large_json_is_gzipped(self):
+        self.create_many_items()
+        response = self.client.get('/api/raids/items/?expand=item_type,raid', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))['results']), 20)
+
+        # 약한 ETag로 바뀌어도 조건부 요청은 그대로 일치
+        self.assertTrue(response['ETag'].startswith('W/'))
+        cached = self.client.get(
+            '/api/raids/items/?expand=item_type,raid', HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_NONE_MATCH=response['ETag'],
+        )
+        self.assertEqual(cached.status_code, 304)
+
+    @skipUnless(brotli, 'Brotli 패키지 필요')
+    def test_brotli_preferred_when_accepted(self):
+        self.create_many_items()
+        response = self.client.get('/api/raids/items/?expand=item_type,raid', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(len(json.loads(brotli.decompress(response.content))['results']), 20)
+
+    @override_settings(COMPRESS_MIN_SIZE=100000)
+    def test_small_responses_not_compressed(self):
+        self.create_many_items()
+        response = self.client.get('/api/raids/items/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
@@ -2,30 +2,165 @@ from rest_framework import viewsets, status, generics
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly, AllowAny
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Count, Sum
+from django.http import StreamingHttpResponse
+from django.core.cache import cache
+from django.db.models import Q, Count, Max, Sum, Prefetch
 from django.db import transaction
 from django.views.decorators.csrf import csrf_exempt
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django.utils.decorators import method_decorator
 from datetime import datetime, timedelta
 from .models import (
     Raid, RaidGroup, Job, Player, ItemType, Item, Currency,
-    EquipmentSet, Equipment, ItemDistribution, RaidSchedule, CurrencyRequirement
+    EquipmentSet, Equipment, ItemDistribution, RaidSchedule
 )
 from .serializers import (
     RaidSerializer, RaidGroupSerializer, JobSerializer, PlayerSerializer,
     ItemTypeSerializer, ItemSerializer, CurrencySerializer,
     EquipmentSetSerializer, EquipmentSerializer, ItemDistributionSerializer,
     RaidScheduleSerializer, PlayerCreateSerializer, EquipmentBulkCreateSerializer,
-    CurrencyRequirementSerializer
+    CurrencyRequirementSerializer, ItemBulkSerializer, ItemDistributionBulkSerializer,
+    sync_currency_requirements, FieldOptions
 )
+from .caching import (
+    REFERENCE_CATALOGS, GROUP_CACHE_TIMEOUT,
+    get_version, get_versions, group_version_name, user_groups_version_name
+)
+from .conditional import conditional_get, make_etag
+from .pagination import DistributionCursorPagination, PlayerCursorPagination, SnapshotDistributionPagination
+from .db import retry_on_lock
+from .export import parse_sections, stream_export
+from .snapshot import build_group_snapshot, distribution_rows
+from .routers import pin_primary, replica_reads
+from .needs import calculate_needs, refresh_need_ledgers, refresh_need_ledgers_for_items
+
+
+def parse_datetime_param(params, name):
+    """쿼리 파라미터를 aware datetime으로 변환 (날짜만 있으면 그날 0시, 형식이 틀리면 400)"""
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        day = parse_date(value) if parsed is None else None
+    except ValueError:
+        parsed = day = None
+    if parsed is None and day is None:
+        raise ValidationError({name: '날짜(YYYY-MM-DD) 또는 일시(ISO 8601) 형식이어야 합니다.'})
+    if parsed is None:
+        parsed = datetime.combine(day, datetime.min.time())
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def filter_distributions(queryset, params):
+    """분배 기록 주차/기간 필터 (distributed_after 이상, distributed_before 미만, 날짜 또는 일시)"""
+    week_number = params.get('week_number', None)
+    if week_number:
+        try:
+            week_number = int(week_number)
+        except ValueError:
+            raise ValidationError({'week_number': '정수여야 합니다.'})
+        queryset = queryset.filter(week_number=week_number)
+    distributed_after = parse_datetime_param(params, 'distributed_after')
+    if distributed_after:
+        queryset = queryset.filter(distributed_at__gte=distributed_after)
+    distributed_before = parse_datetime_param(params, 'distributed_before')
+    if distributed_before:
+        queryset = queryset.filter(distributed_at__lt=distributed_before)
+    return queryset
+
+
+def item_prefetches(options, path='', lookup_prefix=''):
+    """아이템 직렬화에 필요한 prefetch 목록 (요청에서 제외된 관계는 생략)"""
+    prefix = f'{path}.' if path else ''
+    return [
+        lookup_prefix + name for name in ('job_restrictions', 'currency_requirements')
+        if options.is_requested(prefix + name)
+    ]
+
+
+def versions_etag(request, names):
+    """요청 경로와 버전 번호들로 ETag 생성
+
+    ETag가 데이터가 아닌 버전 번호에서 나오므로 검증자는 먼저 pin_primary()로
+    요청을 primary에 고정한다. (복제 지연 중의 이전 데이터가 새 ETag로 캐시되지 않도록)
+    """
+    versions = get_versions(names)
+    return make_etag(request.get_full_path(), [versions[name] for name in names])
+
+
+def reference_catalog_validators(view, request, *args, **kwargs):
+    return make_etag(request.get_full_path(), get_version(view.reference_catalog)), None
+
+
+def raid_group_validators(view, request, *args, **kwargs):
+    """공대별 버전 번호로 ETag 생성 (상세 조회는 DB 조회 없음)"""
+    pin_primary()
+    if 'pk' in kwargs:
+        group_ids = [kwargs['pk']]
+    else:
+        group_ids = sorted(view.queryset.values_list('id', flat=True))
+    names = [group_version_name(group_id) for group_id in group_ids] + ['raids', 'jobs']
+    return versions_etag(request, names), None
+
 
+def my_groups_validators(view, request, *args, **kwargs):
+    pin_primary()
+    names = [group_version_name(group_id) for group_id in view.get_my_group_ids(request.user)]
+    return versions_etag(request, [user_groups_version_name(request.user.pk), *names, 'raids', 'jobs']), None
 
-class RaidViewSet(viewsets.ModelViewSet):
+
+def item_validators(view, request, *args, **kwargs):
+    pin_primary()
+    return versions_etag(request, ['items', *REFERENCE_CATALOGS]), None
+
+
+def equipment_set_validators(view, request, *args, **kwargs):
+    """장비 세트 수와 마지막 수정 시각으로 검증자 생성
+
+    장비/공대원/사용자가 바뀌는 쓰기 경로는 모두 세트의 updated_at을 갱신한다.
+    """
+    queryset = view.filter_by_params(EquipmentSet.objects.all())
+    if 'pk' in kwargs:
+        queryset = queryset.filter(pk=kwargs['pk'])
+    summary = queryset.aggregate(count=Count('id'), last_modified=Max('updated_at'))
+    versions = get_versions(['items', *REFERENCE_CATALOGS])
+    etag = make_etag(
+        request.get_full_path(), summary['count'], summary['last_modified'], sorted(versions.items())
+    )
+    return etag, summary['last_modified']
+
+
+class ReferenceCatalogMixin:
+    """목록/상세 조회를 참조 데이터 캐시에서 응답 (쓰기는 기본 동작 그대로)"""
+    reference_catalog = None
+    
+    @conditional_get(reference_catalog_validators)
+    def list(self, request, *args, **kwargs):
+        return Response(REFERENCE_CATALOGS[self.reference_catalog].list())
+    
+    @conditional_get(reference_catalog_validators)
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            data = REFERENCE_CATALOGS[self.reference_catalog].lookup(int(kwargs[self.lookup_field]))
+        except ValueError:
+            data = None
+        if data is None:
+            return Response({'detail': '찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(data)
+
+
+class RaidViewSet(ReferenceCatalogMixin, viewsets.ModelViewSet):
     """레이드 뷰셋"""
     queryset = Raid.objects.all()
     serializer_class = RaidSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    reference_catalog = 'raids'
     pagination_class = None  # 페이지네이션 비활성화
 
 
@@ -35,6 +170,30 @@ class RaidGroupViewSet(viewsets.ModelViewSet):
     serializer_class = RaidGroupSerializer
     permission_classes = [IsAuthenticated]
     
+    def get_queryset(self):
+        # 요청한 필드/펼침에 필요한 관계만 미리 불러옴 (공대 수/인원 수와 관계없이 고정된 쿼리 수)
+        options = FieldOptions.from_request(self.request)
+        queryset = super().get_queryset().with_player_count()
+        if options.is_expanded('leader'):
+            queryset = queryset.select_related('leader')
+        if options.is_requested('players'):
+            if not options.is_expanded('players'):
+                players = Player.objects.only('id', 'raid_group_id')
+            elif options.is_expanded('players.user'):
+                players = Player.objects.select_related('user')
+            else:
+                players = Player.objects.all()
+            queryset = queryset.prefetch_related(Prefetch('players', queryset=players))
+        return queryset
+    
+    @conditional_get(raid_group_validators)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @conditional_get(raid_group_validators)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
     def perform_create(self, serializer):
         # 공대 생성 시 생성자를 공대장으로 설정
         raid_group = serializer.save(leader=self.request.user)
@@ -116,27 +275,97 @@ class RaidGroupViewSet(viewsets.ModelViewSet):
         player.save()
         return Response({'message': '공대에서 탈퇴했습니다.'})
     
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def snapshot(self, request, pk=None):
+        """공대원/장비/분배를 평평한 행으로, 아이템/직업/재화 등은 한 번씩만 담은 압축 응답
+
+        분배 기록은 최근 100건(?page_size=, 최대 200)만 담고 week_number, distributed_after,
+        distributed_before로 거를 수 있다. 더 이전 기록은 distributions_next 링크
+        (/distributions/?raid_group=...&cursor=...)를 따라 분배 기록 목록에서 이어서 읽는다.
+        """
+        raid_group = get_object_or_404(RaidGroup, pk=pk)
+        distributions = filter_distributions(
+            raid_group.distributions.order_by('-distributed_at', '-id'), request.query_params
+        )
+        paginator = SnapshotDistributionPagination()
+        rows = paginator.paginate_queryset(distribution_rows(distributions), request, view=self)
+        snapshot = build_group_snapshot(raid_group, rows)
+        snapshot['distributions_next'] = paginator.get_next_link()
+        return Response(snapshot)
+    
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def export(self, request, pk=None):
+        """분배/장비/일정 기록 스트리밍 내보내기 (?type=ndjson|csv, ?sections=distributions,...)"""
+        raid_group = get_object_or_404(RaidGroup, pk=pk)
+        export_format = request.query_params.get('type', 'ndjson')
+        if export_format not in ('ndjson', 'csv'):
+            return Response({'error': 'type은 ndjson 또는 csv여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            sections = parse_sections(request.query_params.get('sections'))
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        lines, content_type = stream_export(raid_group.id, export_format, sections)
+        response = StreamingHttpResponse(lines, content_type=content_type)
+        name = sections[0] if export_format == 'csv' else 'history'
+        response['Content-Disposition'] = f'attachment; filename="raid-group-{raid_group.id}-{name}.{export_format}"'
+        return response
+    
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    @conditional_get(my_groups_validators)
     def my_groups(self, request):
         """내가 속한 공대 목록"""
-        player_groups = Player.objects.filter(
-            user=request.user, 
-            is_active=True
-        ).values_list('raid_group', flat=True)
-        
-        groups = RaidGroup.objects.filter(
-            Q(id__in=player_groups) | Q(leader=request.user)
-        ).distinct()
-        
-        serializer = self.get_serializer(groups, many=True)
-        return Response(serializer.data)  # 배열로 직접 반환
+        group_ids = self.get_my_group_ids(request.user)
+        return Response(self.serialize_groups(group_ids))  # 배열로 직접 반환
+    
+    def get_my_group_ids(self, user):
+        """내가 속하거나 이끄는 공대 ID 목록 (사용자별 버전으로 캐시)"""
+        version = get_version(user_groups_version_name(user.pk))
+        key = f'raids:my_groups:{user.pk}:{version}'
+        group_ids = cache.get(key)
+        if group_ids is None:
+            player_groups = Player.objects.filter(
+                user=user,
+                is_active=True
+            ).values_list('raid_group', flat=True)
+            group_ids = sorted(RaidGroup.objects.filter(
+                Q(id__in=player_groups) | Q(leader=user)
+            ).values_list('id', flat=True))
+            cache.set(key, group_ids, GROUP_CACHE_TIMEOUT)
+        return group_ids
+    
+    def serialize_groups(self, group_ids):
+        """공대별 버전으로 캐시된 직렬화 결과를 사용하고, 없는 공대만 한 번에 직렬화"""
+        names = [group_version_name(group_id) for group_id in group_ids]
+        versions = get_versions([*names, 'raids', 'jobs'])
+        # 프로필 이미지 URL이 요청 호스트 기준 절대 경로이고 fields/expand에 따라 모양이 다르므로 키에 포함
+        options = FieldOptions.from_request(self.request)
+        suffix = (
+            f"{versions['raids']}:{versions['jobs']}:{self.request.build_absolute_uri('/')}:"
+            f"{make_etag(options.cache_key())}"
+        )
+        keys = {
+            group_id: f'raids:group_payload:{group_id}:{versions[name]}:{suffix}'
+            for group_id, name in zip(group_ids, names)
+        }
+        payloads = cache.get_many(keys.values())
+        
+        missing = [group_id for group_id in group_ids if keys[group_id] not in payloads]
+        if missing:
+            groups = self.get_queryset().filter(id__in=missing)
+            fresh = {keys[group['id']]: group for group in self.get_serializer(groups, many=True).data}
+            cache.set_many(fresh, GROUP_CACHE_TIMEOUT)
+            payloads.update(fresh)
+        
+        return [payloads[keys[group_id]] for group_id in group_ids if keys[group_id] in payloads]
 
 
-class JobViewSet(viewsets.ReadOnlyModelViewSet):
+class JobViewSet(ReferenceCatalogMixin, viewsets.ReadOnlyModelViewSet):
     """직업 뷰셋 (읽기 전용)"""
     queryset = Job.objects.all()
     serializer_class = JobSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    reference_catalog = 'jobs'
     pagination_class = None  # 페이지네이션 비활성화
 
 
@@ -146,8 +375,17 @@ class PlayerViewSet(viewsets.ModelViewSet):
     serializer_class = PlayerSerializer
     permission_classes = [IsAuthenticated]
     
+    @property
+    def paginator(self):
+        # 기본은 전체 개수가 있는 페이지 번호 방식, ?cursor=를 주면 커서 방식 (첫 페이지는 빈 값)
+        if not hasattr(self, '_paginator') and 'cursor' in self.request.query_params:
+            self._paginator = PlayerCursorPagination()
+        return super().paginator
+    
     def get_queryset(self):
         queryset = super().get_queryset()
+        if FieldOptions.from_request(self.request).is_expanded('user'):
+            queryset = queryset.select_related('user')
         raid_group_id = self.request.query_params.get('raid_group', None)
         if raid_group_id:
             queryset = queryset.filter(raid_group_id=raid_group_id)
@@ -160,11 +398,12 @@ class PlayerViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class ItemTypeViewSet(viewsets.ReadOnlyModelViewSet):
+class ItemTypeViewSet(ReferenceCatalogMixin, viewsets.ReadOnlyModelViewSet):
     """아이템 종류 뷰셋 (읽기 전용)"""
     queryset = ItemType.objects.all()
     serializer_class = ItemTypeSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    reference_catalog = 'item_types'
     pagination_class = None  # 페이지네이션 비활성화
 
 
@@ -175,12 +414,23 @@ class ItemViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        queryset = super().get_queryset()
+        # 요청한 관계만 미리 불러옴 (펼치지 않아도 ID 목록에 필요, 종류/레이드/재화는 참조 데이터 캐시 사용)
+        queryset = super().get_queryset().prefetch_related(
+            *item_prefetches(FieldOptions.from_request(self.request))
+        )
         raid_id = self.request.query_params.get('raid', None)
         if raid_id:
             queryset = queryset.filter(raid_id=raid_id)
         return queryset
     
+    @conditional_get(item_validators)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @conditional_get(item_validators)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
     @transaction.atomic
     def create(self, request, *args, **kwargs):
         """아이템 생성 (재화 요구사항 포함)"""
@@ -193,15 +443,10 @@ class ItemViewSet(viewsets.ModelViewSet):
         item = serializer.save()
         
         # 재화 요구사항 생성
-        for req in currency_requirements:
-            CurrencyRequirement.objects.create(
-                item=item,
-                currency_id=req['currency_id'],
-                amount=req['amount']
-            )
+        sync_currency_requirements({item.id: currency_requirements})
         
         # 재화 정보를 포함한 시리얼라이저로 응답
-        response_serializer = self.get_serializer(item)
+        response_serializer = self.get_serializer(self.get_queryset().get(pk=item.pk))
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
     
     @transaction.atomic
@@ -218,29 +463,44 @@ class ItemViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         item = serializer.save()
         
-        # 재화 요구사항 업데이트 (제공된 경우에만)
+        # 재화 요구사항 업데이트 (제공된 경우에만, 바뀐 요구사항만 반영)
         if currency_requirements is not None:
-            # 기존 재화 요구사항 삭제
-            item.currency_requirements.all().delete()
+            changed = sync_currency_requirements({item.id: currency_requirements})
             
-            # 새로운 재화 요구사항 생성
-            for req in currency_requirements:
-                CurrencyRequirement.objects.create(
-                    item=item,
-                    currency_id=req['currency_id'],
-                    amount=req['amount']
-                )
+            # 이 아이템이 필요한 공대원의 필요 원장 갱신
+            refresh_need_ledgers_for_items(changed)
         
         # 재화 정보를 포함한 시리얼라이저로 응답
-        response_serializer = self.get_serializer(item)
+        response_serializer = self.get_serializer(self.get_queryset().get(pk=item.pk))
         return Response(response_serializer.data)
+    
+    @action(detail=False, methods=['post', 'put', 'patch'])
+    def bulk(self, request):
+        """아이템 일괄 등록(POST)/수정(PUT, PATCH) (재화 요구사항 포함)"""
+        if request.method == 'POST':
+            serializer = ItemBulkSerializer(data=request.data, many=True)
+        else:
+            serializer = ItemBulkSerializer(
+                Item.objects.all(), data=request.data, many=True,
+                partial=request.method == 'PATCH'
+            )
+        serializer.is_valid(raise_exception=True)
+        items = serializer.save()
+        
+        queryset = self.get_queryset().filter(id__in=[item.id for item in items]).order_by('id')
+        response_serializer = self.get_serializer(queryset, many=True)
+        return Response(
+            response_serializer.data,
+            status=status.HTTP_201_CREATED if request.method == 'POST' else status.HTTP_200_OK
+        )
 
 
-class CurrencyViewSet(viewsets.ModelViewSet):
+class CurrencyViewSet(ReferenceCatalogMixin, viewsets.ModelViewSet):
     """재화 뷰셋"""
     queryset = Currency.objects.all()
     serializer_class = CurrencySerializer
     permission_classes = [IsAuthenticated]
+    reference_catalog = 'currencies'
     pagination_class = None  # 페이지네이션 비활성화
 
 
@@ -251,36 +511,156 @@ class EquipmentSetViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
+        # 요청한 필드/펼침에 필요한 관계만 미리 불러옴 (아이템레벨은 저장된 값 사용)
+        options = FieldOptions.from_request(self.request)
         queryset = super().get_queryset()
-        player_id = self.request.query_params.get('player', None)
+        if options.is_expanded('player'):
+            queryset = queryset.select_related('player__user' if options.is_expanded('player.user') else 'player')
+        if options.is_requested('equipments'):
+            if not options.is_expanded('equipments'):
+                equipments = Equipment.objects.only('id', 'equipment_set_id')
+            elif options.is_expanded('equipments.item'):
+                equipments = Equipment.objects.select_related('item').prefetch_related(
+                    *item_prefetches(options, 'equipments.item', 'item__')
+                )
+            else:
+                equipments = Equipment.objects.all()
+            queryset = queryset.prefetch_related(Prefetch('equipments', queryset=equipments))
+        return self.filter_by_params(queryset)
+    
+    def filter_by_params(self, queryset):
+        params = self.request.query_params
+        player_id = params.get('player', None)
         if player_id:
             queryset = queryset.filter(player_id=player_id)
+        raid_group_id = params.get('raid_group', None)
+        if raid_group_id:
+            queryset = queryset.filter(player__raid_group_id=raid_group_id)
+        set_type = params.get('set_type', None)
+        if set_type:
+            queryset = queryset.filter(set_type=set_type)
+        
+        # 저장된 아이템레벨로 필터/정렬 (set_type + item_level 인덱스 사용)
+        try:
+            if params.get('min_item_level'):
+                queryset = queryset.filter(item_level__gte=int(params['min_item_level']))
+            if params.get('max_item_level'):
+                queryset = queryset.filter(item_level__lte=int(params['max_item_level']))
+        except ValueError:
+            raise ValidationError({'item_level': '아이템레벨은 숫자여야 합니다.'})
+        if params.get('ordering') in ('item_level', '-item_level'):
+            queryset = queryset.order_by(params['ordering'], 'id')
         return queryset
     
+    @conditional_get(equipment_set_validators)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
+    @conditional_get(equipment_set_validators)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
+    @retry_on_lock
+    @transaction.atomic
+    def perform_create(self, serializer):
+        equipment_set = serializer.save()
+        refresh_need_ledgers([equipment_set.player_id])
+    
+    @retry_on_lock
+    @transaction.atomic
+    def perform_update(self, serializer):
+        equipment_set = serializer.save()
+        refresh_need_ledgers([equipment_set.player_id])
+    
+    @retry_on_lock
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+        refresh_need_ledgers([instance.player_id])
+    
     @action(detail=True, methods=['post'])
+    @retry_on_lock
     def bulk_update_equipments(self, request, pk=None):
-        """장비 일괄 업데이트"""
-        equipment_set = self.get_object()
-        
-        # 권한 확인
-        if equipment_set.player.user != request.user:
-            return Response({'error': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
-        
-        # 기존 장비 모두 삭제
-        equipment_set.equipments.all().delete()
-        
-        # 새로운 장비 생성
-        items = request.data.get('items', [])
-        for item_data in items:
-            Equipment.objects.create(
-                equipment_set=equipment_set,
-                item_id=item_data['item_id'],
-                is_pentamelded=item_data.get('is_pentamelded', False)
+        """장비 일괄 업데이트 (변경된 장비만 추가/삭제/수정)"""
+        invalid = Response({'error': '올바르지 않은 장비 목록입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        items = request.data.get('items', []) if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not all(isinstance(item_data, dict) for item_data in items):
+            return invalid
+        try:
+            desired = {
+                int(item_data['item_id']): bool(item_data.get('is_pentamelded', False))
+                for item_data in items
+            }
+        except (KeyError, TypeError, ValueError):
+            return invalid
+        
+        if Item.objects.filter(id__in=desired).count() != len(desired):
+            return Response({'error': '존재하지 않는 아이템이 포함되어 있습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        with transaction.atomic():
+            # 같은 세트를 동시에 저장하는 요청은 순서대로 처리
+            equipment_set = get_object_or_404(
+                EquipmentSet.objects.select_for_update().select_related('player'), pk=pk
             )
-        
-        # 업데이트된 세트 반환
+            
+            # 권한 확인
+            if equipment_set.player.user_id != request.user.id:
+                return Response({'error': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
+            
+            existing = {
+                equipment.item_id: equipment
+                for equipment in equipment_set.equipments.only('id', 'item_id', 'is_pentamelded')
+            }
+            to_delete = [
+                equipment.id for item_id, equipment in existing.items() if item_id not in desired
+            ]
+            to_create = [
+                Equipment(equipment_set=equipment_set, item_id=item_id, is_pentamelded=is_pentamelded)
+                for item_id, is_pentamelded in desired.items() if item_id not in existing
+            ]
+            to_update = []
+            for item_id, equipment in existing.items():
+                if item_id in desired and equipment.is_pentamelded != desired[item_id]:
+                    equipment.is_pentamelded = desired[item_id]
+                    to_update.append(equipment)
+            
+            if to_delete:
+                Equipment.objects.filter(id__in=to_delete).delete()
+            if to_create:
+                Equipment.objects.bulk_create(to_create)
+            if to_update:
+                Equipment.objects.bulk_update(to_update, ['is_pentamelded'])
+            
+            if to_delete or to_create or to_update:
+                equipment_set.save(update_fields=['updated_at'])
+                if to_delete or to_create:
+                    EquipmentSet.objects.filter(pk=equipment_set.pk).refresh_item_levels()
+                    refresh_need_ledgers([equipment_set.player_id])
+        
+        # 업데이트된 세트 반환 (아이템레벨 재계산을 위해 다시 조회)
+        equipment_set = self.get_queryset().get(pk=equipment_set.pk)
         serializer = self.get_serializer(equipment_set)
         return Response(serializer.data)
+    
+    @action(detail=False, methods=['post'])
+    @retry_on_lock
+    def bulk_import(self, request):
+        """여러 장비 세트 일괄 등록 (공대장은 공대원 전체의 장비를 등록 가능)"""
+        entries = request.data.get('sets', [request.data]) if isinstance(request.data, dict) else request.data
+        serializer = EquipmentBulkCreateSerializer(data=entries, many=True)
+        serializer.is_valid(raise_exception=True)
+        
+        # 권한 확인: 본인 세트이거나 해당 공대의 공대장이어야 함
+        for entry in serializer.validated_data:
+            player = entry['equipment_set'].player
+            if request.user.id not in (player.user_id, player.raid_group.leader_id):
+                return Response({'error': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
+        
+        equipments = serializer.save()
+        return Response({
+            'equipment_set_ids': sorted({entry['equipment_set_id'] for entry in serializer.validated_data}),
+            'equipment_count': len(equipments),
+        })
 
 
 class ItemDistributionViewSet(viewsets.ModelViewSet):
@@ -289,12 +669,59 @@ class ItemDistributionViewSet(viewsets.ModelViewSet):
     serializer_class = ItemDistributionSerializer
     permission_classes = [IsAuthenticated]
     
+    pagination_class = DistributionCursorPagination
+    
     def get_queryset(self):
-        queryset = super().get_queryset()
+        # 최근 분배부터 표시 (raid_group + distributed_at 인덱스 사용)
+        queryset = super().get_queryset().order_by('-distributed_at', '-id')
+        options = FieldOptions.from_request(self.request)
+        related = [
+            lookup for lookup, path in (('player', 'player'), ('player__user', 'player.user'), ('item', 'item'))
+            if options.is_expanded(path)
+        ]
+        if related:
+            queryset = queryset.select_related(*related)
+        if options.is_expanded('item'):
+            queryset = queryset.prefetch_related(*item_prefetches(options, 'item', 'item__'))
         raid_group_id = self.request.query_params.get('raid_group', None)
         if raid_group_id:
             queryset = queryset.filter(raid_group_id=raid_group_id)
-        return queryset
+        return filter_distributions(queryset, self.request.query_params)
+    
+    # 분배받은 아이템은 필요 원장에서 제외되므로 기록이 바뀔 때마다 갱신
+    @retry_on_lock
+    @transaction.atomic
+    def perform_create(self, serializer):
+        distribution = serializer.save()
+        refresh_need_ledgers([distribution.player_id])
+    
+    @retry_on_lock
+    @transaction.atomic
+    def perform_update(self, serializer):
+        previous_player_id = serializer.instance.player_id
+        distribution = serializer.save()
+        refresh_need_ledgers({previous_player_id, distribution.player_id})
+    
+    @retry_on_lock
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+        refresh_need_ledgers([instance.player_id])
+    
+    @action(detail=False, methods=['post'])
+    @retry_on_lock
+    def bulk(self, request):
+        """한 번의 레이드에서 나온 아이템 분배를 일괄 기록"""
+        serializer = ItemDistributionBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        distributions = serializer.save()
+        return Response({
+            'raid_group_id': serializer.validated_data['raid_group_id'],
+            'distributions': [
+                {'id': distribution.id, 'player_id': distribution.player_id, 'item_id': distribution.item_id}
+                for distribution in distributions
+            ],
+        }, status=status.HTTP_201_CREATED)
 
 
 class RaidScheduleViewSet(viewsets.ModelViewSet):
@@ -305,6 +732,8 @@ class RaidScheduleViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         queryset = super().get_queryset()
+        if FieldOptions.from_request(self.request).is_expanded('created_by'):
+            queryset = queryset.select_related('created_by')
         raid_group_id = self.request.query_params.get('raid_group', None)
         if raid_group_id:
             queryset = queryset.filter(raid_group_id=raid_group_id)
@@ -317,46 +746,60 @@ class RaidScheduleViewSet(viewsets.ModelViewSet):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def calculate_currency_needs(request):
-    """재화 필요량 계산"""
+    """재화 필요량 계산 (player_ids로 여러 공대원 일괄 계산 가능)"""
+    player_ids = request.GET.get('player_ids')
+    if player_ids:
+        return calculate_currency_needs_batch(request, player_ids)
+    
     player_id = request.GET.get('player_id')
     if not player_id:
         return Response({'error': 'player_id가 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        player = Player.objects.get(id=player_id)
-        
-        # 현재 세트와 목표 세트 가져오기
-        current_set = EquipmentSet.objects.filter(player=player, set_type='current').first()
-        target_set = EquipmentSet.objects.filter(player=player, set_type='target').first()
-        
-        if not target_set:
-            return Response({'error': '목표 장비 세트가 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # 필요한 아이템 찾기
-        target_items = set(target_set.equipments.values_list('item_id', flat=True))
-        current_items = set(current_set.equipments.values_list('item_id', flat=True)) if current_set else set()
-        needed_items = target_items - current_items
-        
-        # 재화 계산
-        currency_needs = {}
-        for item_id in needed_items:
-            requirements = CurrencyRequirement.objects.filter(item_id=item_id)
-            for req in requirements:
-                currency_name = req.currency.name
-                if currency_name not in currency_needs:
-                    currency_needs[currency_name] = 0
-                currency_needs[currency_name] += req.amount
-        
-        return Response({
-            'player': PlayerSerializer(player).data,
-            'currency_needs': currency_needs,
-            'needed_items_count': len(needed_items)
-        })
-        
-    except Player.DoesNotExist:
+        player = Player.objects.select_related('user').get(id=player_id)
+    except (Player.DoesNotExist, ValueError):
         return Response({'error': '플레이어를 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+    
+    needs = calculate_needs([player.id])
+    if player.id not in needs:
+        return Response({'error': '목표 장비 세트가 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'player': PlayerSerializer(player, context={'request': request}).data,
+        **needs[player.id],
+    })
+
+
+def calculate_currency_needs_batch(request, player_ids):
+    """여러 공대원의 재화 필요량을 한 번에 계산"""
+    try:
+        player_ids = [int(player_id) for player_id in player_ids.split(',') if player_id.strip()]
+    except ValueError:
+        return Response({'error': 'player_ids는 쉼표로 구분된 숫자여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    players = Player.objects.select_related('user').in_bulk(player_ids)
+    needs = calculate_needs(players)
+    
+    results = []
+    for player_id in dict.fromkeys(player_ids):
+        player = players.get(player_id)
+        if player is None:
+            continue
+        result = {'player': PlayerSerializer(player, context={'request': request}).data}
+        if player_id in needs:
+            result.update(needs[player_id])
+        else:
+            result.update({
+                'currency_needs': {},
+                'needed_items_count': 0,
+                'error': '목표 장비 세트가 없습니다.',
+            })
+        results.append(result)
+    
+    return Response({'results': results})
 
 
+@replica_reads
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def calculate_distribution_priority(request):
@@ -366,42 +809,28 @@ def calculate_distribution_priority(request):
         return Response({'error': 'raid_group_id가 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        raid_group = RaidGroup.objects.get(id=raid_group_id)
-        
-        # 공대원들의 필요 재화량 계산
-        players_needs = []
-        for player in raid_group.players.filter(is_active=True):
-            target_set = EquipmentSet.objects.filter(player=player, set_type='target').first()
-            if not target_set:
-                continue
-            
-            current_set = EquipmentSet.objects.filter(player=player, set_type='current').first()
-            
-            # 필요한 아이템 계산
-            target_items = set(target_set.equipments.values_list('item_id', flat=True))
-            current_items = set(current_set.equipments.values_list('item_id', flat=True)) if current_set else set()
-            needed_items = target_items - current_items
-            
-            # 총 재화량 계산
-            total_currency = 0
-            for item_id in needed_items:
-                requirements = CurrencyRequirement.objects.filter(item_id=item_id)
-                for req in requirements:
-                    total_currency += req.amount
-            
-            players_needs.append({
-                'player': PlayerSerializer(player).data,
-                'total_currency_needed': total_currency,
-                'items_needed': len(needed_items)
-            })
-        
-        # 재화 필요량 기준으로 정렬
-        players_needs.sort(key=lambda x: x['total_currency_needed'], reverse=True)
-        
-        return Response({
-            'raid_group': RaidGroupSerializer(raid_group).data,
-            'priority_list': players_needs
+        raid_group = RaidGroup.objects.with_roster().get(id=raid_group_id)
+    except (RaidGroup.DoesNotExist, ValueError):
+        return Response({'error': '공대를 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+    
+    # 공대 전체의 필요 재화량을 한 번에 계산 (목표 세트가 없는 공대원은 제외)
+    active_players = [player for player in raid_group.players.all() if player.is_active]
+    needs = calculate_needs(player.id for player in active_players)
+    
+    players_needs = []
+    for player in active_players:
+        if player.id not in needs:
+            continue
+        players_needs.append({
+            'player': PlayerSerializer(player, context={'request': request}).data,
+            'total_currency_needed': sum(needs[player.id]['currency_needs'].values()),
+            'items_needed': needs[player.id]['needed_items_count']
         })
-        
-    except RaidGroup.DoesNotExist:
-        return Response({'error': '공대를 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+    
+    # 재화 필요량 기준으로 정렬
+    players_needs.sort(key=lambda x: x['total_currency_needed'], reverse=True)
+    
+    return Response({
+        'raid_group': RaidGroupSerializer(raid_group).data,
+        'priority_list': players_needs
+    })
@@ -1,5 +1,9 @@
 import api from './config';
 
+// 중첩 관계는 기본적으로 ID로 오므로 화면에서 쓰는 관계만 펼쳐서 요청 (?expand=, ?fields=)
+const GROUP_EXPAND = 'raid,leader';
+const ITEM_EXPAND = 'item_type,raid,job_restrictions,currency_requirements.currency';
+
 // 레이드 목록 조회
 export const getRaids = async () => {
   try {
@@ -23,7 +27,13 @@ export const getRaid = async (id) => {
 // 공대 목록 조회
 export const getRaidGroups = async () => {
   try {
-    const response = await api.get('/raids/groups/');
+    // 목록 화면은 이름과 인원 수 정도만 사용
+    const response = await api.get('/raids/groups/', {
+      params: {
+        fields: 'id,name,raid,leader,distribution_method,is_active,player_count',
+        expand: GROUP_EXPAND
+      }
+    });
     return response.data;
   } catch (error) {
     throw error.response?.data || error.message;
@@ -33,7 +43,9 @@ export const getRaidGroups = async () => {
 // 내가 속한 공대 목록
 export const getMyRaidGroups = async () => {
   try {
-    const response = await api.get('/raids/groups/my_groups/');
+    const response = await api.get('/raids/groups/my_groups/', {
+      params: { expand: GROUP_EXPAND }
+    });
     return response.data;
   } catch (error) {
     throw error.response?.data || error.message;
@@ -43,7 +55,9 @@ export const getMyRaidGroups = async () => {
 // 공대 상세 조회
 export const getRaidGroup = async (id) => {
   try {
-    const response = await api.get(`/raids/groups/${id}/`);
+    const response = await api.get(`/raids/groups/${id}/`, {
+      params: { expand: GROUP_EXPAND }
+    });
     return response.data;
   } catch (error) {
     throw error.response?.data || error.message;
@@ -96,7 +110,8 @@ export const getPlayers = async (raidGroupId, activeOnly = true) => {
     const response = await api.get('/raids/players/', {
       params: { 
         raid_group: raidGroupId,
-        active_only: activeOnly
+        active_only: activeOnly,
+        expand: 'user,job'
       }
     });
     return response.data;
@@ -109,7 +124,7 @@ export const getPlayers = async (raidGroupId, activeOnly = true) => {
 export const getItems = async (raidId) => {
   try {
     const response = await api.get('/raids/items/', {
-      params: { raid: raidId }
+      params: { raid: raidId, expand: ITEM_EXPAND }
     });
     return response.data;
   } catch (error) {
@@ -120,7 +135,9 @@ export const getItems = async (raidId) => {
 // 아이템 상세 조회
 export const getItem = async (id) => {
   try {
-    const response = await api.get(`/raids/items/${id}/`);
+    const response = await api.get(`/raids/items/${id}/`, {
+      params: { expand: ITEM_EXPAND }
+    });
     return response.data;
   } catch (error) {
     throw error.response?.data || error.message;
@@ -147,6 +164,26 @@ export const updateItem = async (id, itemData) => {
   }
 };
 
+// 아이템 일괄 생성
+export const bulkCreateItems = async (items) => {
+  try {
+    const response = await api.post('/raids/items/bulk/', items);
+    return response.data;
+  } catch (error) {
+    throw error.response?.data || error.message;
+  }
+};
+
+// 아이템 일괄 수정 (각 항목에 id 필요)
+export const bulkUpdateItems = async (items) => {
+  try {
+    const response = await api.patch('/raids/items/bulk/', items);
+    return response.data;
+  } catch (error) {
+    throw error.response?.data || error.message;
+  }
+};
+
 // 아이템 타입 목록 조회
 export const getItemTypes = async () => {
   try {
@@ -171,7 +208,7 @@ export const getCurrencies = async () => {
 export const getEquipmentSets = async (playerId) => {
   try {
     const response = await api.get('/raids/equipment-sets/', {
-      params: { player: playerId }
+      params: { player: playerId, expand: 'equipments.item.item_type' }
     });
     return response.data;
   } catch (error) {
@@ -199,6 +236,16 @@ export const bulkUpdateEquipments = async (setId, items) => {
   }
 };
 
+// 여러 장비 세트 일괄 등록 (sets: [{ equipment_set_id, items }])
+export const bulkImportEquipments = async (sets) => {
+  try {
+    const response = await api.post('/raids/equipment-sets/bulk_import/', { sets });
+    return response.data;
+  } catch (error) {
+    throw error.response?.data || error.message;
+  }
+};
+
 // 아이템 분배 기록 조회
 export const getItemDistributions = async (raidGroupId) => {
   try {
@@ -221,11 +268,37 @@ export const createItemDistribution = async (distributionData) => {
   }
 };
 
+// 아이템 분배 일괄 기록 (distributions: [{ player_id, item_id, notes }])
+export const bulkCreateItemDistributions = async (raidGroupId, weekNumber, distributions) => {
+  try {
+    const response = await api.post('/raids/distributions/bulk/', {
+      raid_group_id: raidGroupId,
+      week_number: weekNumber,
+      distributions
+    });
+    return response.data;
+  } catch (error) {
+    throw error.response?.data || error.message;
+  }
+};
+
 // 재화 필요량 계산
 export const calculateCurrencyNeeds = async (playerId) => {
   try {
     const response = await api.get('/raids/calculate-currency-needs/', {
-      params: { player_id: playerId }
+      params: { player_id: playerId, expand: 'job' }
+    });
+    return response.data;
+  } catch (error) {
+    throw error.response?.data || error.message;
+  }
+};
+
+// 여러 공대원의 재화 필요량 일괄 계산
+export const calculateCurrencyNeedsBatch = async (playerIds) => {
+  try {
+    const response = await api.get('/raids/calculate-currency-needs/', {
+      params: { player_ids: playerIds.join(','), expand: 'job' }
     });
     return response.data;
   } catch (error) {
@@ -238,6 +311,8 @@ export const calculateDistributionPriority = async (raidGroupId) => {
   try {
     const response = await api.post('/raids/calculate-distribution-priority/', {
       raid_group_id: raidGroupId
+    }, {
+      params: { expand: 'job' }
     });
     return response.data;
   } catch (error) {